@@ -0,0 +1,249 @@
+"""In-process result cache with refresh-ahead for GraphDB-backed responses.
+
+Entries are keyed by the graph data version and the SPARQL text that produced them, so requests
+that build the same query share one entry regardless of how the request JSON was written, and a
+data change makes every older entry unreachable at once. A background thread reloads entries
+that were used since their last load before they expire, so popular results never go cold;
+entries nobody asks for simply expire. Pinned entries follow the data version: after a change
+they are reloaded under the new version instead of being dropped.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional
+
+from app.graph_version import graph_version
+from app.metrics import CACHE_ENTRIES, CACHE_REFRESHES, CACHE_REQUESTS
+from app.settings import settings
+
+logger = logging.getLogger("uvicorn.error")
+
+
+@dataclass
+class _Entry:
+    value: Any
+    loader: Callable[[], Any]
+    loaded_at: float
+    expires_at: float
+    used_since_load: bool = False
+    pinned: bool = False  # warm-up entries are refreshed even when unused
+    # Entries stored by one put_many share a group; refresh_due reloads a group's due entries
+    # with a single group_loader(keys) call.
+    group: Optional[Hashable] = None
+    group_loader: Optional[Callable[[List[Hashable]], Dict[Hashable, Any]]] = None
+
+
+class ResultCache:
+    def __init__(
+        self,
+        name: str,
+        ttl_seconds: float,
+        refresh_ahead_ratio: float,
+        max_entries: int,
+        version: Optional[Callable[[], int]] = None,
+    ):
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.refresh_ahead_ratio = refresh_ahead_ratio
+        self.max_entries = max_entries
+        self._entries: OrderedDict[Hashable, _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+        # One lock per key being loaded, so concurrent misses run the query once.
+        self._loading: dict[Hashable, threading.Lock] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._local = threading.local()
+        self._version = version or (lambda: 0)
+
+    @contextmanager
+    def pinning(self) -> Iterator[None]:
+        # Entries stored by this thread inside the block are kept warm even when nobody uses them.
+        self._local.pin = True
+        try:
+            yield
+        finally:
+            self._local.pin = False
+
+    def get(self, key: Hashable, loader: Callable[[], Any], pin: bool = False) -> Any:
+        if self.ttl_seconds <= 0:
+            return loader()
+        pin = pin or getattr(self._local, "pin", False)
+        key = (self._version(), key)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at > now:
+                entry.used_since_load = True
+                entry.pinned = entry.pinned or pin
+                self._entries.move_to_end(key)
+                CACHE_REQUESTS.labels(self.name, "hit").inc()
+                return entry.value
+            key_lock = self._loading.setdefault(key, threading.Lock())
+
+        try:
+            with key_lock:
+                with self._lock:
+                    entry = self._entries.get(key)
+                    if entry is not None and entry.expires_at > time.monotonic():
+                        CACHE_REQUESTS.labels(self.name, "hit").inc()
+                        return entry.value
+                CACHE_REQUESTS.labels(self.name, "miss").inc()
+                value = loader()
+                self._store(key, value, loader, pin)
+                return value
+        finally:
+            with self._lock:
+                self._loading.pop(key, None)
+
+    def peek(self, key: Hashable) -> Any:
+        # Fresh cached value or None, without loading; counts as a hit when found.
+        if self.ttl_seconds <= 0:
+            return None
+        key = (self._version(), key)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.expires_at <= time.monotonic():
+                return None
+            entry.used_since_load = True
+            self._entries.move_to_end(key)
+        CACHE_REQUESTS.labels(self.name, "hit").inc()
+        return entry.value
+
+    def put(self, key: Hashable, value: Any, loader: Callable[[], Any]) -> None:
+        # Store a value computed elsewhere (e.g. split from a batched query); loader refreshes it.
+        if self.ttl_seconds > 0:
+            self._store((self._version(), key), value, loader, getattr(self._local, "pin", False))
+
+    def put_many(
+        self,
+        values: Dict[Hashable, Any],
+        loader: Callable[[List[Hashable]], Dict[Hashable, Any]],
+        group: Hashable,
+    ) -> None:
+        # Store values loaded together; loader(keys) returns fresh values for any of their keys, so
+        # the due entries of group are refreshed with one call instead of one load per key.
+        if self.ttl_seconds <= 0:
+            return
+        version = self._version()
+        pin = getattr(self._local, "pin", False)
+        for key, value in values.items():
+            self._store(
+                (version, key), value, lambda key=key: loader([key])[key], pin, group=group, group_loader=loader
+            )
+
+    def _store(
+        self,
+        key: Hashable,
+        value: Any,
+        loader: Callable[[], Any],
+        pin: bool,
+        group: Optional[Hashable] = None,
+        group_loader: Optional[Callable[[List[Hashable]], Dict[Hashable, Any]]] = None,
+    ) -> None:
+        now = time.monotonic()
+        with self._lock:
+            previous = self._entries.get(key)
+            self._entries[key] = _Entry(
+                value=value,
+                loader=loader,
+                loaded_at=now,
+                expires_at=now + self.ttl_seconds,
+                pinned=pin or (previous is not None and previous.pinned),
+                group=group,
+                group_loader=group_loader,
+            )
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            CACHE_ENTRIES.labels(self.name).set(len(self._entries))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            CACHE_ENTRIES.labels(self.name).set(0)
+
+    def refresh_due(self) -> int:
+        # Reload entries past refresh_ahead_ratio of their TTL that were used (or pinned) since
+        # their last load; failures keep serving the old value until it expires. Entries of an
+        # older data version are dropped, pinned ones are reloaded under the current version.
+        now = time.monotonic()
+        threshold = self.ttl_seconds * self.refresh_ahead_ratio
+        version = self._version()
+        due = []
+        with self._lock:
+            for key, entry in list(self._entries.items()):
+                if key[0] != version:
+                    del self._entries[key]
+                    current_key = (version, key[1])
+                    if entry.pinned and current_key not in self._entries:
+                        due.append((current_key, entry))
+                elif now - entry.loaded_at >= threshold and (entry.used_since_load or entry.pinned):
+                    due.append((key, entry))
+            CACHE_ENTRIES.labels(self.name).set(len(self._entries))
+        refreshed = 0
+        groups: Dict[Hashable, List[tuple[Hashable, _Entry]]] = {}
+        for key, entry in due:
+            if entry.group is not None:
+                groups.setdefault(entry.group, []).append((key, entry))
+                continue
+            if self._stop.is_set():
+                break
+            try:
+                self._store(key, entry.loader(), entry.loader, entry.pinned)
+                CACHE_REFRESHES.labels(self.name, "ok").inc()
+                refreshed += 1
+            except Exception as e:
+                CACHE_REFRESHES.labels(self.name, "error").inc()
+                logger.warning("Background refresh failed in cache %s: %s", self.name, e)
+        for members in groups.values():
+            if self._stop.is_set():
+                break
+            try:
+                values = members[0][1].group_loader([key[1] for key, _ in members])
+            except Exception as e:
+                CACHE_REFRESHES.labels(self.name, "error").inc(len(members))
+                logger.warning("Background refresh failed in cache %s: %s", self.name, e)
+                continue
+            for key, entry in members:
+                if key[1] not in values:
+                    continue
+                self._store(key, values[key[1]], entry.loader, entry.pinned, entry.group, entry.group_loader)
+                CACHE_REFRESHES.labels(self.name, "ok").inc()
+                refreshed += 1
+        return refreshed
+
+    def start_background_refresh(self) -> None:
+        if self._thread is not None or self.ttl_seconds <= 0:
+            return
+        self._stop.clear()
+        # Check often enough that no entry passes its refresh point by more than ~10% of the TTL,
+        # and at least every 5 s so pinned entries follow a data version change promptly.
+        interval = min(5.0, max(1.0, self.ttl_seconds * min(0.1, 1 - self.refresh_ahead_ratio)))
+
+        def run() -> None:
+            while not self._stop.wait(interval):
+                self.refresh_due()
+
+        self._thread = threading.Thread(target=run, name=f"cache-refresh-{self.name}", daemon=True)
+        self._thread.start()
+
+    def stop_background_refresh(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+
+result_cache = ResultCache(
+    "graphdb-results",
+    ttl_seconds=settings.cache_ttl_seconds,
+    refresh_ahead_ratio=settings.cache_refresh_ahead_ratio,
+    max_entries=settings.cache_max_entries,
+    version=lambda: graph_version.current,
+)
@@ -1,8 +1,22 @@
+from functools import lru_cache
+
 from app.settings import settings
 from app.graphdb import GraphDBClient
 
+
+@lru_cache(maxsize=1)
 def get_graphdb() -> GraphDBClient:
+    # One shared client, so balancing, health and latency state span all requests
+    read_base_urls = [url.strip() for url in settings.graphdb_read_base_urls.split(",") if url.strip()]
     return GraphDBClient(
         base_url=settings.graphdb_base_url,
         repo_id=settings.graphdb_repo_id,
+        slow_query_ms=settings.graphdb_slow_query_ms,
+        explain_slow_queries=settings.graphdb_slow_query_explain,
+        read_base_urls=read_base_urls or None,
+        write_base_url=settings.graphdb_write_base_url or None,
+        hedge_percentile=settings.graphdb_hedge_percentile or None,
+        hedge_min_delay_ms=settings.graphdb_hedge_min_delay_ms,
+        health_check_interval_seconds=settings.graphdb_health_check_interval_seconds,
+        max_concurrent_reads=settings.graphdb_max_concurrent_reads,
     )
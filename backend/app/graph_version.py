@@ -0,0 +1,86 @@
+"""Current GraphDB data version, polled in the background and stamped on every response.
+
+The version is the integer marker in the system graph (see services/data_version.py) that the
+ontology loader, the migration runner and /sparql/update bump with each change. Caches include
+it in their keys, so they can use long TTLs and still never serve results from older data.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from typing import TYPE_CHECKING, Optional
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.services.data_version import get_data_version
+from app.settings import settings
+
+if TYPE_CHECKING:
+    from app.graphdb import GraphDBClient
+
+logger = logging.getLogger("uvicorn.error")
+
+GRAPH_VERSION_HEADER = "X-Graph-Version"
+
+
+class GraphVersion:
+    def __init__(self, poll_seconds: float):
+        self.poll_seconds = poll_seconds
+        self.current = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def refresh(self, db: "GraphDBClient") -> int:
+        version = get_data_version(db)
+        if version != self.current:
+            logger.info("Graph data version %d -> %d", self.current, version)
+            self.current = version
+        return version
+
+    def start_polling(self, db: "GraphDBClient") -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+
+        def run() -> None:
+            while True:
+                try:
+                    self.refresh(db)
+                except Exception as e:
+                    # Keep the last known version; the next poll retries.
+                    logger.warning("Graph version poll failed: %s", e)
+                if self._stop.wait(self.poll_seconds):
+                    return
+
+        self._thread = threading.Thread(target=run, name="graph-version", daemon=True)
+        self._thread.start()
+
+    def stop_polling(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+
+graph_version = GraphVersion(settings.graph_version_poll_seconds)
+
+
+class GraphVersionMiddleware:
+    """Pure ASGI middleware adding the current graph version header to every HTTP response."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)[GRAPH_VERSION_HEADER] = str(graph_version.current)
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
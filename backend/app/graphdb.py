@@ -1,5 +1,52 @@
 import requests
-from typing import Any, Dict, Optional
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Dict, List, Optional
+
+from requests.adapters import HTTPAdapter
+
+from app.metrics import (
+    GRAPHDB_ENDPOINT_UP,
+    GRAPHDB_HEDGED_REQUESTS,
+    observe_graphdb_response,
+    track_graphdb,
+)
+from app.slow_queries import SlowQueryRecord, slow_query_log
+
+HEALTH_QUERY = "SELECT (1 as ?ok) WHERE {}"
+_LATENCY_WINDOW = 512
+# Below this many samples the hedge delay falls back to hedge_min_delay_ms.
+_MIN_LATENCY_SAMPLES = 20
+# Statuses meaning the node (or the proxy in front of it) is unavailable. A plain 500 is how
+# GraphDB reports a failed or timed-out query, which says nothing about the node's health.
+_NODE_DOWN_STATUSES = frozenset({502, 503, 504})
+
+
+def _node_failed(error: BaseException) -> bool:
+    # Connection errors (including connect timeouts) and unavailable statuses; read timeouts and
+    # query errors belong to the query, so retrying it elsewhere would only repeat them.
+    if isinstance(error, requests.ConnectionError):
+        return True
+    return (
+        isinstance(error, requests.HTTPError)
+        and error.response is not None
+        and error.response.status_code in _NODE_DOWN_STATUSES
+    )
+
+
+class _Endpoint:
+    # One GraphDB node: request URLs, in-flight count and health state
+    def __init__(self, base_url: str, repo_id: str):
+        self.base_url = base_url
+        self.query_url = f"{base_url}/repositories/{repo_id}"
+        self.update_url = f"{base_url}/repositories/{repo_id}/statements"
+        self.outstanding = 0
+        self.healthy = True
+        self.probing = False
+        self.retry_at = 0.0
+
 
 class GraphDBClient:
     def __init__(
@@ -8,35 +55,282 @@ class GraphDBClient:
         repo_id: str,
         auth: Optional[tuple[str, str]] = None,
         timeout: int = 30,
+        slow_query_ms: float = 0.0,
+        explain_slow_queries: bool = False,
+        read_base_urls: Optional[List[str]] = None,
+        write_base_url: Optional[str] = None,
+        hedge_percentile: Optional[float] = None,
+        hedge_min_delay_ms: float = 50.0,
+        health_check_interval_seconds: float = 5.0,
+        max_concurrent_reads: int = 64,
+        report_endpoint_health: bool = True,
     ):
-        self.query_url = f"{base_url}/repositories/{repo_id}"
-        self.update_url = f"{base_url}/repositories/{repo_id}/statements"
+        # Reads are balanced over read_base_urls (default: base_url); updates go to write_base_url.
+        self.base_url = base_url
+        self.repo_id = repo_id
+        self.read_endpoints = [_Endpoint(url.rstrip("/"), repo_id) for url in (read_base_urls or [base_url])]
+        self.write_endpoint = _Endpoint((write_base_url or base_url).rstrip("/"), repo_id)
+        self.query_url = self.read_endpoints[0].query_url
+        self.update_url = self.write_endpoint.update_url
         self.auth = auth
         self.timeout = timeout
         self.session = requests.Session()  # Use a session for connection pooling
-        
+        # Shared across request threads, so allow more than urllib3's default 10 pooled connections per node
+        adapter = HTTPAdapter(pool_connections=len(self.read_endpoints) + 1, pool_maxsize=64)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.slow_query_ms = slow_query_ms
+        self.explain_slow_queries = explain_slow_queries
+        # Hedged reads: if the first node has not answered after the hedge_percentile latency,
+        # send the same SELECT to a second node and keep whichever answer arrives first.
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_delay_ms = hedge_min_delay_ms
+        self.health_check_interval_seconds = health_check_interval_seconds
+        self.max_concurrent_reads = max_concurrent_reads
+        self._lock = threading.Lock()
+        self._latencies_ms: deque[float] = deque(maxlen=_LATENCY_WINDOW)
+        self._rr = 0
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._closed = threading.Event()
+        self._explain_client: Optional["GraphDBClient"] = None
+        # Auxiliary clients (the explain client) must not overwrite the shared up-gauge.
+        if report_endpoint_health:
+            for endpoint in self.read_endpoints:
+                GRAPHDB_ENDPOINT_UP.labels(endpoint.base_url).set(1)
+
     def close(self):
+        self._closed.set()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        with self._lock:
+            explain_client, self._explain_client = self._explain_client, None
+        if explain_client is not None:
+            explain_client.close()
         self.session.close()
 
-    def select(self, sparql: str) -> Dict[str, Any]:
-        r = self.session.post(  # Post and not Get, because some queries might be too long for URL parameters, and with Post the data is sent in the body.
-            url=self.query_url,
-            data={"query": sparql},
-            headers={"Accept": "application/sparql-results+json"},
-            auth=self.auth,
-            timeout=self.timeout,
-        )
+    def _explainer(self) -> "GraphDBClient":
+        # Explains run on one separate client so they never compete with request traffic.
+        with self._lock:
+            if self._explain_client is None:
+                self._explain_client = GraphDBClient(
+                    self.base_url, self.repo_id, auth=self.auth, timeout=self.timeout,
+                    report_endpoint_health=False,
+                )
+            return self._explain_client
+
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # Each concurrent hedged read can hold a primary and a hedge worker; a smaller pool
+                # would queue primaries, and the queueing would look like latency worth hedging.
+                self._executor = ThreadPoolExecutor(
+                    max_workers=2 * max(1, self.max_concurrent_reads),
+                    thread_name_prefix="graphdb",
+                )
+            return self._executor
+
+    def _pick_endpoint(self, exclude: Optional[_Endpoint] = None) -> Optional[_Endpoint]:
+        # Least outstanding requests among healthy nodes; ties are broken round-robin.
+        with self._lock:
+            candidates = [e for e in self.read_endpoints if e.healthy and e is not exclude]
+            if not candidates:
+                if exclude is not None:
+                    return None
+                # Everything is marked down: keep serving from all nodes rather than failing fast.
+                candidates = list(self.read_endpoints)
+            self._rr += 1
+            count = len(candidates)
+            ordered = candidates[self._rr % count:] + candidates[: self._rr % count]
+            chosen = min(ordered, key=lambda e: e.outstanding)
+            chosen.outstanding += 1
+            return chosen
+
+    def _release(self, endpoint: _Endpoint) -> None:
+        with self._lock:
+            endpoint.outstanding -= 1
+
+    def _mark_down(self, endpoint: _Endpoint) -> None:
+        with self._lock:
+            if len(self.read_endpoints) == 1 or not endpoint.healthy:
+                return
+            endpoint.healthy = False
+            endpoint.retry_at = time.monotonic() + self.health_check_interval_seconds
+        GRAPHDB_ENDPOINT_UP.labels(endpoint.base_url).set(0)
+        self._schedule_probe(endpoint)
+
+    def _schedule_probe(self, endpoint: _Endpoint) -> None:
+        with self._lock:
+            if endpoint.probing:
+                return
+            endpoint.probing = True
+        # Daemon thread: a node that never comes back must not block interpreter shutdown.
+        threading.Thread(target=self._probe, args=(endpoint,), name="graphdb-probe", daemon=True).start()
+
+    def _probe(self, endpoint: _Endpoint) -> None:
+        # Active health check: re-admit the node once it answers a trivial query again.
+        recovered = False
+        try:
+            while True:
+                if self._closed.wait(max(0.0, endpoint.retry_at - time.monotonic())):
+                    return
+                try:
+                    r = self.session.post(
+                        url=endpoint.query_url,
+                        data={"query": HEALTH_QUERY},
+                        headers={"Accept": "application/sparql-results+json"},
+                        auth=self.auth,
+                        timeout=min(self.timeout, 5),
+                    )
+                    if r.status_code < 500:
+                        recovered = True
+                        break
+                except Exception:  # anything but an answer means the node is still down
+                    pass
+                endpoint.retry_at = time.monotonic() + self.health_check_interval_seconds
+        finally:
+            with self._lock:
+                endpoint.probing = False
+                endpoint.healthy = endpoint.healthy or recovered
+        if recovered:
+            GRAPHDB_ENDPOINT_UP.labels(endpoint.base_url).set(1)
+
+    def _hedge_delay_seconds(self) -> float:
+        with self._lock:
+            samples = sorted(self._latencies_ms)
+        if len(samples) < _MIN_LATENCY_SAMPLES or self.hedge_percentile is None:
+            return self.hedge_min_delay_ms / 1000
+        rank = min(len(samples) - 1, int(len(samples) * self.hedge_percentile / 100))
+        return max(self.hedge_min_delay_ms, samples[rank]) / 1000
+
+    def _post_select(self, endpoint: _Endpoint, sparql: str) -> requests.Response:
+        start = time.perf_counter()
+        try:
+            r = self.session.post(  # Post and not Get, because some queries might be too long for URL parameters, and with Post the data is sent in the body.
+                url=endpoint.query_url,
+                data={"query": sparql},
+                headers={"Accept": "application/sparql-results+json"},
+                auth=self.auth,
+                timeout=self.timeout,
+            )
+        except requests.ConnectionError:  # includes ConnectTimeout, not ReadTimeout
+            self._mark_down(endpoint)
+            raise
+        finally:
+            self._release(endpoint)
+        if r.status_code in _NODE_DOWN_STATUSES:
+            self._mark_down(endpoint)
+        elif r.status_code < 500:
+            with self._lock:
+                self._latencies_ms.append((time.perf_counter() - start) * 1000)
         r.raise_for_status()
-        return r.json()
-
-    def update(self, sparql_update: str) -> None:
-        r = self.session.post(
-            self.update_url,
-            data=sparql_update.encode("utf-8"),
-            headers={"Content-Type": "application/sparql-update"},
-            auth=self.auth,
-            timeout=self.timeout,
+        return r
+
+    def _select_with_failover(self, sparql: str) -> requests.Response:
+        endpoint = self._pick_endpoint()
+        try:
+            return self._post_select(endpoint, sparql)
+        except requests.RequestException as e:
+            if not _node_failed(e):
+                raise
+            fallback = self._pick_endpoint(exclude=endpoint)
+            if fallback is None:
+                raise
+            return self._post_select(fallback, sparql)
+
+    def _select_hedged(self, sparql: str) -> requests.Response:
+        primary = self._pick_endpoint()
+        pool = self._pool()
+        started = threading.Event()
+
+        def run_primary() -> requests.Response:
+            started.set()
+            return self._post_select(primary, sparql)
+
+        futures: List[Future] = [pool.submit(run_primary)]
+        # The hedge delay counts from when the primary request starts, not from queueing.
+        while not started.wait(0.1) and not futures[0].done():
+            pass
+        wait(futures, timeout=self._hedge_delay_seconds())
+        # Hedge when the primary is still running, or fail over straight away when its node failed.
+        primary_error = futures[0].exception() if futures[0].done() else None
+        if not futures[0].done() or (primary_error is not None and _node_failed(primary_error)):
+            secondary = self._pick_endpoint(exclude=primary)
+            if secondary is not None:
+                futures.append(pool.submit(self._post_select, secondary, sparql))
+
+        # First successful answer wins; the slower request finishes in the background.
+        pending = set(futures)
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if len(futures) > 1:
+                        GRAPHDB_HEDGED_REQUESTS.labels("primary" if future is futures[0] else "hedge").inc()
+                    return future.result()
+                error = error or future.exception()
+        assert error is not None
+        raise error
+
+    def select(
+        self,
+        sparql: str,
+        shape: str = "other",
+        params: Optional[Dict[str, Any]] = None,
+        track_slow: bool = True,
+    ) -> Dict[str, Any]:
+        # shape labels the query in metrics (meta, recommend, details-articles, ...);
+        # params are the request parameters kept with the query if it turns out slow.
+        start = time.perf_counter()
+        raw: Optional[Dict[str, Any]] = None
+        error: Optional[str] = None
+        try:
+            with track_graphdb("select", shape, len(sparql)):
+                if self.hedge_percentile is not None and len(self.read_endpoints) > 1:
+                    r = self._select_hedged(sparql)
+                else:
+                    r = self._select_with_failover(sparql)
+                observe_graphdb_response(shape, len(r.content))
+                raw = r.json()
+                return raw
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            duration_ms = (time.perf_counter() - start) * 1000
+            if track_slow and self.slow_query_ms > 0 and duration_ms >= self.slow_query_ms:
+                self._record_slow_query(sparql, shape, params, duration_ms, raw, error)
+
+    def _record_slow_query(
+        self,
+        sparql: str,
+        shape: str,
+        params: Optional[Dict[str, Any]],
+        duration_ms: float,
+        raw: Optional[Dict[str, Any]],
+        error: Optional[str],
+    ) -> None:
+        row_count = len(raw.get("results", {}).get("bindings", [])) if raw is not None else None
+        slow_query_log.record(
+            SlowQueryRecord(
+                recorded_at=time.time(),
+                shape=shape,
+                duration_ms=round(duration_ms, 1),
+                row_count=row_count,
+                query=sparql,
+                params=params or {},
+                error=error,
+            ),
+            explain_with=self._explainer() if self.explain_slow_queries and error is None else None,
         )
-        r.raise_for_status()
-        
 
+    def update(self, sparql_update: str, shape: str = "other") -> None:
+        with track_graphdb("update", shape, len(sparql_update)):
+            r = self.session.post(
+                self.write_endpoint.update_url,
+                data=sparql_update.encode("utf-8"),
+                headers={"Content-Type": "application/sparql-update"},
+                auth=self.auth,
+                timeout=self.timeout,
+            )
+            r.raise_for_status()
@@ -0,0 +1,46 @@
+"""HTTP validators (ETag / If-None-Match) and Cache-Control for read-mostly endpoints."""
+
+from __future__ import annotations
+
+import hashlib
+from typing import Any, Type
+
+from fastapi.responses import ORJSONResponse
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+
+
+def strong_etag(*parts: bytes) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(part)
+    return f'"{digest.hexdigest()}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    # If-None-Match uses weak comparison (RFC 9110 13.1.2), so a W/ prefix still matches.
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = [c.strip() for c in header.split(",")]
+    return "*" in candidates or any(c.removeprefix("W/") == etag for c in candidates)
+
+
+def not_modified(etag: str, cache_control: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
+
+
+def conditional_json_response(
+    request: Request,
+    content: Any,
+    cache_control: str,
+    response_class: Type[JSONResponse] = ORJSONResponse,
+) -> Response:
+    # ETag from the encoded body: clients holding the same bytes get an empty 304.
+    response = response_class(content)
+    etag = strong_etag(response.body)
+    if etag_matches(request, etag):
+        return not_modified(etag, cache_control)
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
+    return response
@@ -0,0 +1,204 @@
+"""Prometheus metrics for HTTP requests, GraphDB queries, Postgres statements and caches."""
+
+from __future__ import annotations
+
+import re
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Iterator
+
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+# Request latencies span ~1 ms (cached meta) to tens of seconds (GraphDB timeouts).
+_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+_SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "mlguide_http_request_duration_seconds",
+    "HTTP request latency by route template.",
+    ["method", "route", "status"],
+    buckets=_LATENCY_BUCKETS,
+)
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    "mlguide_http_requests_in_flight",
+    "HTTP requests currently being served.",
+    ["method"],
+)
+HTTP_RESPONSE_SIZE = Histogram(
+    "mlguide_http_response_size_bytes",
+    "HTTP response body size by route template.",
+    ["method", "route"],
+    buckets=_SIZE_BUCKETS,
+)
+
+GRAPHDB_QUERY_DURATION = Histogram(
+    "mlguide_graphdb_query_duration_seconds",
+    "GraphDB round-trip latency by operation and query shape.",
+    ["operation", "shape"],
+    buckets=_LATENCY_BUCKETS,
+)
+GRAPHDB_QUERIES_IN_FLIGHT = Gauge(
+    "mlguide_graphdb_queries_in_flight",
+    "GraphDB requests currently waiting for a response.",
+    ["operation"],
+)
+GRAPHDB_ERRORS = Counter(
+    "mlguide_graphdb_errors_total",
+    "Failed GraphDB requests by operation, query shape and error type.",
+    ["operation", "shape", "error"],
+)
+GRAPHDB_PAYLOAD_SIZE = Histogram(
+    "mlguide_graphdb_payload_bytes",
+    "Size of SPARQL requests sent and results received.",
+    ["direction", "shape"],
+    buckets=_SIZE_BUCKETS,
+)
+GRAPHDB_ENDPOINT_UP = Gauge(
+    "mlguide_graphdb_endpoint_up",
+    "Whether a GraphDB read endpoint is currently considered healthy.",
+    ["endpoint"],
+)
+GRAPHDB_HEDGED_REQUESTS = Counter(
+    "mlguide_graphdb_hedged_requests_total",
+    "Hedged SELECTs by which request answered first (primary or hedge).",
+    ["winner"],
+)
+
+POSTGRES_QUERY_DURATION = Histogram(
+    "mlguide_postgres_query_duration_seconds",
+    "Postgres statement latency by statement kind and table.",
+    ["statement"],
+    buckets=_LATENCY_BUCKETS,
+)
+POSTGRES_QUERIES_IN_FLIGHT = Gauge(
+    "mlguide_postgres_queries_in_flight",
+    "Postgres statements currently executing.",
+)
+POSTGRES_ERRORS = Counter(
+    "mlguide_postgres_errors_total",
+    "Failed Postgres statements by statement kind and table.",
+    ["statement", "error"],
+)
+POSTGRES_CONNECT_DURATION = Histogram(
+    "mlguide_postgres_connect_duration_seconds",
+    "Time to open a Postgres connection.",
+    buckets=_LATENCY_BUCKETS,
+)
+
+CACHE_REQUESTS = Counter(
+    "mlguide_cache_requests_total",
+    "Result cache lookups by cache and result (hit or miss).",
+    ["cache", "result"],
+)
+CACHE_REFRESHES = Counter(
+    "mlguide_cache_refreshes_total",
+    "Background refresh-ahead reloads by cache and outcome.",
+    ["cache", "outcome"],
+)
+CACHE_ENTRIES = Gauge(
+    "mlguide_cache_entries",
+    "Entries currently held by a result cache.",
+    ["cache"],
+)
+APP_READY = Gauge(
+    "mlguide_ready",
+    "1 once the startup warm-up has finished and the API reports ready.",
+)
+
+_UNMATCHED_ROUTE = "unmatched"
+_SQL_STATEMENT_RE = re.compile(
+    r"^\s*(?P<verb>\w+)(?:.*?\b(?:FROM|INTO|UPDATE|TABLE(?:\s+IF\s+NOT\s+EXISTS)?)\s+(?P<table>\w+))?",
+    re.IGNORECASE | re.DOTALL,
+)
+
+
+@contextmanager
+def track_graphdb(operation: str, shape: str, request_bytes: int) -> Iterator[None]:
+    GRAPHDB_PAYLOAD_SIZE.labels("request", shape).observe(request_bytes)
+    in_flight = GRAPHDB_QUERIES_IN_FLIGHT.labels(operation)
+    in_flight.inc()
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception as e:
+        GRAPHDB_ERRORS.labels(operation, shape, type(e).__name__).inc()
+        raise
+    finally:
+        GRAPHDB_QUERY_DURATION.labels(operation, shape).observe(time.perf_counter() - start)
+        in_flight.dec()
+
+
+def observe_graphdb_response(shape: str, response_bytes: int) -> None:
+    GRAPHDB_PAYLOAD_SIZE.labels("response", shape).observe(response_bytes)
+
+
+@lru_cache(maxsize=256)
+def sql_statement_label(sql: str) -> str:
+    # "INSERT saved_searches", "SELECT users", ... keeps label cardinality bounded by the schema.
+    match = _SQL_STATEMENT_RE.match(sql)
+    if match is None:
+        return "other"
+    verb = match.group("verb").upper()
+    table = match.group("table")
+    return f"{verb} {table.lower()}" if table else verb
+
+
+@contextmanager
+def track_postgres(statement: str) -> Iterator[None]:
+    POSTGRES_QUERIES_IN_FLIGHT.inc()
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception as e:
+        POSTGRES_ERRORS.labels(statement, type(e).__name__).inc()
+        raise
+    finally:
+        POSTGRES_QUERY_DURATION.labels(statement).observe(time.perf_counter() - start)
+        POSTGRES_QUERIES_IN_FLIGHT.dec()
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware timing every HTTP request by its route template."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+        response_bytes = 0
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, response_bytes
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                response_bytes += len(message.get("body", b""))
+            await send(message)
+
+        # The route template is only known after routing, so in-flight requests are per method.
+        in_flight = HTTP_REQUESTS_IN_FLIGHT.labels(method)
+        in_flight.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            in_flight.dec()
+            route = scope.get("route")
+            route_label = getattr(route, "path", None) or _UNMATCHED_ROUTE
+            HTTP_REQUEST_DURATION.labels(method, route_label, str(status_code)).observe(elapsed)
+            HTTP_RESPONSE_SIZE.labels(method, route_label).observe(response_bytes)
+
+
+def metrics_endpoint(request: Request) -> Response:
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,181 @@
+"""Runner for the SPARQL update migrations in ontology-files/sparql/updates.
+
+Run from the backend directory:
+
+    python -m app.migrations              # apply pending *.ru files
+    python -m app.migrations --status     # list applied / pending / modified files
+    python -m app.migrations --dry-run    # print the update requests instead of sending them
+
+Pending files are applied in filename order. Up to --batch-size files are joined into one
+SPARQL update request together with the INSERT DATA that records them in the system graph and
+the data-version bump, so GraphDB commits them in one transaction (all or nothing). If a batch
+fails, its files are retried one by one so the error points at a single file and the ones
+before it are still applied.
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import logging
+import sys
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import quote
+
+import requests
+
+from app.graphdb import GraphDBClient
+from app.services.data_version import (
+    BUMP_DATA_VERSION_UPDATE,
+    SYSTEM_GRAPH,
+    SYSTEM_PREFIXES,
+    get_data_version,
+    strip_trailing_separators,
+)
+from app.services.sparql_results import bindings_to_rows
+from app.settings import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MIGRATIONS_DIR = Path(__file__).resolve().parents[2] / "ontology-files" / "sparql" / "updates"
+
+APPLIED_MIGRATIONS_QUERY = SYSTEM_PREFIXES + f"""
+SELECT ?file ?sha256 WHERE {{
+  GRAPH <{SYSTEM_GRAPH}> {{
+    ?migration a mlg:Migration ;
+               mlg:file ?file ;
+               mlg:sha256 ?sha256 .
+  }}
+}}
+"""
+
+
+@dataclass
+class Migration:
+    path: Path
+    sha256: str
+
+    @property
+    def name(self) -> str:
+        return self.path.name
+
+    def body(self) -> str:
+        return strip_trailing_separators(self.path.read_text(encoding="utf-8").strip())
+
+
+def discover(directory: Path) -> List[Migration]:
+    return [
+        Migration(path, hashlib.sha256(path.read_bytes()).hexdigest())
+        for path in sorted(directory.glob("*.ru"))
+    ]
+
+
+def applied_migrations(db: GraphDBClient) -> Dict[str, str]:
+    rows = bindings_to_rows(db.select(APPLIED_MIGRATIONS_QUERY, shape="migration"))
+    return {row["file"]: row["sha256"] for row in rows}
+
+
+def _sparql_string(value: str) -> str:
+    return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def _record_update(migrations: List[Migration], applied_at: str) -> str:
+    triples = "\n".join(
+        f"    <urn:mlguide:migration:{quote(m.name)}> a mlg:Migration ; mlg:file {_sparql_string(m.name)} ;"
+        f" mlg:sha256 {_sparql_string(m.sha256)} ; mlg:appliedAt \"{applied_at}\"^^xsd:dateTime ."
+        for m in migrations
+    )
+    return SYSTEM_PREFIXES + f"INSERT DATA {{\n  GRAPH <{SYSTEM_GRAPH}> {{\n{triples}\n  }}\n}}"
+
+
+def build_batch_update(migrations: List[Migration]) -> str:
+    # One request = one GraphDB transaction: the migrations, their records and the version bump.
+    applied_at = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    operations = [m.body() for m in migrations]
+    operations += [_record_update(migrations, applied_at), BUMP_DATA_VERSION_UPDATE.strip()]
+    # Newline before ';' so a trailing comment in a file cannot swallow the separator.
+    return "\n;\n".join(operations)
+
+
+def _apply(db: GraphDBClient, batch: List[Migration], dry_run: bool) -> None:
+    update = build_batch_update(batch)
+    if dry_run:
+        print(f"# --- {', '.join(m.name for m in batch)}\n{update}\n")
+        return
+    db.update(update, shape="migration")
+    for migration in batch:
+        logger.info("Applied %s", migration.name)
+
+
+def run(db: GraphDBClient, directory: Path, batch_size: int = 20, dry_run: bool = False) -> int:
+    # Returns the number of applied migrations; raises on the first migration that fails alone.
+    applied = applied_migrations(db)
+    migrations = discover(directory)
+    for migration in migrations:
+        recorded = applied.get(migration.name)
+        if recorded is not None and recorded != migration.sha256:
+            logger.warning("%s was modified after it was applied; edits are not re-run", migration.name)
+    pending = [m for m in migrations if m.name not in applied]
+    if not pending:
+        logger.info("No pending migrations (%d applied)", len(applied))
+        return 0
+
+    count = 0
+    for start in range(0, len(pending), batch_size):
+        batch = pending[start:start + batch_size]
+        try:
+            _apply(db, batch, dry_run)
+            count += len(batch)
+        except requests.HTTPError as e:
+            if len(batch) == 1:
+                raise
+            logger.warning("Batch of %d failed (%s), retrying one by one", len(batch), e)
+            for migration in batch:
+                _apply(db, [migration], dry_run)
+                count += 1
+    return count
+
+
+def _print_status(db: GraphDBClient, directory: Path) -> None:
+    applied = applied_migrations(db)
+    for migration in discover(directory):
+        recorded = applied.get(migration.name)
+        state = "pending" if recorded is None else "applied" if recorded == migration.sha256 else "modified"
+        print(f"{state:<9} {migration.name}")
+    print(f"data version: {get_data_version(db)}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dir", type=Path, default=DEFAULT_MIGRATIONS_DIR, help="directory with *.ru files")
+    parser.add_argument("--batch-size", type=int, default=20, help="migrations per transaction")
+    parser.add_argument("--status", action="store_true", help="show applied/pending migrations and exit")
+    parser.add_argument("--dry-run", action="store_true", help="print the update requests, send nothing")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+
+    # Reads and writes both go to the primary: a replica may not have seen the last run yet.
+    db = GraphDBClient(settings.graphdb_write_base_url or settings.graphdb_base_url, settings.graphdb_repo_id)
+    try:
+        if args.status:
+            _print_status(db, args.dir)
+            return 0
+        count = run(db, args.dir, batch_size=max(1, args.batch_size), dry_run=args.dry_run)
+        if count and not args.dry_run:
+            logger.info("Applied %d migration(s); data version is now %d", count, get_data_version(db))
+        return 0
+    except requests.HTTPError as e:
+        detail = getattr(getattr(e, "response", None), "text", str(e))
+        logger.error("Migration failed: %s", detail)
+        return 1
+    except requests.RequestException as e:
+        logger.error("GraphDB not reachable: %s", e)
+        return 1
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,545 @@
+"""Chunked, parallel Turtle loader for the GraphDB repository.
+
+Run from the backend directory:
+
+    python -m app.ontology_loader ../ontology-files                      # everything, default graph
+    python -m app.ontology_loader ../ontology-files --graph-prefix http://h-da.de/graphs/
+    python -m app.ontology_loader big_articles.ttl --graph http://example.com/ml-articles/graph --diff
+
+Files are read line by line and split into top-level Turtle statements; statements are grouped
+into chunks of about --chunk-bytes (each carrying the @prefix/@base header in effect) and PUT
+to one RDF4J transaction (/repositories/<id>/transactions) by --workers threads. Nothing is
+visible to readers until the final COMMIT; any failed chunk rolls the whole run back. A run
+that changes data also bumps the data version (app.services.data_version) in that transaction.
+
+Each chunk is parsed as its own Turtle document, so a blank node label (_:b1) would name a
+different node in every chunk it appears in. Statements are therefore never split across
+chunks while a label they share is still used further on; the chunk grows until every label
+in it has been seen for the last time (a @prefix/@base change in between is rejected).
+
+--diff compares each file with the snapshot kept from its last successful load (see
+--state-dir) at statement-block level: removed or edited blocks are deleted, new or edited
+blocks are added, unchanged blocks are not sent. A deleted block may share triples (rdf:type,
+a label) with an unchanged block about the same subject, so unchanged blocks of every file
+loaded into that graph in the run whose subject IRI matches a deleted block's are re-added.
+Blocks with blank nodes cannot be deleted by value, and added blocks with blank nodes cannot
+refer to nodes already in the store, so --diff refuses to add or re-add those; use --replace
+(clear the target graph, then load) after editing them.
+"""
+from __future__ import annotations
+
+import argparse
+import functools
+import gzip
+import hashlib
+import logging
+import re
+import shutil
+import sys
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import IO, Dict, FrozenSet, Iterable, Iterator, List, Optional, Set, Tuple
+from urllib.parse import urlencode, urljoin
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from app.services.data_version import BUMP_DATA_VERSION_UPDATE
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STATE_DIR = Path(__file__).resolve().parents[1] / ".ontology-loader-state"
+DEFAULT_CHUNK_BYTES = 1 << 20
+
+# Characters that change the splitter state; everything else is skipped in C by the regex.
+# Blank node labels are matched whole; the lookbehind keeps prefixed names like ex_:a out.
+_SIGNIFICANT = re.compile(r'"""|\'\'\'|\\.|(?<![\w.:-])_:[\w-]+(?:\.+[\w-]+)*|["\'<>#\[\]().]')
+_STRING_END = {quote: re.compile(r"\\.|" + quote) for quote in ('"""', "'''", '"', "'")}
+_SPARQL_DIRECTIVE = re.compile(r"^\s*(PREFIX|BASE)\b[^<]*<[^>]*>\s*$", re.IGNORECASE)
+_TURTLE_DIRECTIVE = re.compile(r"^\s*@(prefix|base)\b", re.IGNORECASE)
+_HEADER_DIRECTIVE = re.compile(r"^\s*@?(prefix|base)\s*(?:([\w.-]*):)?\s*<([^>]*)>", re.IGNORECASE)
+_SUBJECT = re.compile(r"<([^>]*)>|([\w.-]*):((?:[^\s;,\\]|\\.)*)")
+
+
+@dataclass
+class Statement:
+    header: str  # @prefix/@base directives in effect for this statement
+    text: str
+    has_blank_nodes: bool
+    blank_labels: FrozenSet[str] = frozenset()
+
+    def digest(self) -> bytes:
+        return hashlib.sha1(f"{self.header}\0{self.text}".encode("utf-8")).digest()
+
+    def subject(self) -> Optional[str]:
+        # Absolute subject IRI, or None for blank node subjects ([...], (...), _:x).
+        match = _SUBJECT.match(self.text)
+        if match is None:
+            return None
+        base, prefixes = _namespaces(self.header)
+        if match.group(1) is not None:
+            return urljoin(base, match.group(1))
+        namespace = prefixes.get(match.group(2))
+        if namespace is None:
+            return None
+        return namespace + re.sub(r"\\(.)", r"\1", match.group(3))
+
+
+@functools.lru_cache(maxsize=64)
+def _namespaces(header: str) -> Tuple[str, Dict[str, str]]:
+    # (base IRI, prefix -> namespace IRI) declared by a Statement header
+    base = ""
+    prefixes: Dict[str, str] = {}
+    for line in header.splitlines():
+        match = _HEADER_DIRECTIVE.match(line)
+        if match is None:
+            continue
+        iri = urljoin(base, match.group(3))
+        if match.group(1).lower() == "base":
+            base = iri
+        else:
+            prefixes[match.group(2) or ""] = iri
+    return base, prefixes
+
+
+@dataclass
+class Chunk:
+    header: str
+    statements: List[str] = field(default_factory=list)
+    size: int = 0
+
+    def body(self) -> bytes:
+        return (self.header + "\n" + "\n".join(self.statements) + "\n").encode("utf-8")
+
+
+def iter_statements(stream: IO[str]) -> Iterator[Statement]:
+    # Streaming splitter: tracks IRIs, (long) strings, comments and []/() nesting so a '.'
+    # only ends a statement at depth 0 when followed by whitespace, a comment or end of line.
+    header_lines: List[str] = []
+    header = ""
+    parts: List[str] = []
+    quote: Optional[str] = None
+    in_iri = False
+    depth = 0
+    blank_nodes = False
+    labels: Set[str] = set()
+
+    for line in stream:
+        if not parts and quote is None:
+            stripped = line.strip()
+            if not stripped or stripped.startswith("#"):
+                continue
+            if _SPARQL_DIRECTIVE.match(line):
+                header_lines.append(stripped)
+                header = "\n".join(header_lines)
+                continue
+
+        start = 0
+        pos = 0
+        while True:
+            # Inside a string or IRI only its terminator matters, so jump straight to it.
+            if quote is not None:
+                match = _STRING_END[quote].search(line, pos)
+                if match is None:
+                    break
+                pos = match.end()
+                if match.group() == quote:
+                    quote = None
+                continue
+            if in_iri:
+                end = line.find(">", pos)
+                if end < 0:
+                    break
+                pos = end + 1
+                in_iri = False
+                continue
+            match = _SIGNIFICANT.search(line, pos)
+            if match is None:
+                break
+            token = match.group()
+            pos = match.end()
+            if token.startswith("\\"):
+                continue
+            if token.startswith("_:"):
+                labels.add(token)
+                continue
+            if token in ('"""', "'''", '"', "'"):
+                quote = token
+            elif token == "<":
+                in_iri = True
+            elif token == "#":
+                break
+            elif token in "[(":
+                depth += 1
+                blank_nodes = blank_nodes or token == "["
+            elif token in "])":
+                depth -= 1
+            elif token == "." and depth == 0 and (pos == len(line) or line[pos] in " \t\r\n#"):
+                parts.append(line[start:pos])
+                text = "".join(parts).strip()
+                parts = []
+                start = pos
+                if _TURTLE_DIRECTIVE.match(text):
+                    header_lines.append(text)
+                    header = "\n".join(header_lines)
+                else:
+                    yield Statement(header, text, blank_nodes or bool(labels), frozenset(labels))
+                blank_nodes = False
+                labels = set()
+        rest = line[start:]
+        if parts or rest.strip():
+            parts.append(rest)
+
+    leftover = "".join(parts).strip()
+    if leftover:
+        raise ValueError(f"Unterminated Turtle statement at end of file: {leftover[:80]!r}")
+
+
+def iter_chunks(
+    statements: Iterable[Statement],
+    chunk_bytes: int,
+    label_last_use: Optional[Dict[str, int]] = None,
+) -> Iterator[Chunk]:
+    # label_last_use maps each blank node label to the index (in statements) of its last use;
+    # no chunk ends before that statement, so all uses of a label are parsed as one document.
+    chunk: Optional[Chunk] = None
+    open_until = -1
+    for index, statement in enumerate(statements):
+        labels_open = index <= open_until
+        # A directive in the middle of a file starts a new chunk so every chunk has one header.
+        if chunk is not None and chunk.header != statement.header:
+            if labels_open:
+                raise ValueError(
+                    "Blank node labels are used on both sides of a @prefix/@base directive; "
+                    "move the directive or use [] blank nodes"
+                )
+            yield chunk
+            chunk = None
+        elif chunk is not None and chunk.size >= chunk_bytes and not labels_open:
+            yield chunk
+            chunk = None
+        if chunk is None:
+            chunk = Chunk(statement.header)
+        chunk.statements.append(statement.text)
+        chunk.size += len(statement.text) + 1
+        if label_last_use:
+            for label in statement.blank_labels:
+                open_until = max(open_until, label_last_use.get(label, index))
+    if chunk is not None:
+        yield chunk
+
+
+def _open_text(path: Path) -> IO[str]:
+    if path.suffix == ".gz":
+        return gzip.open(path, "rt", encoding="utf-8")
+    return path.open("r", encoding="utf-8")
+
+
+def _mentions_blank_labels(path: Path) -> bool:
+    # Cheap pre-check so files without "_:" skip the label pass.
+    with _open_text(path) as stream:
+        return any("_:" in line for line in stream)
+
+
+def _label_last_use(path: Path, skip: Optional[Set[bytes]]) -> Dict[str, int]:
+    last_use: Dict[str, int] = {}
+    with _open_text(path) as stream:
+        index = 0
+        for statement in iter_statements(stream):
+            if skip is not None and statement.digest() in skip:
+                continue
+            for label in statement.blank_labels:
+                last_use[label] = index
+            index += 1
+    return last_use
+
+
+def _digests(path: Path) -> Set[bytes]:
+    with _open_text(path) as stream:
+        return {statement.digest() for statement in iter_statements(stream)}
+
+
+class Transaction:
+    # One RDF4J repository transaction; chunks are PUT by a bounded pool of worker threads.
+    # The server applies the actions of a transaction in arrival order, so parallel PUTs overlap
+    # upload and parsing while call sites use barrier() where ordering matters (DELETE -> ADD).
+    def __init__(self, base_url: str, repo_id: str, workers: int, timeout: float):
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.timeout = timeout
+        self.workers = workers
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ontology-loader")
+        # At most two chunks per worker are held in memory at once.
+        self._slots = threading.BoundedSemaphore(workers * 2)
+        self._futures: List[Future] = []
+        transactions_url = f"{base_url.rstrip('/')}/repositories/{repo_id}/transactions"
+        r = self.session.post(transactions_url, timeout=timeout)
+        r.raise_for_status()
+        self.url = urljoin(transactions_url, r.headers["Location"])
+
+    def _put(self, action: str, graph: Optional[str], body: bytes, content_type: str) -> None:
+        try:
+            params = {"action": action}
+            if graph:
+                params["context"] = f"<{graph}>"
+            r = self.session.put(
+                self.url,
+                params=params,
+                data=body,
+                headers={"Content-Type": content_type},
+                timeout=self.timeout,
+            )
+            r.raise_for_status()
+        finally:
+            self._slots.release()
+
+    def submit(self, action: str, graph: Optional[str], chunk: Chunk) -> None:
+        self._slots.acquire()
+        pending = []
+        for future in self._futures:
+            if future.done():
+                future.result()  # stop sending as soon as a chunk has failed
+            else:
+                pending.append(future)
+        self._futures = pending
+        self._futures.append(self._pool.submit(self._put, action, graph, chunk.body(), "text/turtle"))
+
+    def update(self, sparql_update: str) -> None:
+        self.barrier()
+        self._slots.acquire()
+        self._put("UPDATE", None, urlencode({"update": sparql_update}).encode("ascii"), "application/x-www-form-urlencoded")
+
+    def barrier(self) -> None:
+        futures, self._futures = self._futures, []
+        for future in futures:
+            future.result()
+
+    def commit(self) -> None:
+        self.barrier()
+        r = self.session.put(self.url, params={"action": "COMMIT"}, timeout=self.timeout)
+        r.raise_for_status()
+
+    def rollback(self) -> None:
+        for future in self._futures:
+            future.cancel()
+        try:
+            self.session.delete(self.url, timeout=self.timeout)
+        except requests.RequestException as e:
+            logger.warning("Rollback of %s failed: %s", self.url, e)
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=True, cancel_futures=True)
+        self.session.close()
+
+
+@dataclass
+class LoadJob:
+    path: Path
+    graph: Optional[str]
+    snapshot: Path
+    added: int = 0
+    deleted: int = 0
+    chunks: int = 0
+    blank_node_deletes: int = 0
+    deleted_subjects: Set[str] = field(default_factory=set)
+
+
+def _snapshot_path(state_dir: Path, base_url: str, repo_id: str, path: Path, graph: Optional[str]) -> Path:
+    key = hashlib.sha1(f"{base_url}|{repo_id}|{graph or ''}|{path.resolve()}".encode("utf-8")).hexdigest()[:16]
+    return state_dir / f"{path.stem}-{key}.ttl.gz"
+
+
+def _send(
+    txn: Optional[Transaction],
+    job: LoadJob,
+    action: str,
+    path: Path,
+    chunk_bytes: int,
+    skip: Optional[Set[bytes]] = None,
+    resend: Optional[Set[str]] = None,
+) -> None:
+    # Statements whose digest is in skip are not sent, unless (ADD) their subject is in resend.
+    def selected(stream: IO[str]) -> Iterator[Statement]:
+        for statement in iter_statements(stream):
+            if skip is not None and statement.digest() in skip:
+                if not resend or statement.subject() not in resend:
+                    continue
+                if statement.has_blank_nodes:
+                    # Re-adding it would create its blank nodes a second time.
+                    raise ValueError(
+                        f"{path}: an unchanged statement about {statement.subject()} has blank nodes "
+                        "and shares its subject with a changed one; reload with --replace"
+                    )
+            if action == "DELETE":
+                job.deleted += 1
+                job.blank_node_deletes += statement.has_blank_nodes
+                subject = statement.subject()
+                if subject is not None:
+                    job.deleted_subjects.add(subject)
+            else:
+                if skip is not None and statement.blank_labels:
+                    # Only part of the file is sent, so the label cannot be tied to the node
+                    # the unchanged statements refer to; it would become a new node.
+                    raise ValueError(
+                        f"{path}: a changed statement uses blank node label "
+                        f"{min(statement.blank_labels)}; reload with --replace"
+                    )
+                job.added += 1
+            yield statement
+
+    label_last_use = None
+    if action == "ADD" and skip is None and _mentions_blank_labels(path):
+        label_last_use = _label_last_use(path, skip)
+    with _open_text(path) as stream:
+        for chunk in iter_chunks(selected(stream), chunk_bytes, label_last_use):
+            job.chunks += 1
+            if txn is not None:
+                txn.submit(action, job.graph, chunk)
+
+
+def _save_snapshot(source: Path, snapshot: Path) -> None:
+    snapshot.parent.mkdir(parents=True, exist_ok=True)
+    tmp = snapshot.with_suffix(".tmp")
+    with source.open("rb") as src, gzip.open(tmp, "wb") as dst:
+        shutil.copyfileobj(src, dst)
+    tmp.replace(snapshot)
+
+
+def load(
+    jobs: List[LoadJob],
+    base_url: str,
+    repo_id: str,
+    mode: str = "full",
+    chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+    workers: int = 4,
+    timeout: float = 300.0,
+    dry_run: bool = False,
+) -> None:
+    # mode: "full" adds every statement, "replace" clears each target graph first,
+    # "diff" sends only the blocks that changed since the last snapshot.
+    txn = None if dry_run else Transaction(base_url, repo_id, workers, timeout)
+    try:
+        if mode == "replace" and txn is not None:
+            for graph in dict.fromkeys(job.graph for job in jobs):
+                txn.update(f"CLEAR SILENT GRAPH <{graph}>" if graph else "CLEAR SILENT DEFAULT")
+
+        diffs = {}
+        if mode == "diff":
+            for job in jobs:
+                if job.snapshot.exists():
+                    diffs[job.path] = (_digests(job.snapshot), _digests(job.path))
+                else:
+                    logger.warning("No snapshot for %s yet, loading all of it", job.path)
+            # Every delete must be applied before any add: an edited block usually shares
+            # triples (rdf:type, labels) with its old version.
+            for job in jobs:
+                if job.path in diffs:
+                    old, new = diffs[job.path]
+                    _send(txn, job, "DELETE", job.snapshot, chunk_bytes, skip=new)
+            if txn is not None:
+                txn.barrier()
+
+        # A delete removes each of its triples wherever it was stated, so unchanged blocks about
+        # a deleted block's subject are re-added, across all files loaded into the same graph.
+        deleted_subjects: Dict[Optional[str], Set[str]] = {}
+        for job in jobs:
+            deleted_subjects.setdefault(job.graph, set()).update(job.deleted_subjects)
+
+        for job in jobs:
+            old = diffs[job.path][0] if job.path in diffs else None
+            _send(txn, job, "ADD", job.path, chunk_bytes, skip=old, resend=deleted_subjects[job.graph])
+
+        if txn is not None:
+            if mode == "replace" or any(job.chunks for job in jobs):
+                txn.update(BUMP_DATA_VERSION_UPDATE)
+            txn.commit()
+    except BaseException:
+        if txn is not None:
+            txn.rollback()
+        raise
+    finally:
+        if txn is not None:
+            txn.close()
+
+    if not dry_run:
+        for job in jobs:
+            _save_snapshot(job.path, job.snapshot)
+
+
+def _collect_files(paths: List[Path]) -> List[Path]:
+    files: List[Path] = []
+    for path in paths:
+        files += sorted(path.glob("*.ttl")) if path.is_dir() else [path]
+    return files
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("paths", nargs="+", type=Path, help="Turtle files or directories of *.ttl files")
+    graph = parser.add_mutually_exclusive_group()
+    graph.add_argument("--graph", default=None, help="named graph IRI for all files (default graph if omitted)")
+    graph.add_argument("--graph-prefix", default=None, help="load each file into <prefix><file stem>")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--diff", action="store_true", help="send only blocks changed since the last load")
+    mode.add_argument("--replace", action="store_true", help="clear each target graph before loading")
+    parser.add_argument("--chunk-bytes", type=int, default=DEFAULT_CHUNK_BYTES)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--timeout", type=float, default=300.0, help="seconds per HTTP request")
+    parser.add_argument("--state-dir", type=Path, default=DEFAULT_STATE_DIR, help="snapshots used by --diff")
+    parser.add_argument("--base-url", default=None, help="default: GRAPHDB_WRITE_BASE_URL or GRAPHDB_BASE_URL")
+    parser.add_argument("--repo-id", default=None, help="default: GRAPHDB_REPO_ID")
+    parser.add_argument("--dry-run", action="store_true", help="split and diff, but send nothing")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+
+    base_url, repo_id = args.base_url, args.repo_id
+    if base_url is None or repo_id is None:
+        from app.settings import settings
+
+        base_url = base_url or settings.graphdb_write_base_url or settings.graphdb_base_url
+        repo_id = repo_id or settings.graphdb_repo_id
+
+    jobs = []
+    for path in _collect_files(args.paths):
+        target = args.graph or (f"{args.graph_prefix}{path.stem}" if args.graph_prefix else None)
+        jobs.append(LoadJob(path, target, _snapshot_path(args.state_dir, base_url, repo_id, path, target)))
+    if not jobs:
+        parser.error("no Turtle files found")
+
+    started = time.perf_counter()
+    try:
+        load(
+            jobs,
+            base_url,
+            repo_id,
+            mode="diff" if args.diff else "replace" if args.replace else "full",
+            chunk_bytes=args.chunk_bytes,
+            workers=args.workers,
+            timeout=args.timeout,
+            dry_run=args.dry_run,
+        )
+    except (requests.RequestException, ValueError, OSError) as e:
+        logger.error("Load failed, transaction rolled back: %s", e)
+        return 1
+
+    for job in jobs:
+        logger.info(
+            "%s -> %s: +%d / -%d statement blocks in %d chunks",
+            job.path.name, job.graph or "default graph", job.added, job.deleted, job.chunks,
+        )
+        if job.blank_node_deletes:
+            logger.warning(
+                "%s: %d removed blocks contain blank nodes and could not be deleted; reload with --replace",
+                job.path.name, job.blank_node_deletes,
+            )
+    logger.info("%s in %.2fs", "Dry run finished" if args.dry_run else "Committed", time.perf_counter() - started)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
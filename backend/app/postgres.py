@@ -6,12 +6,25 @@ from typing import Iterator
 import psycopg
 from psycopg.rows import dict_row
 
+from app.metrics import POSTGRES_CONNECT_DURATION, sql_statement_label, track_postgres
 from app.settings import settings
 
 
+class InstrumentedCursor(psycopg.Cursor):
+    # Records latency and errors per statement kind/table for /metrics
+    def execute(self, query, params=None, **kwargs):
+        with track_postgres(sql_statement_label(str(query))):
+            return super().execute(query, params, **kwargs)
+
+
 @contextmanager
 def get_postgres_connection() -> Iterator[psycopg.Connection]:
-    conn = psycopg.connect(settings.database_url, row_factory=dict_row)
+    with POSTGRES_CONNECT_DURATION.time():
+        conn = psycopg.connect(
+            settings.database_url,
+            row_factory=dict_row,
+            cursor_factory=InstrumentedCursor,
+        )
     try:
         yield conn
     finally:
@@ -0,0 +1,17 @@
+# liveness and readiness probes; readiness waits for the startup warm-up
+
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from app.warmup import warmup_status
+
+router = APIRouter()
+
+@router.get("/live")
+def live():
+    return {"ok": True}
+
+@router.get("/ready")
+def ready():
+    status = warmup_status.as_dict()
+    return JSONResponse(status, status_code=200 if warmup_status.ready else 503)
@@ -1,42 +1,63 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import JSONResponse
 
 from app.dependencies import get_graphdb
+from app.graph_version import graph_version
 from app.graphdb import GraphDBClient
+from app.http_cache import conditional_json_response
 from app.services import meta_service
+from app.settings import settings
 
 router = APIRouter()
 
+# Shared caches may keep options briefly; afterwards clients revalidate with If-None-Match.
+META_CACHE_CONTROL = f"public, max-age={settings.meta_cache_max_age_seconds}"
+
+
+@router.get("/version")
+def version():
+    # Polled data version (also sent as X-Graph-Version); clients include it in their cache keys.
+    return {"graph_version": graph_version.current}
+
 
 @router.get("/phases")
-def phases(db: GraphDBClient = Depends(get_graphdb)):
-    return meta_service.get_phases(db)
+def phases(request: Request, db: GraphDBClient = Depends(get_graphdb)):
+    return conditional_json_response(request, meta_service.get_phases(db), META_CACHE_CONTROL)
 
 
 @router.get("/clusters")
-def clusters(db: GraphDBClient = Depends(get_graphdb)):
-    return meta_service.get_clusters(db)
+def clusters(request: Request, db: GraphDBClient = Depends(get_graphdb)):
+    return conditional_json_response(request, meta_service.get_clusters(db), META_CACHE_CONTROL)
+
+
+@router.get("/clusters/keywords")
+def cluster_keywords(request: Request, db: GraphDBClient = Depends(get_graphdb)):
+    # Default encoder: masks grow past 64 bits with more than 64 clusters, which orjson rejects.
+    return conditional_json_response(
+        request, meta_service.get_cluster_keywords(db), META_CACHE_CONTROL, response_class=JSONResponse
+    )
 
 
 @router.get("/paradigms")
-def paradigms(db: GraphDBClient = Depends(get_graphdb)):
-    return meta_service.get_paradigms(db)
+def paradigms(request: Request, db: GraphDBClient = Depends(get_graphdb)):
+    return conditional_json_response(request, meta_service.get_paradigms(db), META_CACHE_CONTROL)
 
 
 @router.get("/tasks")
-def tasks(db: GraphDBClient = Depends(get_graphdb)):
-    return meta_service.get_tasks(db)
+def tasks(request: Request, db: GraphDBClient = Depends(get_graphdb)):
+    return conditional_json_response(request, meta_service.get_tasks(db), META_CACHE_CONTROL)
 
 
 @router.get("/enums/dataset-types")
-def dataset_types(db: GraphDBClient = Depends(get_graphdb)):
-    return meta_service.get_dataset_types(db)
+def dataset_types(request: Request, db: GraphDBClient = Depends(get_graphdb)):
+    return conditional_json_response(request, meta_service.get_dataset_types(db), META_CACHE_CONTROL)
 
 
 @router.get("/enums/conditions")
-def conditions(db: GraphDBClient = Depends(get_graphdb)):
-    return meta_service.get_conditions(db)
+def conditions(request: Request, db: GraphDBClient = Depends(get_graphdb)):
+    return conditional_json_response(request, meta_service.get_conditions(db), META_CACHE_CONTROL)
 
 
 @router.get("/enums/performance")
-def performance(db: GraphDBClient = Depends(get_graphdb)):
-    return meta_service.get_performance(db)
+def performance(request: Request, db: GraphDBClient = Depends(get_graphdb)):
+    return conditional_json_response(request, meta_service.get_performance(db), META_CACHE_CONTROL)
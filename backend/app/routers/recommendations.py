@@ -1,17 +1,28 @@
+from typing import List
+
 import requests
 from requests.exceptions import Timeout, ReadTimeout
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import ORJSONResponse
 
 from app.dependencies import get_graphdb
+from app.graph_version import graph_version
 from app.graphdb import GraphDBClient
+from app.http_cache import etag_matches, not_modified, strong_etag
 from app.services.recommendation_service import (
     RecommendationRequest,
     RecommendationDetailsRequest,
-    build_recommendation_query,
+    RecommendationDetailsBatchRequest,
     build_details_articles_query,
     build_details_matches_query,
+    details_response,
+    get_multi_details,
+    get_recommendations,
+    get_recommendations_batch,
+    has_match_preferences,
 )
 from app.services.sparql_results import bindings_to_rows
+from app.settings import settings
 
 import time, uuid
 import logging
@@ -19,13 +30,30 @@ logger = logging.getLogger("uvicorn.error")
 
 router = APIRouter()
 
+# Details are per request, so only the client may keep them, and it must revalidate each time.
+DETAILS_CACHE_CONTROL = "private, no-cache"
+
 
 @router.post("")
 def recommend(req: RecommendationRequest, db: GraphDBClient = Depends(get_graphdb)):
-    sparql = build_recommendation_query(req)
     try:
-        raw = db.select(sparql)
-        return bindings_to_rows(raw)
+        return ORJSONResponse(get_recommendations(db, req))
+    except requests.HTTPError as e:
+        raise HTTPException(status_code=502, detail=f"GraphDB error: {e.response.text}")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/batch")
+def recommend_batch(reqs: List[RecommendationRequest], db: GraphDBClient = Depends(get_graphdb)):
+    # Results in request order; for offline jobs that would otherwise make one call per request
+    if len(reqs) > settings.recommendation_batch_max_requests:
+        raise HTTPException(
+            status_code=422,
+            detail=f"At most {settings.recommendation_batch_max_requests} requests per batch",
+        )
+    try:
+        return ORJSONResponse(get_recommendations_batch(db, reqs))
     except requests.HTTPError as e:
         raise HTTPException(status_code=502, detail=f"GraphDB error: {e.response.text}")
     except Exception as e:
@@ -33,47 +61,37 @@ def recommend(req: RecommendationRequest, db: GraphDBClient = Depends(get_graphd
 
 
 @router.post("/details")
-def details(req: RecommendationDetailsRequest, db: GraphDBClient = Depends(get_graphdb)):
+def details(req: RecommendationDetailsRequest, request: Request, db: GraphDBClient = Depends(get_graphdb)):
+    # The body is fully determined by the request and the graph data version, so a matching
+    # If-None-Match is answered before any GraphDB query runs.
+    etag = strong_etag(str(graph_version.current).encode(), b"\0", req.model_dump_json().encode())
+    if etag_matches(request, etag):
+        return not_modified(etag, DETAILS_CACHE_CONTROL)
+
     rid = str(uuid.uuid4())[:8]
+    query_params = req.model_dump(exclude_none=True) | {"rid": rid}
     try:
         logger.info("details rid=%s running articles query", rid)
-        raw_articles = db.select(build_details_articles_query(req))
+        raw_articles = db.select(
+            build_details_articles_query(req), shape="details-articles", params=query_params
+        )
         logger.info("details rid=%s running matches query", rid)
 
         raw_matches = None
-        if req.conditions or req.performance_prefs or req.task_iri:
-            raw_matches = db.select(build_details_matches_query(req))
+        if has_match_preferences(req):
+            raw_matches = db.select(
+                build_details_matches_query(req), shape="details-matches", params=query_params
+            )
         else:
             raw_matches = {"results": {"bindings": []}}  # empty matches if no conditions/performance/task prefs
             
         articles = bindings_to_rows(raw_articles)
         matches_rows = bindings_to_rows(raw_matches)
 
-        conditions = {}
-        performance = {}
-        tasks = {}
-
-        for r in matches_rows:
-            if r.get("cond"):
-                conditions[r["cond"]] = r.get("condLabel") or r["cond"]
-            if r.get("perf"):
-                performance[r["perf"]] = r.get("perfLabel") or r["perf"]
-            if r.get("task"):
-                tasks[r["task"]] = r.get("taskLabel") or r["task"]
-
-        return {
-            "approachIri": req.approach_iri,
-            "articles": [
-                {"article": a.get("article"), "doi": a.get("doi"), "label": a.get("label")}
-                for a in articles
-                if a.get("doi")
-            ],
-            "matches": {
-                "conditions": [{"iri": iri, "label": label} for iri, label in conditions.items()],
-                "performance": [{"iri": iri, "label": label} for iri, label in performance.items()],
-                "tasks": [{"iri": iri, "label": label} for iri, label in tasks.items()],
-            },
-        }
+        return ORJSONResponse(
+            details_response(req.approach_iri, articles, matches_rows),
+            headers={"ETag": etag, "Cache-Control": DETAILS_CACHE_CONTROL},
+        )
     except (Timeout, ReadTimeout):
         logger.exception("GraphDB timeout in /details rid=%s", rid)
         raise HTTPException(status_code=504, detail="GraphDB query timed out")
@@ -87,3 +105,26 @@ def details(req: RecommendationDetailsRequest, db: GraphDBClient = Depends(get_g
         raise HTTPException(status_code=500, detail=f"{type(e).__name__}: {e}")
 
 
+@router.post("/details/batch")
+def details_batch(
+    req: RecommendationDetailsBatchRequest, request: Request, db: GraphDBClient = Depends(get_graphdb)
+):
+    # Details for several approaches (e.g. a comparison view or prefetching) in two GraphDB
+    # queries; one entry per distinct approach IRI, in request order.
+    etag = strong_etag(str(graph_version.current).encode(), b"\0", req.model_dump_json().encode())
+    if etag_matches(request, etag):
+        return not_modified(etag, DETAILS_CACHE_CONTROL)
+
+    try:
+        return ORJSONResponse(
+            get_multi_details(db, req),
+            headers={"ETag": etag, "Cache-Control": DETAILS_CACHE_CONTROL},
+        )
+    except (Timeout, ReadTimeout):
+        logger.exception("GraphDB timeout in /details/batch")
+        raise HTTPException(status_code=504, detail="GraphDB query timed out")
+    except requests.HTTPError as e:
+        raise HTTPException(status_code=502, detail=f"GraphDB error: {e.response.text}")
+    except Exception as e:
+        logger.exception("Unhandled error in /details/batch")
+        raise HTTPException(status_code=500, detail=f"{type(e).__name__}: {e}")
@@ -1,11 +1,14 @@
 # debug tool for testing GraphDB connectivity and executing SPARQL queries/updates
 
 import requests
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel
 
 from app.dependencies import get_graphdb
+from app.graph_version import graph_version
 from app.graphdb import GraphDBClient
+from app.services.data_version import with_data_version_bump
+from app.slow_queries import slow_query_log
 
 router = APIRouter()
 
@@ -18,7 +21,7 @@ class SparqlUpdate(BaseModel):
 @router.get("/health")
 def health(db: GraphDBClient = Depends(get_graphdb)):
     try:
-        db.select("SELECT (1 as ?ok) WHERE {}")
+        db.select("SELECT (1 as ?ok) WHERE {}", shape="health")
         return {"ok": True, "graphdb_reachable": True}
     except Exception as e:
         return {"ok": False, "graphdb_reachable": False, "error": str(e)}
@@ -26,7 +29,7 @@ def health(db: GraphDBClient = Depends(get_graphdb)):
 @router.post("/select")
 def sparql_select(payload: SparqlQuery, db: GraphDBClient = Depends(get_graphdb)):
     try:
-        return db.select(payload.query)
+        return db.select(payload.query, shape="debug")
     except requests.HTTPError as e:
         raise HTTPException(status_code=502, detail=f"GraphDB error: {e.response.text}")
     except Exception as e:
@@ -35,9 +38,19 @@ def sparql_select(payload: SparqlQuery, db: GraphDBClient = Depends(get_graphdb)
 @router.post("/update")
 def sparql_update(payload: SparqlUpdate, db: GraphDBClient = Depends(get_graphdb)):
     try:
-        db.update(payload.update)
-        return {"ok": True}
+        # Bumped in the same request, so caches keyed by the graph version see the change at once
+        db.update(with_data_version_bump(payload.update), shape="debug")
+        return {"ok": True, "graph_version": graph_version.refresh(db)}
     except requests.HTTPError as e:
         raise HTTPException(status_code=502, detail=f"GraphDB error: {e.response.text}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/slow-queries")
+def slow_queries(limit: int = Query(default=50, ge=1, le=1000)):
+    return slow_query_log.snapshot(limit)
+
+@router.delete("/slow-queries")
+def clear_slow_queries():
+    slow_query_log.clear()
+    return {"ok": True}
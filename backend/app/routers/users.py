@@ -3,6 +3,7 @@ from __future__ import annotations
 from datetime import datetime
 
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, Field
 import psycopg
 
@@ -40,7 +41,7 @@ class SavedSearchResponse(SavedSearchPayload):
 
 
 @router.post("/login", response_model=UserResponse)
-def login(payload: LoginRequest) -> UserResponse:
+def login(payload: LoginRequest) -> ORJSONResponse:
     username = payload.username.strip()
     if not username:
         raise HTTPException(status_code=400, detail="Username cannot be empty")
@@ -52,11 +53,12 @@ def login(payload: LoginRequest) -> UserResponse:
     except RuntimeError as exc:
         raise HTTPException(status_code=500, detail=str(exc)) from exc
 
-    return UserResponse.model_validate(row)
+    # Rows come straight from our own RETURNING clause; response_model documents them without re-validating.
+    return ORJSONResponse(row)
 
 
 @router.get("/{user_id}/saved-searches", response_model=list[SavedSearchResponse])
-def list_saved_searches(user_id: int, limit: int = 20) -> list[SavedSearchResponse]:
+def list_saved_searches(user_id: int, limit: int = 20) -> ORJSONResponse:
     try:
         rows = user_service.list_saved_searches(user_id=user_id, limit=limit)
     except psycopg.Error as exc:
@@ -64,11 +66,11 @@ def list_saved_searches(user_id: int, limit: int = 20) -> list[SavedSearchRespon
     except ValueError as exc:
         raise HTTPException(status_code=404, detail=str(exc)) from exc
 
-    return [SavedSearchResponse.model_validate(row) for row in rows]
+    return ORJSONResponse(rows)
 
 
 @router.post("/{user_id}/saved-searches", response_model=SavedSearchResponse)
-def create_saved_search(user_id: int, payload: SavedSearchPayload) -> SavedSearchResponse:
+def create_saved_search(user_id: int, payload: SavedSearchPayload) -> ORJSONResponse:
     try:
         row = user_service.save_search(user_id=user_id, payload=payload.model_dump())
     except psycopg.Error as exc:
@@ -78,4 +80,4 @@ def create_saved_search(user_id: int, payload: SavedSearchPayload) -> SavedSearc
     except RuntimeError as exc:
         raise HTTPException(status_code=500, detail=str(exc)) from exc
 
-    return SavedSearchResponse.model_validate(row)
+    return ORJSONResponse(row)
@@ -0,0 +1,90 @@
+"""Data-version marker stored in GraphDB.
+
+Everything that changes repository data (migrations, ontology loader, /sparql/update) bumps an integer in the
+system graph inside its own transaction, so caches can tell whether the data has changed.
+"""
+
+from typing import TYPE_CHECKING, Optional
+
+from app.services.sparql_results import bindings_to_rows
+
+if TYPE_CHECKING:
+    from app.graphdb import GraphDBClient
+
+# Bookkeeping graph for applied migrations and the data version; not part of the ontology.
+SYSTEM_GRAPH = "urn:mlguide:system"
+
+SYSTEM_PREFIXES = """
+PREFIX mlg: <urn:mlguide:>
+PREFIX xsd: <http://www.w3.org/2001/XMLSchema#>
+"""
+
+DATA_VERSION_QUERY = SYSTEM_PREFIXES + f"""
+SELECT ?version WHERE {{
+  GRAPH <{SYSTEM_GRAPH}> {{ mlg:data mlg:dataVersion ?version }}
+}}
+"""
+
+BUMP_DATA_VERSION_UPDATE = SYSTEM_PREFIXES + f"""
+DELETE {{ GRAPH <{SYSTEM_GRAPH}> {{ mlg:data mlg:dataVersion ?old ; mlg:dataUpdatedAt ?oldAt }} }}
+INSERT {{ GRAPH <{SYSTEM_GRAPH}> {{ mlg:data mlg:dataVersion ?new ; mlg:dataUpdatedAt ?now }} }}
+WHERE {{
+  OPTIONAL {{ GRAPH <{SYSTEM_GRAPH}> {{ mlg:data mlg:dataVersion ?old }} }}
+  OPTIONAL {{ GRAPH <{SYSTEM_GRAPH}> {{ mlg:data mlg:dataUpdatedAt ?oldAt }} }}
+  BIND(COALESCE(?old, 0) + 1 AS ?new)
+  BIND(NOW() AS ?now)
+}}
+"""
+
+
+def get_data_version(db: "GraphDBClient") -> int:
+    # 0 until the first migration or load has bumped the marker.
+    rows = bindings_to_rows(db.select(DATA_VERSION_QUERY, shape="data-version"))
+    return int(rows[0]["version"]) if rows else 0
+
+
+def _separator_comment_start(body: str, line_start: int) -> Optional[int]:
+    # First '#' on the last line with only whitespace or a ';' before it on that line; a '#'
+    # after anything else may be part of an IRI or string.
+    first = body.find("#", line_start)
+    if first < 0:
+        return None
+    previous = None
+    for i in range(line_start, first):
+        if not body[i].isspace():
+            previous = body[i]
+    for i in range(first, len(body)):
+        char = body[i]
+        if char == "#" and previous in (None, ";"):
+            return i
+        if not char.isspace():
+            previous = char
+    return None
+
+
+def strip_trailing_separators(update: str) -> str:
+    """update without trailing ';' separators and the whitespace and comments after them.
+
+    A trailing ';' would leave an empty operation when joining updates. This is a linear scan
+    from the end: a regex for it backtracks badly on input like ';   ;   ;   x', and
+    /sparql/update passes untrusted text through here.
+    """
+    body = update.rstrip()
+    result = body
+    while True:
+        if body.endswith(";"):
+            body = body[:-1].rstrip()
+            result = body
+            continue
+        # Comments count only when a ';' precedes them, so result is not moved past them here.
+        comment = _separator_comment_start(body, body.rfind("\n") + 1)
+        if comment is None:
+            return result
+        body = body[:comment].rstrip()
+
+
+def with_data_version_bump(update: str) -> str:
+    # Appends the bump as a last operation, so the change and the new version commit together.
+    # Newline before ';' so a trailing comment cannot swallow the separator.
+    body = strip_trailing_separators(update.strip())
+    return body + "\n;\n" + BUMP_DATA_VERSION_UPDATE.strip()
@@ -1,14 +1,21 @@
+from functools import lru_cache
+from pathlib import Path
+
 import requests
 from fastapi import HTTPException
 
+from app.cache import result_cache
 from app.graphdb import GraphDBClient
 from app.services.sparql_templates import PREFIXES
 from app.services.sparql_results import bindings_to_rows, rows_to_options
 
 
+CLUSTER_KEYWORD_BLOCKLIST_PATH = Path(__file__).resolve().parents[2] / "config" / "cluster_keyword_blocklist.txt"
+
+
 def _run_select(db: GraphDBClient, sparql: str):
     try:
-        return db.select(sparql)
+        return db.select(sparql, shape="meta")
     except requests.HTTPError as e:
         detail = getattr(getattr(e, "response", None), "text", str(e))
         raise HTTPException(status_code=502, detail=f"GraphDB error: {detail}")
@@ -17,8 +24,10 @@ def _run_select(db: GraphDBClient, sparql: str):
 
 
 def _select_options(db: GraphDBClient, sparql: str):
-    raw = _run_select(db, sparql)
-    return rows_to_options(bindings_to_rows(raw))
+    return result_cache.get(
+        ("meta", sparql),
+        lambda: rows_to_options(bindings_to_rows(_run_select(db, sparql))),
+    )
 
 
 def get_phases(db: GraphDBClient):
@@ -31,14 +40,78 @@ def get_phases(db: GraphDBClient):
     return _select_options(db, q)
 
 
-def get_clusters(db: GraphDBClient):
-    q = PREFIXES + """
+CLUSTERS_QUERY = PREFIXES + """
     SELECT ?iri ?label WHERE {
       ?iri a mla:ApplicationCluster ;
            rdfs:label ?label .
     } ORDER BY LCASE(STR(?label))
     """
-    return _select_options(db, q)
+
+
+def get_clusters(db: GraphDBClient):
+    return _select_options(db, CLUSTERS_QUERY)
+
+
+def _blocklist_mtime() -> int:
+    try:
+        return CLUSTER_KEYWORD_BLOCKLIST_PATH.stat().st_mtime_ns
+    except FileNotFoundError:
+        return -1
+
+
+def _load_cluster_keyword_blocklist() -> frozenset[str]:
+    try:
+        raw = CLUSTER_KEYWORD_BLOCKLIST_PATH.read_text(encoding="utf-8")
+    except FileNotFoundError:
+        return frozenset()
+
+    blocked: set[str] = set()
+    for line in raw.splitlines():
+        token = line.strip()
+        if not token or token.startswith("#"):
+            continue
+        blocked.add(token.casefold())
+    return frozenset(blocked)
+
+
+@lru_cache(maxsize=8)
+def _build_cluster_keyword_index(
+    clusters: tuple[tuple[str, str], ...],
+    blocklist_mtime: int,
+):
+    # Keyed by the cluster rows and blocklist mtime, so the index is rebuilt only when either changes.
+    blocked_keywords = _load_cluster_keyword_blocklist()
+    keyword_order: list[str] = []
+    keyword_display_by_norm: dict[str, str] = {}
+    masks: dict[str, int] = {}
+
+    for position, (_, label) in enumerate(clusters):
+        # Cluster labels are expected to be comma-separated keywords.
+        for raw_keyword in label.split(","):
+            keyword = raw_keyword.strip()
+            if not keyword:
+                continue
+            norm = keyword.casefold()
+            if norm in blocked_keywords:
+                continue
+            if norm not in keyword_display_by_norm:
+                keyword_display_by_norm[norm] = keyword
+                keyword_order.append(norm)
+            masks[norm] = masks.get(norm, 0) | (1 << position)
+
+    return {
+        "clusters": [iri for iri, _ in clusters],
+        "keywords": [
+            {"keyword": keyword_display_by_norm[norm], "mask": masks[norm]}
+            for norm in keyword_order
+        ],
+    }
+
+
+def get_cluster_keywords(db: GraphDBClient):
+    """Keyword -> cluster bitmask index; bit i refers to the i-th entry of "clusters"."""
+    clusters = tuple((o["iri"], o["label"]) for o in get_clusters(db))
+    return _build_cluster_keyword_index(clusters, _blocklist_mtime())
 
 
 def get_paradigms(db: GraphDBClient):
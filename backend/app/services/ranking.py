@@ -0,0 +1,92 @@
+import re
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, List, Optional
+
+import numpy as np
+from pydantic import BaseModel
+
+# Row keys of the per-approach counts, in feature-matrix column order.
+FEATURE_COLUMNS = ("supportingArticles", "taskMatch", "possibleIfMatches", "performanceMatches")
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+class RankingWeights(BaseModel):
+    # Score = weighted sum of the counts plus text_score x the problem-text overlap (0..1).
+    supporting_articles: float = 1.0
+    task_match: float = 0.0
+    possible_if_matches: float = 0.0
+    performance_matches: float = 0.0
+    text_score: float = 0.0
+
+    def vector(self) -> np.ndarray:
+        return np.array(
+            [self.supporting_articles, self.task_match, self.possible_if_matches, self.performance_matches],
+            dtype=np.float64,
+        )
+
+
+def _tokens(text: Optional[str]) -> FrozenSet[str]:
+    return frozenset(_TOKEN_RE.findall(text.lower())) if text else frozenset()
+
+
+@dataclass(frozen=True)
+class FeatureTable:
+    """All recommendation rows of one query, with their counts as a float matrix.
+
+    rows are in the default ORDER BY, so a stable sort on the weighted score keeps that order
+    among equal scores.
+    """
+    rows: List[Dict[str, Any]]
+    matrix: np.ndarray
+    # Distinct method/approach label tokens per row, and the rows containing each token.
+    label_sizes: np.ndarray
+    token_rows: Dict[str, np.ndarray]
+
+
+def feature_table(rows: List[Dict[str, Any]]) -> FeatureTable:
+    matrix = np.array(
+        [[row.get(column) or 0 for column in FEATURE_COLUMNS] for row in rows],
+        dtype=np.float64,
+    ).reshape(len(rows), len(FEATURE_COLUMNS))
+    label_sizes = np.zeros(len(rows), dtype=np.float64)
+    token_lists: Dict[str, List[int]] = defaultdict(list)
+    for i, row in enumerate(rows):
+        tokens = _tokens(f"{row.get('methodLabel') or ''} {row.get('approachLabel') or ''}")
+        label_sizes[i] = len(tokens)
+        for token in tokens:
+            token_lists[token].append(i)
+    token_rows = {token: np.array(indices, dtype=np.intp) for token, indices in token_lists.items()}
+    return FeatureTable(rows=rows, matrix=matrix, label_sizes=label_sizes, token_rows=token_rows)
+
+
+def text_scores(table: FeatureTable, problem_text: Optional[str]) -> np.ndarray:
+    # Share of each row's method/approach label tokens that occur in the problem text.
+    overlap = np.zeros(len(table.rows), dtype=np.float64)
+    for token in _tokens(problem_text):
+        indices = table.token_rows.get(token)
+        if indices is not None:
+            overlap[indices] += 1.0
+    return np.divide(overlap, table.label_sizes, out=overlap, where=table.label_sizes > 0)
+
+
+def rank(
+    table: FeatureTable,
+    weights: RankingWeights,
+    max_results: int,
+    problem_text: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """Top max_results rows of table by weighted score, each with its "score" added."""
+    scores = table.matrix @ weights.vector()
+    if weights.text_score:
+        scores = scores + weights.text_score * text_scores(table, problem_text)
+    if max_results < len(scores):
+        # Only rows scoring at least the max_results-th best can be returned; keeping all rows
+        # tied with it preserves the stable order among equal scores.
+        cutoff = np.partition(scores, len(scores) - max_results)[len(scores) - max_results]
+        candidates = np.flatnonzero(scores >= cutoff)
+    else:
+        candidates = np.arange(len(scores))
+    order = candidates[np.argsort(-scores[candidates], kind="stable")][:max_results]
+    return [table.rows[i] | {"score": float(scores[i])} for i in order]
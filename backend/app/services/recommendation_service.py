@@ -1,7 +1,14 @@
-from typing import List, Optional, Literal, Dict, Any
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Literal, Dict, Any, FrozenSet, Set, Tuple
 from pydantic import BaseModel, Field
 
+from app.cache import result_cache
+from app.graphdb import GraphDBClient
+from app.services.ranking import FeatureTable, RankingWeights, feature_table, rank
+from app.services.sparql_results import bindings_to_rows
 from app.services.sparql_templates import PREFIXES
+from app.settings import settings
 
 
 class RecommendationRequest(BaseModel):
@@ -13,12 +20,18 @@ class RecommendationRequest(BaseModel):
     task_iri: Optional[str] = None
     conditions: List[str] = []
     performance_prefs: List[str] = []
+    # When set, results are ranked in-process by these weights instead of the SPARQL ORDER BY.
+    weights: Optional[RankingWeights] = None
 
 
 class RecommendationDetailsRequest(RecommendationRequest):
     approach_iri: str
 
 
+class RecommendationDetailsBatchRequest(RecommendationRequest):
+    approach_iris: List[str] = Field(min_length=1, max_length=100)
+
+
 def _dedupe_nonempty(values: List[str]) -> List[str]:
     seen: set[str] = set()
     result: List[str] = []
@@ -37,7 +50,8 @@ def _values_clause(var_name: str, iris: List[str]) -> str:
     return f"VALUES ?{var_name} {{ {iri_tokens} }}"
 
 
-def build_recommendation_query(req: RecommendationRequest) -> str:
+def _preference_blocks(req: RecommendationRequest) -> Tuple[str, str, str, str]:
+    # (not_possible, possible_if, performance, task) graph patterns for the request's preferences
     not_possible = ""
     possible_if = ""
     performance = ""
@@ -75,6 +89,11 @@ def build_recommendation_query(req: RecommendationRequest) -> str:
         }}
         """
 
+    return not_possible, possible_if, performance, task
+
+
+def _article_context(req: RecommendationRequest) -> Tuple[str, str]:
+    # (VALUES block, article patterns) restricting articles to the request's context
     cluster_iris = _dedupe_nonempty(req.cluster_iris)
     context_values: List[str] = []
     article_context_patterns: List[str] = []
@@ -89,8 +108,34 @@ def build_recommendation_query(req: RecommendationRequest) -> str:
         context_values.insert(0, f"VALUES ?phase {{ <{req.phase_iri}> }}")
         article_context_patterns.insert(0, "?article mla:hasPhase ?phase .")
 
-    context_values_block = "\n      ".join(context_values)
-    article_context_block = "\n      ".join(article_context_patterns)
+    return "\n      ".join(context_values), "\n      ".join(article_context_patterns)
+
+
+# Ties are broken by IRI so the result under LIMIT does not depend on the plan.
+RECOMMENDATION_ORDER = """
+      DESC(?supportingArticles)
+      DESC(?taskMatch)
+      DESC(?possibleIfMatches)
+      DESC(?performanceMatches)
+      ?approach
+      ?method"""
+
+
+def build_recommendation_query(
+    req: RecommendationRequest, plan: Optional[str] = None, limit: bool = True
+) -> str:
+    """Recommendation query using plan (default: settings.recommendation_query_plan).
+
+    "flat" joins the preference OPTIONALs with every article row and aggregates once;
+    "preaggregated" counts articles per method/approach in a subquery first and joins the
+    per-approach preference counts afterwards. Both return the same rows in the same order.
+    With limit=False every row is returned instead of the first req.max_results.
+    """
+    if (plan or settings.recommendation_query_plan) == "preaggregated":
+        return build_preaggregated_recommendation_query(req, limit=limit)
+
+    not_possible, possible_if, performance, task = _preference_blocks(req)
+    context_values_block, article_context_block = _article_context(req)
 
     return PREFIXES + f"""
     SELECT
@@ -118,32 +163,502 @@ def build_recommendation_query(req: RecommendationRequest) -> str:
       {task}
     }}
     GROUP BY ?method ?methodLabel ?approach ?approachLabel
-    ORDER BY
-      DESC(?supportingArticles)
-      DESC(?taskMatch)
-      DESC(?possibleIfMatches)
-      DESC(?performanceMatches)
-    LIMIT {req.max_results}
+    ORDER BY{RECOMMENDATION_ORDER}
+    {_limit_clause(req, limit)}
     """
 
 
-def build_details_articles_query(req: RecommendationDetailsRequest) -> str:
-    cluster_iris = _dedupe_nonempty(req.cluster_iris)
-    context_values: List[str] = []
+def _limit_clause(req: RecommendationRequest, limit: bool) -> str:
+    return f"LIMIT {req.max_results}" if limit else ""
+
+
+def _preaggregated_preference_blocks(req: RecommendationRequest) -> Tuple[str, str, str]:
+    # (possible_if, performance, task) per-approach counts, each left-joined on ?approach
+    if req.conditions:
+        cond_vals = " ".join(f"<{c}>" for c in req.conditions)
+        possible_if = f"""
+      OPTIONAL {{
+        SELECT ?approach (COUNT(DISTINCT ?posMatch) AS ?posMatches) WHERE {{
+          ?approach :possible_if ?posMatch .
+          VALUES ?posMatch {{ {cond_vals} }}
+        }}
+        GROUP BY ?approach
+      }}
+      BIND(COALESCE(?posMatches, 0) AS ?possibleIfMatches)"""
+    else:
+        possible_if = "BIND(0 AS ?possibleIfMatches)"
+
+    if req.performance_prefs:
+        perf_vals = " ".join(f"<{p}>" for p in req.performance_prefs)
+        performance = f"""
+      OPTIONAL {{
+        SELECT ?approach (COUNT(DISTINCT ?perfMatch) AS ?perfMatches) WHERE {{
+          ?approach :performance ?perfMatch .
+          VALUES ?perfMatch {{ {perf_vals} }}
+        }}
+        GROUP BY ?approach
+      }}
+      BIND(COALESCE(?perfMatches, 0) AS ?performanceMatches)"""
+    else:
+        performance = "BIND(0 AS ?performanceMatches)"
+
+    if req.task_iri:
+        task = f"BIND(IF(EXISTS {{ ?approach :used_for <{req.task_iri}> }}, 1, 0) AS ?taskMatch)"
+    else:
+        task = "BIND(0 AS ?taskMatch)"
+
+    return possible_if, performance, task
+
+
+def build_preaggregated_recommendation_query(req: RecommendationRequest, limit: bool = True) -> str:
+    # Article support is aggregated per method/approach before any preference pattern joins, so
+    # rows no longer multiply as articles x posMatch x perfMatch x taskMatch; each preference
+    # count is its own per-approach aggregate, left-joined on ?approach.
+    not_possible = _preference_blocks(req)[0]
+    possible_if, performance, task = _preaggregated_preference_blocks(req)
+    context_values_block, article_context_block = _article_context(req)
+
+    return PREFIXES + f"""
+    SELECT
+      ?method ?methodLabel
+      ?approach ?approachLabel
+      ?supportingArticles
+      ?possibleIfMatches
+      ?performanceMatches
+      ?taskMatch
+    WHERE {{
+      {{
+        SELECT ?method ?approach (COUNT(DISTINCT ?article) AS ?supportingArticles) WHERE {{
+          {context_values_block}
+
+          ?article a mla:Article ;
+                  mla:mentionsMethod ?method .
+          {article_context_block}
+
+          ?method skos:exactMatch ?approach .
+        }}
+        GROUP BY ?method ?approach
+      }}
+      {not_possible}
+
+      OPTIONAL {{ ?method rdfs:label ?methodLabel }}
+      OPTIONAL {{ ?approach skos:prefLabel ?approachLabel }}
+
+      {possible_if}
+      {performance}
+      {task}
+    }}
+    ORDER BY{RECOMMENDATION_ORDER}
+    {_limit_clause(req, limit)}
+    """
+
+
+def build_context_query(req: RecommendationRequest) -> str:
+    # Context stage: supporting articles per method/approach, independent of the preferences.
+    context_values_block, article_context_block = _article_context(req)
+
+    return PREFIXES + f"""
+    SELECT
+      ?method ?methodLabel
+      ?approach ?approachLabel
+      ?supportingArticles
+    WHERE {{
+      {{
+        SELECT ?method ?approach (COUNT(DISTINCT ?article) AS ?supportingArticles) WHERE {{
+          {context_values_block}
+
+          ?article a mla:Article ;
+                  mla:mentionsMethod ?method .
+          {article_context_block}
+
+          ?method skos:exactMatch ?approach .
+        }}
+        GROUP BY ?method ?approach
+      }}
+
+      OPTIONAL {{ ?method rdfs:label ?methodLabel }}
+      OPTIONAL {{ ?approach skos:prefLabel ?approachLabel }}
+    }}
+    """
+
+
+# Approach properties the preference stage matches against, by profile key.
+PROFILE_PROPERTIES = ("possible_if", "not_possible_if", "performance", "used_for")
+
+
+def build_approach_profiles_query(approach_iris: List[str]) -> str:
+    # Preference stage: every value of PROFILE_PROPERTIES for each approach, tagged with its key.
+    property_rows = " ".join(f'(:{name} "{name}")' for name in PROFILE_PROPERTIES)
+
+    return PREFIXES + f"""
+    SELECT ?approach ?property ?value WHERE {{
+      {_values_clause("approach", approach_iris)}
+      VALUES (?predicate ?property) {{ {property_rows} }}
+      ?approach ?predicate ?value .
+    }}
+    """
+
+
+def _load_approach_profiles(db: GraphDBClient, approach_iris: List[str]) -> Dict[str, Dict[str, FrozenSet[str]]]:
+    values: Dict[str, Dict[str, Set[str]]] = {
+        iri: {name: set() for name in PROFILE_PROPERTIES} for iri in approach_iris
+    }
+    raw = db.select(
+        build_approach_profiles_query(approach_iris),
+        shape="approach-profiles",
+        params={"approaches": len(approach_iris)},
+    )
+    for row in bindings_to_rows(raw):
+        profile = values.get(row.get("approach"))
+        if profile is not None and row.get("property") in profile:
+            profile[row["property"]].add(row.get("value"))
+    return {
+        iri: {name: frozenset(found) for name, found in profile.items()}
+        for iri, profile in values.items()
+    }
+
+
+def _approach_profile_entries(db: GraphDBClient, approach_iris: List[str]) -> Dict[Tuple[str, str], Any]:
+    return {
+        ("approach-profile", iri): profile
+        for iri, profile in _load_approach_profiles(db, approach_iris).items()
+    }
+
+
+def get_approach_profiles(db: GraphDBClient, approach_iris: List[str]) -> Dict[str, Dict[str, FrozenSet[str]]]:
+    """Profile (PROFILE_PROPERTIES -> set of IRIs) of each approach, cached per approach.
+
+    Approaches not in the cache are loaded with one query; contexts that share approaches share
+    their entries. The entries form one cache group, so the background refresh reloads all due
+    profiles with one query as well.
+    """
+    profiles: Dict[str, Dict[str, FrozenSet[str]]] = {}
+    missing: List[str] = []
+    for iri in _dedupe_nonempty(approach_iris):
+        cached = result_cache.peek(("approach-profile", iri))
+        if cached is not None:
+            profiles[iri] = cached
+        else:
+            missing.append(iri)
+    if missing:
+        entries = _approach_profile_entries(db, missing)
+        result_cache.put_many(
+            entries,
+            lambda keys: _approach_profile_entries(db, [iri for _, iri in keys]),
+            group="approach-profile",
+        )
+        profiles.update((iri, profile) for (_, iri), profile in entries.items())
+    return profiles
+
+
+def _recommendation_sort_key(row: Dict[str, Any]) -> Tuple[Any, ...]:
+    # RECOMMENDATION_ORDER in Python
+    return (
+        -row["supportingArticles"],
+        -row["taskMatch"],
+        -row["possibleIfMatches"],
+        -row["performanceMatches"],
+        row.get("approach") or "",
+        row.get("method") or "",
+    )
+
+
+def evaluate_staged(db: GraphDBClient, req: RecommendationRequest) -> List[Dict[str, Any]]:
+    """All rows of build_recommendation_query(req) without LIMIT, evaluated in two stages.
+
+    The context stage (supporting articles per method/approach) is cached by its query, so by
+    cluster/paradigm/phase only; the preference stage applies req's conditions, performance
+    preferences and task to the cached approach profiles in-process. Changing only the
+    preferences therefore reuses every cached GraphDB result.
+    """
+    context_sparql = build_context_query(req)
+    context_rows = result_cache.get(
+        ("context", context_sparql),
+        lambda: bindings_to_rows(
+            db.select(context_sparql, shape="recommend-context", params=req.model_dump(exclude_none=True))
+        ),
+    )
+    profiles = get_approach_profiles(db, [row["approach"] for row in context_rows if row.get("approach")])
+    return apply_preferences(context_rows, profiles, req)
+
+
+def apply_preferences(
+    context_rows: List[Dict[str, Any]],
+    profiles: Dict[str, Dict[str, FrozenSet[str]]],
+    req: RecommendationRequest,
+) -> List[Dict[str, Any]]:
+    # Preference stage: the counts and NOT EXISTS filter of the recommendation query, in Python.
+    conditions = set(req.conditions)
+    performance = set(req.performance_prefs)
+    rows: List[Dict[str, Any]] = []
+    for row in context_rows:
+        profile = profiles.get(row.get("approach"))
+        if profile is None:
+            continue
+        if conditions & profile["not_possible_if"]:
+            continue
+        rows.append(row | {
+            "possibleIfMatches": len(conditions & profile["possible_if"]),
+            "performanceMatches": len(performance & profile["performance"]),
+            "taskMatch": int(bool(req.task_iri) and req.task_iri in profile["used_for"]),
+        })
+    rows.sort(key=_recommendation_sort_key)
+    return rows
+
+
+def get_recommendations(db: GraphDBClient, req: RecommendationRequest) -> List[Dict[str, Any]]:
+    if req.weights is not None:
+        return get_ranked_recommendations(db, req)
+    # Cached by query text: requests that differ only in fields the query ignores share an entry.
+    sparql = build_recommendation_query(req)
+    if settings.recommendation_staged_evaluation:
+        return result_cache.get(("recommend", sparql), lambda: evaluate_staged(db, req)[: req.max_results])
+    return result_cache.get(
+        ("recommend", sparql),
+        lambda: bindings_to_rows(
+            db.select(sparql, shape="recommend", params=req.model_dump(exclude_none=True))
+        ),
+    )
+
+
+def get_feature_table(db: GraphDBClient, req: RecommendationRequest) -> FeatureTable:
+    """Every row of req's recommendation query as a FeatureTable, cached.
+
+    The query has no LIMIT and does not depend on max_results, weights or problem_text, so all
+    rankings of one context and preference set share a single GraphDB query.
+    """
+    sparql = build_recommendation_query(req, limit=False)
+    if settings.recommendation_staged_evaluation:
+        return result_cache.get(("features", sparql), lambda: feature_table(evaluate_staged(db, req)))
+    return result_cache.get(
+        ("features", sparql),
+        lambda: feature_table(bindings_to_rows(
+            db.select(sparql, shape="recommend-features", params=req.model_dump(exclude_none=True))
+        )),
+    )
+
+
+def get_ranked_recommendations(db: GraphDBClient, req: RecommendationRequest) -> List[Dict[str, Any]]:
+    # Re-ranking with new weights only touches the cached feature table, not GraphDB.
+    return rank(get_feature_table(db, req), req.weights or RankingWeights(), req.max_results, req.problem_text)
+
+
+def _batch_shape(req: RecommendationRequest) -> Tuple[Any, ...]:
+    # Requests with equal shapes differ only in their context IRIs and max_results, so they can
+    # share one query with the contexts in a VALUES block.
+    return (
+        bool(req.phase_iri),
+        bool(req.paradigm_iri),
+        bool(_dedupe_nonempty(req.cluster_iris)),
+        tuple(req.conditions),
+        tuple(req.performance_prefs),
+        req.task_iri,
+    )
+
+
+def _batch_context(req: RecommendationRequest) -> Tuple[Any, ...]:
+    return (req.phase_iri, req.paradigm_iri, tuple(_dedupe_nonempty(req.cluster_iris)))
+
+
+def _batch_article_context(reqs: List[RecommendationRequest]) -> Tuple[str, str]:
+    # (VALUES block keyed by ?rid, article patterns): _article_context for several requests
+    use_phase, use_paradigm, use_clusters = _batch_shape(reqs[0])[:3]
+
+    variables = ["?rid"]
     article_context_patterns: List[str] = []
-    cluster_values_clause = _values_clause("cluster", cluster_iris)
-    if cluster_values_clause:
-        context_values.insert(0, cluster_values_clause)
-        article_context_patterns.insert(0, "?article mla:hasCluster ?cluster .")
-    if req.paradigm_iri:
-        context_values.append(f"VALUES ?paradigm {{ <{req.paradigm_iri}> }}")
+    if use_phase:
+        variables.append("?phase")
+        article_context_patterns.append("?article mla:hasPhase ?phase .")
+    if use_clusters:
+        variables.append("?cluster")
+        article_context_patterns.append("?article mla:hasCluster ?cluster .")
+    if use_paradigm:
+        variables.append("?paradigm")
         article_context_patterns.append("?article mla:hasParadigm ?paradigm .")
-    if req.phase_iri:
-        context_values.insert(0, f"VALUES ?phase {{ <{req.phase_iri}> }}")
-        article_context_patterns.insert(0, "?article mla:hasPhase ?phase .")
 
-    context_values_block = "\n      ".join(context_values)
-    article_context_block = "\n      ".join(article_context_patterns)
+    value_rows: List[str] = []
+    for rid, req in enumerate(reqs):
+        for cluster in _dedupe_nonempty(req.cluster_iris) or [None]:
+            terms = [str(rid)]
+            if use_phase:
+                terms.append(f"<{req.phase_iri}>")
+            if use_clusters:
+                terms.append(f"<{cluster}>")
+            if use_paradigm:
+                terms.append(f"<{req.paradigm_iri}>")
+            value_rows.append(f"({' '.join(terms)})")
+
+    value_rows_block = "\n        ".join(value_rows)
+    context_values_block = f"VALUES ({' '.join(variables)}) {{\n        {value_rows_block}\n      }}"
+    return context_values_block, "\n      ".join(article_context_patterns)
+
+
+def build_batch_recommendation_query(
+    reqs: List[RecommendationRequest], plan: Optional[str] = None
+) -> str:
+    """Recommendation query for several requests of one _batch_shape.
+
+    Each request's context becomes rows of a VALUES block keyed by ?rid (its index in reqs; one
+    row per cluster). Results are grouped per ?rid and ordered like build_recommendation_query
+    within it, without LIMIT: the caller cuts each request's rows to its max_results. plan
+    selects the query plan as in build_recommendation_query.
+    """
+    if (plan or settings.recommendation_query_plan) == "preaggregated":
+        return build_preaggregated_batch_recommendation_query(reqs)
+
+    not_possible, possible_if, performance, task = _preference_blocks(reqs[0])
+    context_values_block, article_context_block = _batch_article_context(reqs)
+
+    return PREFIXES + f"""
+    SELECT
+      ?rid
+      ?method ?methodLabel
+      ?approach ?approachLabel
+      (COUNT(DISTINCT ?article) AS ?supportingArticles)
+      (COUNT(DISTINCT ?posMatch) AS ?possibleIfMatches)
+      (COUNT(DISTINCT ?perfMatch) AS ?performanceMatches)
+      (COUNT(DISTINCT ?taskMatch) AS ?taskMatch)
+    WHERE {{
+      {context_values_block}
+
+      ?article a mla:Article ;
+              mla:mentionsMethod ?method .
+      {article_context_block}
+
+      OPTIONAL {{ ?method rdfs:label ?methodLabel }}
+
+      ?method skos:exactMatch ?approach .
+      OPTIONAL {{ ?approach skos:prefLabel ?approachLabel }}
+
+      {not_possible}
+      {possible_if}
+      {performance}
+      {task}
+    }}
+    GROUP BY ?rid ?method ?methodLabel ?approach ?approachLabel
+    ORDER BY
+      ?rid{RECOMMENDATION_ORDER}
+    """
+
+
+def build_preaggregated_batch_recommendation_query(reqs: List[RecommendationRequest]) -> str:
+    # build_preaggregated_recommendation_query with article support counted per ?rid as well.
+    not_possible = _preference_blocks(reqs[0])[0]
+    possible_if, performance, task = _preaggregated_preference_blocks(reqs[0])
+    context_values_block, article_context_block = _batch_article_context(reqs)
+
+    return PREFIXES + f"""
+    SELECT
+      ?rid
+      ?method ?methodLabel
+      ?approach ?approachLabel
+      ?supportingArticles
+      ?possibleIfMatches
+      ?performanceMatches
+      ?taskMatch
+    WHERE {{
+      {{
+        SELECT ?rid ?method ?approach (COUNT(DISTINCT ?article) AS ?supportingArticles) WHERE {{
+          {context_values_block}
+
+          ?article a mla:Article ;
+                  mla:mentionsMethod ?method .
+          {article_context_block}
+
+          ?method skos:exactMatch ?approach .
+        }}
+        GROUP BY ?rid ?method ?approach
+      }}
+      {not_possible}
+
+      OPTIONAL {{ ?method rdfs:label ?methodLabel }}
+      OPTIONAL {{ ?approach skos:prefLabel ?approachLabel }}
+
+      {possible_if}
+      {performance}
+      {task}
+    }}
+    ORDER BY
+      ?rid{RECOMMENDATION_ORDER}
+    """
+
+
+def _run_merged(
+    db: GraphDBClient,
+    reqs: List[RecommendationRequest],
+    members: List[List[int]],
+) -> Dict[int, List[Dict[str, Any]]]:
+    # One query for len(members) contexts; members[rid] are the indices into reqs sharing it.
+    contexts = [reqs[indices[0]] for indices in members]
+    sparql = build_batch_recommendation_query(contexts)
+    rows = bindings_to_rows(db.select(sparql, shape="recommend-batch", params={"contexts": len(contexts)}))
+    by_rid: Dict[int, List[Dict[str, Any]]] = defaultdict(list)
+    for row in rows:
+        by_rid[row.pop("rid")].append(row)
+
+    results: Dict[int, List[Dict[str, Any]]] = {}
+    for rid, indices in enumerate(members):
+        for index in indices:
+            req = reqs[index]
+            req_rows = by_rid.get(rid, [])[: req.max_results]
+            # Seed the single-request cache so later /recommendations calls hit it.
+            sparql = build_recommendation_query(req)
+            result_cache.put(
+                ("recommend", sparql),
+                req_rows,
+                lambda sparql=sparql, req=req: bindings_to_rows(
+                    db.select(sparql, shape="recommend", params=req.model_dump(exclude_none=True))
+                ),
+            )
+            results[index] = req_rows
+    return results
+
+
+def get_recommendations_batch(
+    db: GraphDBClient, reqs: List[RecommendationRequest]
+) -> List[List[Dict[str, Any]]]:
+    """Results for each request, in order.
+
+    Cached requests are answered from the result cache. The rest are grouped by _batch_shape,
+    and each group is sent as merged queries of up to recommendation_batch_merge_size distinct
+    contexts. Groups with a single context use the plain query, and requests with weights are
+    ranked from their own feature table. All queries run on at most
+    recommendation_batch_concurrency threads.
+    """
+    results: Dict[int, List[Dict[str, Any]]] = {}
+    groups: Dict[Tuple[Any, ...], Dict[Tuple[Any, ...], List[int]]] = defaultdict(dict)
+    jobs = []
+    for index, req in enumerate(reqs):
+        if req.weights is not None:
+            # Ranked from its own feature table; it cannot share a merged query's ORDER BY.
+            jobs.append([[index]])
+            continue
+        cached = result_cache.peek(("recommend", build_recommendation_query(req)))
+        if cached is not None:
+            results[index] = cached
+        else:
+            groups[_batch_shape(req)].setdefault(_batch_context(req), []).append(index)
+
+    merge_size = max(1, settings.recommendation_batch_merge_size)
+    for contexts in groups.values():
+        members = list(contexts.values())
+        for start in range(0, len(members), merge_size):
+            jobs.append(members[start:start + merge_size])
+
+    def run(members: List[List[int]]) -> Dict[int, List[Dict[str, Any]]]:
+        if len(members) == 1:
+            return {index: get_recommendations(db, reqs[index]) for index in members[0]}
+        return _run_merged(db, reqs, members)
+
+    if jobs:
+        with ThreadPoolExecutor(max_workers=max(1, settings.recommendation_batch_concurrency)) as pool:
+            for job_results in pool.map(run, jobs):
+                results.update(job_results)
+    return [results[index] for index in range(len(reqs))]
+
+
+def build_details_articles_query(req: RecommendationDetailsRequest) -> str:
+    context_values_block, article_context_block = _article_context(req)
 
     return PREFIXES + f"""
     SELECT DISTINCT ?article ?doi ?label WHERE {{
@@ -202,3 +717,131 @@ def build_details_matches_query(req: RecommendationDetailsRequest) -> str:
       {where}
     }}
     """
+
+
+def build_multi_details_articles_query(req: RecommendationRequest, approach_iris: List[str]) -> str:
+    # build_details_articles_query for several approaches at once, rows tagged with ?approach
+    context_values_block, article_context_block = _article_context(req)
+    approach_values_clause = _values_clause("approach", approach_iris)
+
+    return PREFIXES + f"""
+    SELECT DISTINCT ?approach ?article ?doi ?label WHERE {{
+      {approach_values_clause}
+      {context_values_block}
+
+      ?article a mla:Article ;
+              mla:mentionsMethod ?method ;
+              schema:doi ?doi .
+      {article_context_block}
+
+      ?method skos:exactMatch ?approach .
+
+      OPTIONAL {{ ?article dct:title ?label }}
+    }}
+    ORDER BY ?approach LCASE(STR(?doi))
+    """
+
+
+def build_multi_details_matches_query(req: RecommendationRequest, approach_iris: List[str]) -> str:
+    # build_details_matches_query for several approaches at once, rows tagged with ?approach
+    cond_vals = " ".join(f"<{c}>" for c in req.conditions) if req.conditions else ""
+    perf_vals = " ".join(f"<{p}>" for p in req.performance_prefs) if req.performance_prefs else ""
+
+    blocks = [_values_clause("approach", approach_iris)]
+
+    if req.conditions:
+        blocks.append(f"""
+        OPTIONAL {{
+          ?approach :possible_if ?cond .
+          VALUES ?cond {{ {cond_vals} }}
+          OPTIONAL {{ ?cond skos:prefLabel ?condLabel }}
+        }}
+        """)
+
+    if req.performance_prefs:
+        blocks.append(f"""
+        OPTIONAL {{
+          ?approach :performance ?perf .
+          VALUES ?perf {{ {perf_vals} }}
+          OPTIONAL {{ ?perf skos:prefLabel ?perfLabel }}
+        }}
+        """)
+
+    if req.task_iri:
+        blocks.append(f"""
+        OPTIONAL {{
+          ?approach :used_for ?task .
+          FILTER(?task = <{req.task_iri}>)
+          OPTIONAL {{ ?task skos:prefLabel ?taskLabel }}
+        }}
+        """)
+
+    where = "\n".join(blocks)
+
+    return PREFIXES + f"""
+    SELECT DISTINCT ?approach ?cond ?condLabel ?perf ?perfLabel ?task ?taskLabel WHERE {{
+      {where}
+    }}
+    """
+
+
+def has_match_preferences(req: RecommendationRequest) -> bool:
+    # Without conditions, performance prefs or a task the matches query has nothing to find.
+    return bool(req.conditions or req.performance_prefs or req.task_iri)
+
+
+def details_response(
+    approach_iri: str,
+    articles: List[Dict[str, Any]],
+    matches_rows: List[Dict[str, Any]],
+) -> Dict[str, Any]:
+    """/recommendations/details body from articles-query and matches-query rows of one approach."""
+    conditions: Dict[str, str] = {}
+    performance: Dict[str, str] = {}
+    tasks: Dict[str, str] = {}
+
+    for r in matches_rows:
+        if r.get("cond"):
+            conditions[r["cond"]] = r.get("condLabel") or r["cond"]
+        if r.get("perf"):
+            performance[r["perf"]] = r.get("perfLabel") or r["perf"]
+        if r.get("task"):
+            tasks[r["task"]] = r.get("taskLabel") or r["task"]
+
+    return {
+        "approachIri": approach_iri,
+        "articles": [
+            {"article": a.get("article"), "doi": a.get("doi"), "label": a.get("label")}
+            for a in articles
+            if a.get("doi")
+        ],
+        "matches": {
+            "conditions": [{"iri": iri, "label": label} for iri, label in conditions.items()],
+            "performance": [{"iri": iri, "label": label} for iri, label in performance.items()],
+            "tasks": [{"iri": iri, "label": label} for iri, label in tasks.items()],
+        },
+    }
+
+
+def get_multi_details(db: GraphDBClient, req: RecommendationDetailsBatchRequest) -> List[Dict[str, Any]]:
+    """Details for each of req.approach_iris (deduplicated, in order) from two GraphDB queries."""
+    approach_iris = _dedupe_nonempty(req.approach_iris)
+    params = req.model_dump(exclude_none=True)
+    articles_query = build_multi_details_articles_query(req, approach_iris)
+    articles = bindings_to_rows(db.select(articles_query, shape="details-articles", params=params))
+    matches_rows: List[Dict[str, Any]] = []
+    if has_match_preferences(req):
+        matches_query = build_multi_details_matches_query(req, approach_iris)
+        matches_rows = bindings_to_rows(db.select(matches_query, shape="details-matches", params=params))
+
+    articles_by_approach: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    for row in articles:
+        articles_by_approach[row.get("approach")].append(row)
+    matches_by_approach: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    for row in matches_rows:
+        matches_by_approach[row.get("approach")].append(row)
+
+    return [
+        details_response(iri, articles_by_approach.get(iri, []), matches_by_approach.get(iri, []))
+        for iri in approach_iris
+    ]
@@ -1,9 +1,54 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
     graphdb_base_url: str = "http://127.0.0.1:7200"
     graphdb_repo_id: str = "ML-Ontology"
     database_url: str
+    # Queries slower than this are kept in the slow-query log (0 disables it)
+    graphdb_slow_query_ms: float = 1000.0
+    graphdb_slow_query_log_size: int = 100
+    graphdb_slow_query_explain: bool = False
+    # Comma-separated read replicas; empty means graphdb_base_url serves reads and writes
+    graphdb_read_base_urls: str = ""
+    graphdb_write_base_url: str | None = None
+    # Send a second SELECT to another replica after this latency percentile (0 disables hedging)
+    graphdb_hedge_percentile: float = 0.0
+    graphdb_hedge_min_delay_ms: float = 50.0
+    graphdb_health_check_interval_seconds: float = 5.0
+    # Reads that may run at once (AnyIO's default of 40 worker threads for sync endpoints, plus
+    # headroom for warm-up and batch threads); sizes the pool hedged reads run on
+    graphdb_max_concurrent_reads: int = 64
+    # Responses at least this large are gzip-compressed when the client accepts it
+    response_gzip_min_bytes: int = 1024
+    # max-age of /meta/* responses; after that clients revalidate with their ETag (304 if unchanged)
+    meta_cache_max_age_seconds: int = 60
+    # Data version in GraphDB's system graph, polled this often and sent as X-Graph-Version
+    graph_version_poll_seconds: float = 5.0
+    # Meta and recommendation results are cached this long (0 disables) per graph version; entries
+    # used since their last load are reloaded in the background once cache_refresh_ahead_ratio of
+    # the TTL has passed
+    cache_ttl_seconds: float = 3600.0
+    cache_refresh_ahead_ratio: float = 0.8
+    cache_max_entries: int = 2048
+    # Startup warm-up: all meta queries, every single cluster x paradigm recommendation and the
+    # requests listed in warmup_popular_requests_path; /health/ready reports 503 until it is done
+    warmup_enabled: bool = True
+    warmup_max_results: int = 10
+    warmup_concurrency: int = 4
+    warmup_popular_requests_path: str = "config/popular_requests.json"
+    # "flat" aggregates once over article x preference rows; "preaggregated" counts articles per
+    # approach in a subquery first (same results, see benchmarks/query_plan_benchmark.py)
+    recommendation_query_plan: Literal["flat", "preaggregated"] = "flat"
+    # Evaluate /recommendations in two cached stages: article support per context, and each
+    # approach's conditions/performance/tasks; a preference-only change then needs no query
+    recommendation_staged_evaluation: bool = True
+    # POST /recommendations/batch: at most batch_max_requests per call; requests of the same
+    # shape are merged into queries of up to batch_merge_size contexts, run batch_concurrency at a time
+    recommendation_batch_max_requests: int = 5000
+    recommendation_batch_merge_size: int = 50
+    recommendation_batch_concurrency: int = 4
 
     model_config = SettingsConfigDict(
         env_file="../.env",
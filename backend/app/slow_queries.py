@@ -0,0 +1,107 @@
+"""Bounded in-memory log of slow SPARQL queries, optionally with GraphDB explain plans."""
+
+from __future__ import annotations
+
+import json
+import logging
+import re
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from app.settings import settings
+
+if TYPE_CHECKING:
+    from app.graphdb import GraphDBClient
+
+logger = logging.getLogger("uvicorn.error")
+
+# GraphDB returns the query plan instead of results when this pseudo-graph is in the dataset.
+EXPLAIN_GRAPH_IRI = "http://www.ontotext.com/explain"
+_FIRST_WHERE_RE = re.compile(r"\bWHERE\s*\{", re.IGNORECASE)
+
+
+@dataclass
+class SlowQueryRecord:
+    recorded_at: float
+    shape: str
+    duration_ms: float
+    row_count: Optional[int]
+    query: str
+    params: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+    explain: Optional[str] = None
+
+
+def explain_query(sparql: str) -> Optional[str]:
+    """Rewrite a SELECT so GraphDB returns its plan; None if the query has no WHERE clause."""
+    match = _FIRST_WHERE_RE.search(sparql)
+    if match is None:
+        return None
+    return f"{sparql[: match.start()]}FROM <{EXPLAIN_GRAPH_IRI}>\n{sparql[match.start():]}"
+
+
+class SlowQueryLog:
+    # Ring buffer of the most recent slow queries, shared by all GraphDB clients
+    def __init__(self, max_entries: int = 100):
+        self._records: deque[SlowQueryRecord] = deque(maxlen=max_entries)
+        self._lock = threading.Lock()
+        # Explain plans are fetched off the request path, one at a time. While one is running,
+        # further explains are skipped: when GraphDB is slow, queueing them would only add load.
+        self._explain_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sparql-explain")
+        self._explain_pending = False
+
+    def record(
+        self,
+        record: SlowQueryRecord,
+        explain_with: Optional["GraphDBClient"] = None,
+    ) -> None:
+        with self._lock:
+            self._records.append(record)
+        logger.warning(
+            "slow sparql query %s",
+            json.dumps({k: v for k, v in asdict(record).items() if k != "explain"}, default=str),
+        )
+        if explain_with is None:
+            return
+        with self._lock:
+            if self._explain_pending:
+                return
+            self._explain_pending = True
+        self._explain_executor.submit(self._attach_explain, record, explain_with)
+
+    def _attach_explain(self, record: SlowQueryRecord, db: "GraphDBClient") -> None:
+        try:
+            sparql = explain_query(record.query)
+            if sparql is None:
+                return
+            try:
+                raw = db.select(sparql, shape="explain", track_slow=False)
+            except Exception as e:
+                record.explain = f"explain failed: {type(e).__name__}: {e}"
+                return
+        finally:
+            with self._lock:
+                self._explain_pending = False
+        bindings = raw.get("results", {}).get("bindings", [])
+        record.explain = "\n".join(
+            value.get("value", "") for b in bindings for value in b.values()
+        ) or None
+
+    def snapshot(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        # Newest first
+        with self._lock:
+            records = list(self._records)
+        records.reverse()
+        if limit is not None:
+            records = records[:limit]
+        return [asdict(r) for r in records]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._records.clear()
+
+
+slow_query_log = SlowQueryLog(max_entries=settings.graphdb_slow_query_log_size)
@@ -0,0 +1,153 @@
+"""Startup warm-up of GraphDB and the result cache, and the readiness state it drives."""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from pydantic import ValidationError
+
+from app.cache import result_cache
+from app.graph_version import graph_version
+from app.graphdb import GraphDBClient
+from app.metrics import APP_READY
+from app.services import meta_service
+from app.services.recommendation_service import RecommendationRequest, get_recommendations
+from app.settings import settings
+
+logger = logging.getLogger("uvicorn.error")
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+META_LOADERS = (
+    meta_service.get_phases,
+    meta_service.get_clusters,
+    meta_service.get_cluster_keywords,
+    meta_service.get_paradigms,
+    meta_service.get_tasks,
+    meta_service.get_dataset_types,
+    meta_service.get_conditions,
+    meta_service.get_performance,
+)
+_META_RETRY_SECONDS = 5.0
+
+
+@dataclass
+class WarmupStatus:
+    ready: bool = False
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    meta_queries: int = 0
+    recommendation_queries: int = 0
+    errors: List[str] = field(default_factory=list)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+warmup_status = WarmupStatus()
+
+
+def _mark_ready() -> None:
+    warmup_status.ready = True
+    warmup_status.finished_at = time.time()
+    APP_READY.set(1)
+
+
+def load_popular_requests(path: Path) -> List[RecommendationRequest]:
+    # JSON array of /recommendations request bodies; invalid entries are skipped with a warning.
+    if not path.is_absolute():
+        path = BACKEND_ROOT / path
+    try:
+        raw = json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return []
+    except ValueError as e:
+        logger.warning("Ignoring popular requests file %s: %s", path, e)
+        return []
+
+    requests: List[RecommendationRequest] = []
+    for index, item in enumerate(raw if isinstance(raw, list) else []):
+        try:
+            requests.append(RecommendationRequest.model_validate(item))
+        except ValidationError as e:
+            logger.warning("Ignoring popular request #%d in %s: %s", index, path, e)
+    return requests
+
+
+def _warm_meta(db: GraphDBClient, stop: threading.Event) -> bool:
+    # Meta options back every page, so readiness waits until all of them have loaded once.
+    while not stop.is_set():
+        try:
+            # Read the data version first so warmed entries are stored under the current one.
+            graph_version.refresh(db)
+            for loader in META_LOADERS:
+                loader(db)
+            warmup_status.meta_queries = len(META_LOADERS)
+            return True
+        except Exception as e:
+            logger.warning("Warm-up: meta queries failed (%s), retrying in %.0fs", e, _META_RETRY_SECONDS)
+            stop.wait(_META_RETRY_SECONDS)
+    return False
+
+
+def recommendation_warmup_requests(db: GraphDBClient) -> List[RecommendationRequest]:
+    clusters = meta_service.get_clusters(db)
+    paradigms = meta_service.get_paradigms(db)
+    combinations = [
+        RecommendationRequest(
+            cluster_iris=[cluster["iri"]],
+            paradigm_iri=paradigm["iri"],
+            max_results=settings.warmup_max_results,
+        )
+        for cluster in clusters
+        for paradigm in paradigms
+    ]
+    return combinations + load_popular_requests(Path(settings.warmup_popular_requests_path))
+
+
+def run_warmup(db: GraphDBClient, stop: threading.Event) -> None:
+    warmup_status.started_at = time.time()
+    started = time.perf_counter()
+    with result_cache.pinning():
+        if not _warm_meta(db, stop):
+            return
+        reqs = recommendation_warmup_requests(db)
+
+    def warm(req: RecommendationRequest) -> None:
+        if stop.is_set():
+            return
+        # Each pool thread pins its own entries so they are kept warm by the refresher.
+        with result_cache.pinning():
+            try:
+                get_recommendations(db, req)
+                warmup_status.recommendation_queries += 1
+            except Exception as e:
+                # A failed combination is simply loaded on first use; it does not block readiness.
+                warmup_status.errors.append(f"{req.model_dump_json(exclude_defaults=True)}: {e}")
+
+    with ThreadPoolExecutor(max_workers=max(1, settings.warmup_concurrency), thread_name_prefix="warmup") as pool:
+        list(pool.map(warm, reqs))
+
+    if not stop.is_set():
+        _mark_ready()
+        logger.info(
+            "Warm-up finished in %.1fs: %d meta, %d/%d recommendation queries",
+            time.perf_counter() - started,
+            warmup_status.meta_queries,
+            warmup_status.recommendation_queries,
+            len(reqs),
+        )
+
+
+def start_warmup(db: GraphDBClient, stop: threading.Event) -> None:
+    if not settings.warmup_enabled:
+        _mark_ready()
+        return
+    # Runs beside the server so liveness answers immediately; readiness flips when it is done.
+    threading.Thread(target=run_warmup, args=(db, stop), name="warmup", daemon=True).start()
@@ -0,0 +1,258 @@
+"""Latency/throughput benchmark for the FastAPI backend against a fake GraphDB.
+
+Run from the backend directory:
+
+    python benchmarks/api_benchmark.py --concurrency 1,8,32 --requests 400 --output bench.json
+
+Starts benchmarks/fake_graphdb.py and the API (uvicorn) as subprocesses, drives /meta/*,
+/recommendations and /recommendations/details at each concurrency level and prints
+p50/p95/p99 latency and throughput per endpoint as JSON. /users/* is included when
+--database-url (or DATABASE_URL) points at a reachable Postgres.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import requests
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+
+CLUSTER_IRIS = [f"http://example.com/ml-articles/cluster_{i}" for i in range(3)]
+CONDITION_IRIS = [f"http://h-da.de/ml-ontology/condition_{i}" for i in range(3)]
+PERFORMANCE_IRIS = [f"http://h-da.de/ml-ontology/performance_{i}" for i in range(2)]
+RECOMMENDATION_REQUEST = {
+    "cluster_iris": CLUSTER_IRIS,
+    "conditions": CONDITION_IRIS,
+    "performance_prefs": PERFORMANCE_IRIS,
+    "task_iri": "http://h-da.de/ml-ontology/classification",
+    "max_results": 15,
+}
+DETAILS_REQUEST = RECOMMENDATION_REQUEST | {"approach_iri": "http://h-da.de/ml-ontology/approach_0"}
+META_PATHS = [
+    "/meta/phases",
+    "/meta/clusters",
+    "/meta/clusters/keywords",
+    "/meta/paradigms",
+    "/meta/tasks",
+    "/meta/enums/dataset-types",
+    "/meta/enums/conditions",
+    "/meta/enums/performance",
+]
+PLACEHOLDER_DATABASE_URL = "postgresql://benchmark@127.0.0.1:1/unused"
+
+
+@dataclass
+class Scenario:
+    name: str
+    method: str
+    path: str
+    body: Any = None
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_until_ready(url: str, timeout_seconds: float) -> None:
+    deadline = time.monotonic() + timeout_seconds
+    while time.monotonic() < deadline:
+        try:
+            if requests.get(url, timeout=1).status_code < 500:
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(0.1)
+    raise RuntimeError(f"{url} did not become ready within {timeout_seconds:.0f}s")
+
+
+def _percentile(sorted_samples: list[float], pct: float) -> float:
+    # Nearest-rank percentile
+    if not sorted_samples:
+        return 0.0
+    rank = max(1, int(round(pct / 100.0 * len(sorted_samples))))
+    return sorted_samples[min(rank, len(sorted_samples)) - 1]
+
+
+def _run_level(base_url: str, scenario: Scenario, concurrency: int, total: int, warmup: int) -> dict:
+    local = threading.local()
+
+    def session() -> requests.Session:
+        if not hasattr(local, "session"):
+            local.session = requests.Session()
+        return local.session
+
+    def one_request() -> tuple[float, bool]:
+        started = time.perf_counter()
+        try:
+            res = session().request(scenario.method, base_url + scenario.path, json=scenario.body, timeout=60)
+            ok = res.status_code < 400
+            res.content  # noqa: B018 - read the full body inside the timed region
+        except requests.RequestException:
+            ok = False
+        return (time.perf_counter() - started) * 1000.0, ok
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(lambda _: one_request(), range(warmup)))
+        started = time.perf_counter()
+        results = list(pool.map(lambda _: one_request(), range(total)))
+        elapsed = time.perf_counter() - started
+
+    latencies = sorted(ms for ms, _ in results)
+    errors = sum(1 for _, ok in results if not ok)
+    return {
+        "endpoint": scenario.name,
+        "concurrency": concurrency,
+        "requests": total,
+        "errors": errors,
+        "p50_ms": round(_percentile(latencies, 50), 3),
+        "p95_ms": round(_percentile(latencies, 95), 3),
+        "p99_ms": round(_percentile(latencies, 99), 3),
+        "mean_ms": round(sum(latencies) / len(latencies), 3) if latencies else 0.0,
+        "throughput_rps": round(total / elapsed, 1) if elapsed else None,
+    }
+
+
+def _user_scenarios(base_url: str) -> list[Scenario]:
+    res = requests.post(f"{base_url}/users/login", json={"username": "benchmark-user"}, timeout=10)
+    res.raise_for_status()
+    user_id = res.json()["id"]
+    return [
+        Scenario("POST /users/login", "POST", "/users/login", {"username": "benchmark-user"}),
+        Scenario("GET /users/{id}/saved-searches", "GET", f"/users/{user_id}/saved-searches?limit=20"),
+        Scenario(
+            "POST /users/{id}/saved-searches",
+            "POST",
+            f"/users/{user_id}/saved-searches",
+            RECOMMENDATION_REQUEST | {"problem_text": "benchmark"},
+        ),
+    ]
+
+
+def _git_revision() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=BACKEND_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", default="1,4,16", help="comma-separated concurrency levels")
+    parser.add_argument("--requests", type=int, default=200, help="measured requests per endpoint and level")
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--graphdb-latency-ms", type=float, default=5.0)
+    parser.add_argument("--graphdb-jitter-ms", type=float, default=0.0)
+    parser.add_argument("--articles", type=int, default=50)
+    parser.add_argument("--payload-dir", type=Path, default=None, help="recorded <shape>.json responses")
+    parser.add_argument("--database-url", default=os.environ.get("DATABASE_URL"))
+    parser.add_argument("--endpoints", default="", help="only run endpoints containing one of these comma-separated substrings")
+    parser.add_argument("--output", type=Path, default=None)
+    args = parser.parse_args()
+
+    levels = [int(v) for v in args.concurrency.split(",") if v.strip()]
+    graphdb_port = _free_port()
+    api_port = _free_port()
+    base_url = f"http://127.0.0.1:{api_port}"
+
+    fake_cmd = [
+        sys.executable,
+        str(BACKEND_ROOT / "benchmarks" / "fake_graphdb.py"),
+        "--port", str(graphdb_port),
+        "--latency-ms", str(args.graphdb_latency_ms),
+        "--jitter-ms", str(args.graphdb_jitter_ms),
+        "--articles", str(args.articles),
+    ]
+    if args.payload_dir is not None:
+        fake_cmd += ["--payload-dir", str(args.payload_dir)]
+
+    api_env = os.environ | {
+        "GRAPHDB_BASE_URL": f"http://127.0.0.1:{graphdb_port}",
+        "GRAPHDB_REPO_ID": "benchmark",
+        "DATABASE_URL": args.database_url or PLACEHOLDER_DATABASE_URL,
+    }
+    api_cmd = [
+        sys.executable, "-m", "uvicorn", "main:app",
+        "--host", "127.0.0.1", "--port", str(api_port), "--log-level", "warning",
+    ]
+
+    processes: list[subprocess.Popen] = []
+    try:
+        processes.append(subprocess.Popen(fake_cmd, cwd=BACKEND_ROOT))
+        processes.append(subprocess.Popen(api_cmd, cwd=BACKEND_ROOT, env=api_env))
+        _wait_until_ready(f"{base_url}/meta/phases", timeout_seconds=30)
+
+        scenarios = [Scenario(f"GET {path}", "GET", path) for path in META_PATHS]
+        scenarios += [
+            Scenario("POST /recommendations", "POST", "/recommendations", RECOMMENDATION_REQUEST),
+            Scenario("POST /recommendations/details", "POST", "/recommendations/details", DETAILS_REQUEST),
+        ]
+        skipped: list[str] = []
+        if args.database_url:
+            scenarios += _user_scenarios(base_url)
+        else:
+            skipped.append("/users/* (no --database-url / DATABASE_URL)")
+
+        filters = [f.strip() for f in args.endpoints.split(",") if f.strip()]
+        if filters:
+            scenarios = [s for s in scenarios if any(f in s.name for f in filters)]
+
+        results = [
+            _run_level(base_url, scenario, level, args.requests, args.warmup)
+            for scenario in scenarios
+            for level in levels
+        ]
+    finally:
+        for process in reversed(processes):
+            process.terminate()
+        for process in processes:
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+    report = {
+        "revision": _git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {
+            "concurrency": levels,
+            "requests": args.requests,
+            "warmup": args.warmup,
+            "graphdb_latency_ms": args.graphdb_latency_ms,
+            "graphdb_jitter_ms": args.graphdb_jitter_ms,
+            "articles": args.articles,
+            "payload_dir": str(args.payload_dir) if args.payload_dir else None,
+        },
+        "skipped": skipped,
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output is not None:
+        args.output.write_text(text + "\n", encoding="utf-8")
+    print(text)
+    return 1 if any(r["errors"] for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
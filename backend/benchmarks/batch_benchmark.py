@@ -0,0 +1,138 @@
+"""Throughput of one-call-per-request /recommendations vs POST /recommendations/batch.
+
+Run from the backend directory:
+
+    python benchmarks/batch_benchmark.py --requests 1000 --batch-size 500 --graphdb-latency-ms 20
+
+Starts benchmarks/fake_graphdb.py and the API (uvicorn, result cache disabled) as subprocesses,
+builds --requests distinct recommendation requests (cluster x paradigm x phase contexts with the
+same preferences, like an evaluation sweep) and sends them once as single POSTs on --concurrency
+threads and once as batches of --batch-size, then prints requests/s for both as JSON. The fake
+charges its latency per GraphDB request, not per context, so the gain shown is the saved round
+trips; against a real GraphDB a merged query also costs more than a single one.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import requests
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND_ROOT / "benchmarks"))
+
+from api_benchmark import (  # noqa: E402
+    CONDITION_IRIS,
+    PERFORMANCE_IRIS,
+    PLACEHOLDER_DATABASE_URL,
+    _free_port,
+    _wait_until_ready,
+)
+
+ARTICLES_NS = "http://example.com/ml-articles/"
+ONTOLOGY_NS = "http://h-da.de/ml-ontology/"
+
+
+def _requests(count: int) -> list[dict]:
+    reqs = []
+    for i in range(count):
+        reqs.append({
+            "cluster_iris": [f"{ARTICLES_NS}cluster_{i % 40}"],
+            "paradigm_iri": f"{ONTOLOGY_NS}paradigm_{(i // 40) % 5}",
+            "phase_iri": f"{ONTOLOGY_NS}phase_{i // 200}",
+            "conditions": CONDITION_IRIS,
+            "performance_prefs": PERFORMANCE_IRIS,
+            "max_results": 10,
+        })
+    return reqs
+
+
+def _single(base_url: str, reqs: list[dict], concurrency: int) -> tuple[float, list]:
+    session = requests.Session()
+    session.mount("http://", requests.adapters.HTTPAdapter(pool_maxsize=concurrency))
+
+    def one(body: dict) -> list:
+        res = session.post(f"{base_url}/recommendations", json=body, timeout=60)
+        res.raise_for_status()
+        return res.json()
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(one, reqs))
+    return time.perf_counter() - started, results
+
+
+def _batched(base_url: str, reqs: list[dict], batch_size: int) -> tuple[float, list]:
+    results: list = []
+    started = time.perf_counter()
+    with requests.Session() as session:
+        for start in range(0, len(reqs), batch_size):
+            res = session.post(f"{base_url}/recommendations/batch", json=reqs[start:start + batch_size], timeout=300)
+            res.raise_for_status()
+            results.extend(res.json())
+    return time.perf_counter() - started, results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=4, help="threads for the single-request run")
+    parser.add_argument("--graphdb-latency-ms", type=float, default=20.0)
+    args = parser.parse_args()
+
+    graphdb_port = _free_port()
+    api_port = _free_port()
+    base_url = f"http://127.0.0.1:{api_port}"
+    api_env = os.environ | {
+        "GRAPHDB_BASE_URL": f"http://127.0.0.1:{graphdb_port}",
+        "GRAPHDB_REPO_ID": "benchmark",
+        "DATABASE_URL": os.environ.get("DATABASE_URL", PLACEHOLDER_DATABASE_URL),
+        # Both runs must reach GraphDB; a warm cache would hide the round trips being compared.
+        "CACHE_TTL_SECONDS": "0",
+        "WARMUP_ENABLED": "false",
+    }
+    processes = [
+        subprocess.Popen([
+            sys.executable, str(BACKEND_ROOT / "benchmarks" / "fake_graphdb.py"),
+            "--port", str(graphdb_port), "--latency-ms", str(args.graphdb_latency_ms),
+        ]),
+        subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(api_port),
+             "--log-level", "warning"],
+            cwd=BACKEND_ROOT,
+            env=api_env,
+        ),
+    ]
+    try:
+        _wait_until_ready(f"{base_url}/health/live", 30)
+        reqs = _requests(args.requests)
+        single_s, single = _single(base_url, reqs, args.concurrency)
+        batch_s, batched = _batched(base_url, reqs, args.batch_size)
+        if [len(rows) for rows in single] != [len(rows) for rows in batched]:
+            print("single and batched result sizes differ", file=sys.stderr)
+            return 1
+        print(json.dumps({
+            "requests": args.requests,
+            "graphdb_latency_ms": args.graphdb_latency_ms,
+            "single": {"concurrency": args.concurrency, "seconds": round(single_s, 3),
+                       "throughput_rps": round(args.requests / single_s, 1)},
+            "batch": {"batch_size": args.batch_size, "seconds": round(batch_s, 3),
+                      "throughput_rps": round(args.requests / batch_s, 1)},
+            "speedup": round(single_s / batch_s, 1),
+        }, indent=2))
+        return 0
+    finally:
+        for process in processes:
+            process.terminate()
+            process.wait(timeout=10)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
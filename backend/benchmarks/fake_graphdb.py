@@ -0,0 +1,302 @@
+"""Local stand-in for the GraphDB SPARQL endpoint used by the benchmarks.
+
+Run from the backend directory:
+
+    python benchmarks/fake_graphdb.py --port 7299 --latency-ms 5
+
+Answers POST /repositories/<repo> with synthetic application/sparql-results+json payloads
+chosen by query shape (meta, recommend, details-articles, details-matches, approach-profiles,
+health, data-version). A shape can be replaced by a recorded response by putting <shape>.json into
+--payload-dir. POST /repositories/<repo>/statements accepts updates and returns 204; an update
+that bumps mlg:dataVersion increments the data version the fake reports.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import re
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs
+
+ONTOLOGY_NS = "http://h-da.de/ml-ontology/"
+ARTICLES_NS = "http://example.com/ml-articles/"
+
+_CLUSTER_KEYWORDS = [
+    "battery", "anomaly", "maintenance", "vision", "forecasting", "energy", "quality",
+    "sensor", "robotics", "supply chain", "text", "fraud", "health",
+]
+
+
+def detect_shape(sparql: str) -> str:
+    if "ontotext.com/explain" in sparql:
+        return "explain"
+    if "?ok" in sparql:
+        return "health"
+    if "mlg:dataVersion" in sparql:
+        return "data-version"
+    if "?predicate ?property" in sparql:
+        return "approach-profiles"
+    if "mla:mentionsMethod" in sparql and "GROUP BY" in sparql:
+        return "recommend"
+    if "?doi" in sparql:
+        return "details-articles"
+    if "?condLabel" in sparql or "?perfLabel" in sparql or "?taskLabel" in sparql:
+        return "details-matches"
+    return "meta"
+
+
+def _uri(value: str) -> dict:
+    return {"type": "uri", "value": value}
+
+
+def _literal(value: str) -> dict:
+    return {"type": "literal", "value": value}
+
+
+def _integer(value: int) -> dict:
+    return {"type": "literal", "datatype": "http://www.w3.org/2001/XMLSchema#integer", "value": str(value)}
+
+
+def _results(variables: list[str], bindings: list[dict]) -> dict:
+    return {"head": {"vars": variables}, "results": {"bindings": bindings}}
+
+
+def _meta_payload(sparql: str, rng: random.Random, options: int) -> dict:
+    if "ApplicationCluster" in sparql:
+        bindings = [
+            {
+                "iri": _uri(f"{ARTICLES_NS}cluster_{i}"),
+                "label": _literal(", ".join(rng.sample(_CLUSTER_KEYWORDS, 3))),
+            }
+            for i in range(options)
+        ]
+    else:
+        kind = re.search(r"a\s+(\S+)\s*[;.]", sparql)
+        prefix = (kind.group(1) if kind else "option").split(":")[-1].lower()
+        bindings = [
+            {"iri": _uri(f"{ONTOLOGY_NS}{prefix}_{i}"), "label": _literal(f"{prefix} {i}")}
+            for i in range(options)
+        ]
+    return _results(["iri", "label"], bindings)
+
+
+def _recommend_payload(sparql: str, rng: random.Random) -> dict:
+    limit = re.search(r"LIMIT\s+(\d+)", sparql)
+    rows = int(limit.group(1)) if limit else 15
+    # Batched queries bind ?rid in "(<rid> <iri> ...)" VALUES rows and get rows for each rid.
+    rids = sorted({int(r) for r in re.findall(r"^\s*\((\d+)[\s)]", sparql, re.MULTILINE)})
+    bindings = []
+    for rid, i in [(rid, i) for rid in rids or [None] for i in range(rows)]:
+        bindings.append(
+            ({} if rid is None else {"rid": _integer(rid)}) | {
+                "method": _uri(f"{ARTICLES_NS}method_{i}"),
+                "methodLabel": _literal(f"Method {i}"),
+                "approach": _uri(f"{ONTOLOGY_NS}approach_{i}"),
+                "approachLabel": _literal(f"Approach {i}"),
+                "supportingArticles": _integer(rng.randint(1, 200)),
+                "possibleIfMatches": _integer(rng.randint(0, 3)),
+                "performanceMatches": _integer(rng.randint(0, 3)),
+                "taskMatch": _integer(rng.randint(0, 1)),
+            }
+        )
+    return _results(
+        (["rid"] if rids else []) + [
+            "method", "methodLabel", "approach", "approachLabel",
+            "supportingArticles", "possibleIfMatches", "performanceMatches", "taskMatch",
+        ],
+        bindings,
+    )
+
+
+def _articles_payload(rng: random.Random, articles: int) -> dict:
+    bindings = [
+        {
+            "article": _uri(f"{ARTICLES_NS}article_{i}"),
+            "doi": _literal(f"10.{1000 + i}/bench.{rng.randint(0, 99999)}"),
+            "label": _literal(" ".join(rng.sample(_CLUSTER_KEYWORDS, 4)).title()),
+        }
+        for i in range(articles)
+    ]
+    return _results(["article", "doi", "label"], bindings)
+
+
+def _matches_payload() -> dict:
+    bindings = [
+        {"cond": _uri(f"{ONTOLOGY_NS}condition_{i}"), "condLabel": _literal(f"condition {i}")}
+        for i in range(3)
+    ] + [
+        {"perf": _uri(f"{ONTOLOGY_NS}performance_{i}"), "perfLabel": _literal(f"performance {i}")}
+        for i in range(2)
+    ]
+    return _results(["cond", "condLabel", "perf", "perfLabel", "task", "taskLabel"], bindings)
+
+
+def _per_approach(sparql: str, payload: dict) -> dict:
+    # Multi-approach details queries bind VALUES ?approach: repeat the rows for each approach.
+    values = re.search(r"VALUES \?approach \{([^}]*)\}", sparql)
+    if not values:
+        return payload
+    approaches = re.findall(r"<([^>]+)>", values.group(1))
+    bindings = [
+        {"approach": _uri(approach)} | binding
+        for approach in approaches
+        for binding in payload["results"]["bindings"]
+    ]
+    return _results(["approach"] + payload["head"]["vars"], bindings)
+
+
+def _profiles_payload() -> dict:
+    # One possible_if, performance and used_for value per approach (see _per_approach).
+    bindings = [
+        {"property": _literal("possible_if"), "value": _uri(f"{ONTOLOGY_NS}condition_0")},
+        {"property": _literal("performance"), "value": _uri(f"{ONTOLOGY_NS}performance_0")},
+        {"property": _literal("used_for"), "value": _uri(f"{ONTOLOGY_NS}classification")},
+    ]
+    return _results(["property", "value"], bindings)
+
+
+class FakeGraphDB:
+    def __init__(
+        self,
+        latency_ms: float = 5.0,
+        jitter_ms: float = 0.0,
+        options: int = 12,
+        articles: int = 50,
+        payload_dir: Path | None = None,
+        seed: int = 0,
+        slow_probability: float = 0.0,
+        slow_ms: float = 0.0,
+    ):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        # Occasional stragglers (GC pauses, cold caches) to exercise tail latency.
+        self.slow_probability = slow_probability
+        self.slow_ms = slow_ms
+        self.options = options
+        self.articles = articles
+        self.seed = seed
+        self.data_version = 0
+        self.recorded: dict[str, bytes] = {}
+        if payload_dir is not None:
+            for path in payload_dir.glob("*.json"):
+                self.recorded[path.stem] = path.read_bytes()
+
+    def respond(self, sparql: str) -> bytes:
+        shape = detect_shape(sparql)
+        recorded = self.recorded.get(shape)
+        if recorded is not None:
+            return recorded
+
+        # Same query -> same payload, so runs are reproducible.
+        rng = random.Random(f"{self.seed}:{sparql}")
+        if shape == "health":
+            payload = _results(["ok"], [{"ok": _integer(1)}])
+        elif shape == "data-version":
+            payload = _results(["version"], [{"version": _integer(self.data_version)}])
+        elif shape == "recommend":
+            payload = _recommend_payload(sparql, rng)
+        elif shape == "details-articles":
+            payload = _per_approach(sparql, _articles_payload(rng, self.articles))
+        elif shape == "details-matches":
+            payload = _per_approach(sparql, _matches_payload())
+        elif shape == "approach-profiles":
+            payload = _per_approach(sparql, _profiles_payload())
+        elif shape == "explain":
+            payload = _results(["plan"], [{"plan": _literal("fake plan")}])
+        else:
+            payload = _meta_payload(sparql, rng, self.options)
+        return json.dumps(payload).encode("utf-8")
+
+    def delay(self) -> None:
+        latency = self.latency_ms + (random.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0.0)
+        if self.slow_probability and random.random() < self.slow_probability:
+            latency += self.slow_ms
+        if latency > 0:
+            time.sleep(latency / 1000.0)
+
+
+def make_handler(fake: FakeGraphDB) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Headers and body go out in separate writes; without this, Nagle + delayed ACK add ~40 ms.
+        disable_nagle_algorithm = True
+
+        def log_message(self, format: str, *args) -> None:  # noqa: A002
+            pass
+
+        def _send(self, status: int, body: bytes = b"", content_type: str | None = None) -> None:
+            self.send_response(status)
+            if content_type:
+                self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            if body:
+                self.wfile.write(body)
+
+        def do_POST(self) -> None:  # noqa: N802
+            length = int(self.headers.get("Content-Length") or 0)
+            body = self.rfile.read(length)
+            fake.delay()
+            if self.path.endswith("/statements"):
+                if b"dataVersion" in body:
+                    fake.data_version += 1
+                self._send(204)
+                return
+            if "application/x-www-form-urlencoded" in (self.headers.get("Content-Type") or ""):
+                sparql = parse_qs(body.decode("utf-8")).get("query", [""])[0]
+            else:
+                sparql = body.decode("utf-8")
+            self._send(200, fake.respond(sparql), "application/sparql-results+json")
+
+    return Handler
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # The API opens a connection per request; the default backlog of 5 drops SYNs under load.
+    request_queue_size = 512
+
+
+def serve(fake: FakeGraphDB, host: str, port: int) -> ThreadingHTTPServer:
+    return _Server((host, port), make_handler(fake))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7299)
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--options", type=int, default=12, help="rows per meta option query")
+    parser.add_argument("--articles", type=int, default=50, help="rows per details articles query")
+    parser.add_argument("--payload-dir", type=Path, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--slow-probability", type=float, default=0.0, help="share of requests delayed by --slow-ms")
+    parser.add_argument("--slow-ms", type=float, default=0.0)
+    args = parser.parse_args()
+
+    fake = FakeGraphDB(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        options=args.options,
+        articles=args.articles,
+        payload_dir=args.payload_dir,
+        seed=args.seed,
+        slow_probability=args.slow_probability,
+        slow_ms=args.slow_ms,
+    )
+    server = serve(fake, args.host, args.port)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
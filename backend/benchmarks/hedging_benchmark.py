@@ -0,0 +1,109 @@
+"""Tail latency of GraphDBClient reads across several stub replicas, with and without hedging.
+
+Run from the backend directory:
+
+    python benchmarks/hedging_benchmark.py --replicas 3 --slow-probability 0.05 --slow-ms 300
+
+Starts --replicas fake GraphDB servers (see fake_graphdb.py) in this process, each delaying a
+share of requests by --slow-ms, then issues the same SELECT stream through a single-node
+client, a balanced client and a balanced + hedged client and prints p50/p95/p99 as JSON.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND_ROOT))
+sys.path.insert(0, str(BACKEND_ROOT / "benchmarks"))
+os.environ.setdefault("DATABASE_URL", "postgresql://benchmark@127.0.0.1:1/unused")
+
+from app.graphdb import GraphDBClient  # noqa: E402
+from app.services.meta_service import CLUSTERS_QUERY  # noqa: E402
+from fake_graphdb import FakeGraphDB, serve  # noqa: E402
+from api_benchmark import _percentile  # noqa: E402
+
+
+def _start_replicas(count: int, args: argparse.Namespace) -> list:
+    servers = []
+    for index in range(count):
+        fake = FakeGraphDB(
+            latency_ms=args.latency_ms,
+            jitter_ms=args.jitter_ms,
+            seed=index,
+            slow_probability=args.slow_probability,
+            slow_ms=args.slow_ms,
+        )
+        server = serve(fake, "127.0.0.1", 0)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+    return servers
+
+
+def _measure(client: GraphDBClient, requests_total: int, concurrency: int) -> dict:
+    def one(_: int) -> float:
+        started = time.perf_counter()
+        client.select(CLUSTERS_QUERY, shape="benchmark", track_slow=False)
+        return (time.perf_counter() - started) * 1000.0
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, range(min(50, requests_total))))  # warm up latency window and connections
+        started = time.perf_counter()
+        latencies = sorted(pool.map(one, range(requests_total)))
+        elapsed = time.perf_counter() - started
+    return {
+        "p50_ms": round(_percentile(latencies, 50), 2),
+        "p95_ms": round(_percentile(latencies, 95), 2),
+        "p99_ms": round(_percentile(latencies, 99), 2),
+        "max_ms": round(latencies[-1], 2),
+        "throughput_rps": round(requests_total / elapsed, 1),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--replicas", type=int, default=3)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    parser.add_argument("--jitter-ms", type=float, default=2.0)
+    parser.add_argument("--slow-probability", type=float, default=0.05)
+    parser.add_argument("--slow-ms", type=float, default=300.0)
+    parser.add_argument("--hedge-percentile", type=float, default=95.0)
+    parser.add_argument("--hedge-min-delay-ms", type=float, default=10.0)
+    args = parser.parse_args()
+
+    servers = _start_replicas(args.replicas, args)
+    urls = [f"http://127.0.0.1:{server.server_address[1]}" for server in servers]
+    variants = {
+        "single": GraphDBClient(urls[0], "benchmark"),
+        "balanced": GraphDBClient(urls[0], "benchmark", read_base_urls=urls),
+        "hedged": GraphDBClient(
+            urls[0],
+            "benchmark",
+            read_base_urls=urls,
+            hedge_percentile=args.hedge_percentile,
+            hedge_min_delay_ms=args.hedge_min_delay_ms,
+        ),
+    }
+    try:
+        results = {name: _measure(client, args.requests, args.concurrency) for name, client in variants.items()}
+    finally:
+        for client in variants.values():
+            client.close()
+        for server in servers:
+            server.shutdown()
+            server.server_close()
+
+    print(json.dumps({"config": vars(args), "results": results}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
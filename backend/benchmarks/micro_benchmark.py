@@ -0,0 +1,324 @@
+"""Micro-benchmarks for the SPARQL query builders and result conversion.
+
+Run from the backend directory:
+
+    python benchmarks/micro_benchmark.py                 # print timings as JSON
+    python benchmarks/micro_benchmark.py --check         # also fail on threshold regressions
+
+Each case runs at a realistic and a stress size (100 cluster IRIs, 50 conditions, 100k
+bindings / details articles, 1k saved searches) and reports per-call time plus peak and retained memory per call (tracemalloc).
+--check compares against benchmarks/micro_thresholds.json and exits 1 if any case is slower
+or peaks higher than its threshold times --tolerance; reference cases (the default FastAPI
+serialization paths the routers replaced) are reported but not checked. --write-thresholds regenerates that
+file from the current run with headroom.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND_ROOT))
+os.environ.setdefault("DATABASE_URL", "postgresql://benchmark@127.0.0.1:1/unused")
+
+from app.services.recommendation_service import (  # noqa: E402
+    RecommendationDetailsRequest,
+    RecommendationRequest,
+    _dedupe_nonempty,
+    _values_clause,
+    apply_preferences,
+    build_details_articles_query,
+    build_details_matches_query,
+    build_recommendation_query,
+)
+from app.services.ranking import RankingWeights, feature_table, rank  # noqa: E402
+from app.services.data_version import with_data_version_bump  # noqa: E402
+from app.services.sparql_results import bindings_to_rows, rows_to_options  # noqa: E402
+from app.routers.users import SavedSearchResponse  # noqa: E402
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse, ORJSONResponse  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+
+THRESHOLDS_PATH = Path(__file__).with_name("micro_thresholds.json")
+ONTOLOGY_NS = "http://h-da.de/ml-ontology/"
+ARTICLES_NS = "http://example.com/ml-articles/"
+
+SIZES = {
+    "realistic": {"clusters": 5, "conditions": 5, "performance": 3, "bindings": 1_000, "saved_searches": 20,
+                  "separators": 50},
+    "stress": {"clusters": 100, "conditions": 50, "performance": 20, "bindings": 100_000, "saved_searches": 1_000,
+               "separators": 10_000},
+}
+SAVED_SEARCHES_ADAPTER = TypeAdapter(list[SavedSearchResponse])
+
+
+@dataclass
+class Case:
+    name: str
+    size: str
+    func: Callable[[], Any]
+    # Target wall time per measurement; fast calls are repeated to reach it.
+    min_seconds: float = 0.2
+    # Reference ("before") cases are timed for comparison only: --check ignores them and
+    # --write-thresholds does not record them.
+    gated: bool = True
+
+
+def _iris(ns: str, kind: str, count: int, duplicates: bool = True) -> list[str]:
+    iris = [f"{ns}{kind}_{i}" for i in range(count)]
+    # Requests from the UI can contain repeats and blanks; keep both in the input.
+    return iris + iris[: count // 10] + [""] if duplicates else iris
+
+
+def _request(size: dict[str, int]) -> RecommendationDetailsRequest:
+    return RecommendationDetailsRequest(
+        cluster_iris=_iris(ARTICLES_NS, "cluster", size["clusters"]),
+        paradigm_iri=f"{ARTICLES_NS}paradigm_supervised",
+        task_iri=f"{ONTOLOGY_NS}classification",
+        conditions=_iris(ONTOLOGY_NS, "condition", size["conditions"], duplicates=False),
+        performance_prefs=_iris(ONTOLOGY_NS, "performance", size["performance"], duplicates=False),
+        max_results=15,
+        approach_iri=f"{ONTOLOGY_NS}random_forest",
+    )
+
+
+def _recommendation_bindings(count: int) -> dict[str, Any]:
+    integer = "http://www.w3.org/2001/XMLSchema#integer"
+    return {
+        "head": {"vars": ["method", "methodLabel", "approach", "approachLabel", "supportingArticles"]},
+        "results": {
+            "bindings": [
+                {
+                    "method": {"type": "uri", "value": f"{ARTICLES_NS}method_{i}"},
+                    "methodLabel": {"type": "literal", "value": f"Method {i}"},
+                    "approach": {"type": "uri", "value": f"{ONTOLOGY_NS}approach_{i}"},
+                    "approachLabel": {"type": "literal", "value": f"Approach {i}"},
+                    "supportingArticles": {"type": "literal", "datatype": integer, "value": str(i % 500)},
+                }
+                for i in range(count)
+            ]
+        },
+    }
+
+
+def _context_and_profiles(count: int, req: RecommendationRequest) -> tuple[list[dict[str, Any]], dict[str, Any]]:
+    rows = bindings_to_rows(_recommendation_bindings(count))
+    profiles = {
+        row["approach"]: {
+            "possible_if": frozenset(req.conditions[i % 3::3]),
+            "not_possible_if": frozenset(req.conditions[:1] if i % 7 == 0 else []),
+            "performance": frozenset(req.performance_prefs[i % 2::2]),
+            "used_for": frozenset([req.task_iri] if i % 2 else []),
+        }
+        for i, row in enumerate(rows)
+    }
+    return rows, profiles
+
+
+def _option_rows(count: int) -> list[dict[str, Any]]:
+    return [{"iri": f"{ONTOLOGY_NS}option_{i}", "label": f"Option {i}"} for i in range(count)]
+
+
+def _details_payload(articles: int) -> dict[str, Any]:
+    return {
+        "approachIri": f"{ONTOLOGY_NS}random_forest",
+        "articles": [
+            {"article": f"{ARTICLES_NS}article_{i}", "doi": f"10.{1000 + i}/bench.{i}", "label": f"Article {i} on forecasting"}
+            for i in range(articles)
+        ],
+        "matches": {
+            "conditions": [{"iri": f"{ONTOLOGY_NS}condition_{i}", "label": f"condition {i}"} for i in range(5)],
+            "performance": [{"iri": f"{ONTOLOGY_NS}performance_{i}", "label": f"performance {i}"} for i in range(3)],
+            "tasks": [{"iri": f"{ONTOLOGY_NS}classification", "label": "classification"}],
+        },
+    }
+
+
+def _saved_search_rows(count: int) -> list[dict[str, Any]]:
+    created_at = datetime(2026, 3, 1, 12, 0, tzinfo=timezone.utc)
+    return [
+        {
+            "id": i, "user_id": 1, "created_at": created_at, "problem_text": f"Predict failures {i}",
+            "phase_iri": None, "cluster_iris": [f"{ARTICLES_NS}cluster_{i % 10}"], "paradigm_iri": None,
+            "max_results": 10, "task_iri": f"{ONTOLOGY_NS}classification",
+            "conditions": [f"{ONTOLOGY_NS}condition_1"], "performance_prefs": [], "dataset_type_iri": None,
+        }
+        for i in range(count)
+    ]
+
+
+def _saved_searches_validated(rows: list[dict[str, Any]]) -> bytes:
+    # Previous /users path: model_validate per row, then FastAPI's response_model validate + serialize.
+    models = [SavedSearchResponse.model_validate(row) for row in rows]
+    value = SAVED_SEARCHES_ADAPTER.validate_python(models)
+    return JSONResponse(SAVED_SEARCHES_ADAPTER.dump_python(value, mode="json")).body
+
+
+def build_cases() -> list[Case]:
+    cases: list[Case] = []
+    for size_name, size in SIZES.items():
+        req = _request(size)
+        base_req = RecommendationRequest(**req.model_dump(exclude={"approach_iri"}))
+        raw = _recommendation_bindings(size["bindings"])
+        options = _option_rows(size["bindings"])
+        cluster_iris = req.cluster_iris
+        details = _details_payload(size["bindings"])
+        saved = _saved_search_rows(size["saved_searches"])
+        # /sparql/update input that used to make the trailing-separator regex backtrack.
+        separators = "INSERT DATA { <urn:a> <urn:b> <urn:c> }" + (";" + " " * 10) * size["separators"] + "x"
+        features = feature_table(bindings_to_rows(raw))
+        context_rows, profiles = _context_and_profiles(size["bindings"], req)
+        weights = RankingWeights(task_match=2.0, possible_if_matches=1.5)
+        text_weights = RankingWeights(text_score=10.0)
+        cases += [
+            Case("dedupe_nonempty", size_name, lambda v=cluster_iris: _dedupe_nonempty(v)),
+            Case("values_clause", size_name, lambda v=cluster_iris: _values_clause("cluster", v)),
+            Case("build_recommendation_query", size_name, lambda r=base_req: build_recommendation_query(r)),
+            Case("build_details_articles_query", size_name, lambda r=req: build_details_articles_query(r)),
+            Case("build_details_matches_query", size_name, lambda r=req: build_details_matches_query(r)),
+            Case("bindings_to_rows", size_name, lambda r=raw: bindings_to_rows(r)),
+            Case("rows_to_options", size_name, lambda o=options: rows_to_options(o)),
+            Case("with_data_version_bump", size_name, lambda u=separators: with_data_version_bump(u)),
+            # Preference stage of staged evaluation over cached context rows and approach profiles.
+            Case("apply_preferences", size_name, lambda c=context_rows, p=profiles, r=base_req: apply_preferences(c, p, r)),
+            # Re-ranking a cached feature table with client weights (no GraphDB round trip).
+            Case("rank_weighted", size_name, lambda t=features, w=weights: rank(t, w, 15)),
+            Case("rank_weighted_text", size_name,
+                 lambda t=features, w=text_weights: rank(t, w, 15, "approach 42 for sensor data")),
+            # Response serialization: FastAPI's default path vs ORJSONResponse as used by the routers.
+            Case("details_response_jsonable", size_name, lambda d=details: JSONResponse(jsonable_encoder(d)).body,
+                 gated=False),
+            Case("details_response_orjson", size_name, lambda d=details: ORJSONResponse(d).body),
+            Case("saved_searches_response_validated", size_name, lambda r=saved: _saved_searches_validated(r),
+                 gated=False),
+            Case("saved_searches_response_orjson", size_name, lambda r=saved: ORJSONResponse(r).body),
+        ]
+    return cases
+
+
+def _calls_per_sample(func: Callable[[], Any], min_seconds: float) -> int:
+    calls = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(calls):
+            func()
+        if time.perf_counter() - started >= min_seconds / 5 or calls >= 1_000_000:
+            return calls
+        calls *= 4
+
+
+def _time_case(case: Case, samples: int) -> dict[str, float]:
+    calls = _calls_per_sample(case.func, case.min_seconds)
+    per_call_us: list[float] = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        for _ in range(calls):
+            case.func()
+        per_call_us.append((time.perf_counter() - started) / calls * 1e6)
+    return {
+        "calls_per_sample": calls,
+        "min_us": min(per_call_us),
+        "median_us": statistics.median(per_call_us),
+    }
+
+
+def _allocations(case: Case) -> dict[str, int]:
+    # One traced call: peak traced memory during the call and bytes still held by its result.
+    case.func()
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        result = case.func()
+        after, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return {
+        "peak_bytes": max(0, peak - before),
+        "retained_bytes": max(0, after - before),
+    }
+
+
+def _check(results: list[dict[str, Any]], thresholds: dict[str, Any], tolerance: float) -> list[str]:
+    failures: list[str] = []
+    for result in results:
+        if not result["gated"]:
+            continue
+        key = f"{result['case']}[{result['size']}]"
+        limit = thresholds.get(key)
+        if limit is None:
+            failures.append(f"{key}: no threshold in {THRESHOLDS_PATH.name}")
+            continue
+        if result["median_us"] > limit["max_median_us"] * tolerance:
+            failures.append(
+                f"{key}: median {result['median_us']:.1f} us > {limit['max_median_us'] * tolerance:.1f} us"
+            )
+        if result["peak_bytes"] > limit["max_peak_bytes"] * tolerance:
+            failures.append(
+                f"{key}: peak {result['peak_bytes']} B > {int(limit['max_peak_bytes'] * tolerance)} B"
+            )
+    return failures
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--samples", type=int, default=5)
+    parser.add_argument("--only", default="", help="run cases whose name contains this substring")
+    parser.add_argument("--check", action="store_true", help="fail if a case exceeds its threshold")
+    parser.add_argument("--tolerance", type=float, default=1.0, help="multiplier applied to thresholds")
+    parser.add_argument(
+        "--write-thresholds",
+        type=float,
+        metavar="HEADROOM",
+        default=None,
+        help="write measured median/peak times HEADROOM to the thresholds file",
+    )
+    args = parser.parse_args()
+
+    results: list[dict[str, Any]] = []
+    for case in build_cases():
+        if args.only and args.only not in case.name:
+            continue
+        results.append({
+            "case": case.name,
+            "size": case.size,
+            "gated": case.gated,
+            **_time_case(case, args.samples),
+            **_allocations(case),
+        })
+
+    report: dict[str, Any] = {"sizes": SIZES, "results": results}
+    if args.write_thresholds is not None:
+        thresholds = {
+            f"{r['case']}[{r['size']}]": {
+                "max_median_us": round(r["median_us"] * args.write_thresholds, 1),
+                "max_peak_bytes": int(r["peak_bytes"] * args.write_thresholds),
+            }
+            for r in results
+            if r["gated"]
+        }
+        THRESHOLDS_PATH.write_text(json.dumps(thresholds, indent=2) + "\n", encoding="utf-8")
+    failures: list[str] = []
+    if args.check:
+        thresholds = json.loads(THRESHOLDS_PATH.read_text(encoding="utf-8"))
+        failures = _check(results, thresholds, args.tolerance)
+        report["threshold_failures"] = failures
+    print(json.dumps(report, indent=2))
+    if failures:
+        print("\n".join(failures), file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+"""GraphDB latency of the flat vs pre-aggregated recommendation query as conditions grow.
+
+Run from the backend directory against a loaded repository:
+
+    python benchmarks/query_plan_benchmark.py --conditions 0,1,2,4,8,16 --repeat 5
+    python benchmarks/query_plan_benchmark.py --explain-dir plans/   # also save GraphDB plans
+
+For each condition count the request uses the first N condition IRIs from /meta/enums/conditions
+(plus --performance-prefs performance IRIs and the first task, if any). Each plan is run --repeat
+times after one warm-up run. The script prints the median and min latency and the row count per
+plan, and whether both plans returned identical rows, as JSON. The flat plan multiplies article
+rows by every matching condition, performance and task value before aggregating, so its latency
+grows with the number of preferences; the pre-aggregated plan's should stay nearly flat.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND_ROOT))
+os.environ.setdefault("DATABASE_URL", "postgresql://benchmark@127.0.0.1:1/unused")
+
+from app.graphdb import GraphDBClient  # noqa: E402
+from app.services import meta_service  # noqa: E402
+from app.services.recommendation_service import RecommendationRequest, build_recommendation_query  # noqa: E402
+from app.services.sparql_results import bindings_to_rows  # noqa: E402
+from app.settings import settings  # noqa: E402
+from app.slow_queries import explain_query  # noqa: E402
+
+PLANS = ("flat", "preaggregated")
+
+
+def _time_plan(db: GraphDBClient, sparql: str, repeat: int) -> tuple[dict, list]:
+    rows = bindings_to_rows(db.select(sparql, shape="plan-benchmark", track_slow=False))
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        db.select(sparql, shape="plan-benchmark", track_slow=False)
+        samples.append((time.perf_counter() - started) * 1000.0)
+    return {
+        "median_ms": round(statistics.median(samples), 2),
+        "min_ms": round(min(samples), 2),
+        "rows": len(rows),
+    }, rows
+
+
+def _save_explain(db: GraphDBClient, sparql: str, path: Path) -> None:
+    explain = explain_query(sparql)
+    if explain is None:
+        return
+    raw = db.select(explain, shape="explain", track_slow=False)
+    plan = "\n".join(v.get("value", "") for b in raw.get("results", {}).get("bindings", []) for v in b.values())
+    path.write_text(plan, encoding="utf-8")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default=settings.graphdb_base_url)
+    parser.add_argument("--repo-id", default=settings.graphdb_repo_id)
+    parser.add_argument("--conditions", default="0,1,2,4,8,16", help="comma-separated condition counts")
+    parser.add_argument("--performance-prefs", type=int, default=2, help="performance IRIs in every request")
+    parser.add_argument("--clusters", type=int, default=0, help="restrict to the first N clusters (0 = all articles)")
+    parser.add_argument("--max-results", type=int, default=15)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--explain-dir", type=Path, default=None, help="write GraphDB explain plans here")
+    args = parser.parse_args()
+
+    db = GraphDBClient(args.base_url, args.repo_id)
+    try:
+        conditions = [o["iri"] for o in meta_service.get_conditions(db)]
+        performance = [o["iri"] for o in meta_service.get_performance(db)][: args.performance_prefs]
+        tasks = [o["iri"] for o in meta_service.get_tasks(db)]
+        clusters = [o["iri"] for o in meta_service.get_clusters(db)][: args.clusters]
+        if args.explain_dir is not None:
+            args.explain_dir.mkdir(parents=True, exist_ok=True)
+
+        results = []
+        for count in [int(v) for v in args.conditions.split(",") if v.strip()]:
+            req = RecommendationRequest(
+                cluster_iris=clusters,
+                conditions=conditions[:count],
+                performance_prefs=performance,
+                task_iri=tasks[0] if tasks else None,
+                max_results=args.max_results,
+            )
+            entry: dict = {"conditions": len(req.conditions)}
+            rows_by_plan = {}
+            for plan in PLANS:
+                sparql = build_recommendation_query(req, plan=plan)
+                entry[plan], rows_by_plan[plan] = _time_plan(db, sparql, args.repeat)
+                if args.explain_dir is not None:
+                    _save_explain(db, sparql, args.explain_dir / f"{plan}-{count}.txt")
+            entry["identical"] = rows_by_plan["flat"] == rows_by_plan["preaggregated"]
+            entry["speedup"] = round(entry["flat"]["median_ms"] / max(entry["preaggregated"]["median_ms"], 0.01), 2)
+            results.append(entry)
+    finally:
+        db.close()
+
+    print(json.dumps({"base_url": args.base_url, "repo_id": args.repo_id, "repeat": args.repeat,
+                      "results": results}, indent=2))
+    return 0 if all(r["identical"] for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,32 @@
+import threading
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+
+from app.cache import result_cache
+from app.dependencies import get_graphdb
+from app.graph_version import GRAPH_VERSION_HEADER, GraphVersionMiddleware, graph_version
+from app.metrics import MetricsMiddleware, metrics_endpoint
+from app.routers import health, sparql, meta, recommendations, users
+from app.settings import settings
+from app.warmup import start_warmup
+
 
-from app.routers import sparql, meta, recommendations, users
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    stop = threading.Event()
+    graph_version.start_polling(get_graphdb())
+    result_cache.start_background_refresh()
+    start_warmup(get_graphdb(), stop)
+    yield
+    stop.set()
+    result_cache.stop_background_refresh()
+    graph_version.stop_polling()
 
-app = FastAPI(title="GraphDB API")
+
+app = FastAPI(title="GraphDB API", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -11,8 +34,15 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[GRAPH_VERSION_HEADER],
 )
 
+app.add_middleware(GZipMiddleware, minimum_size=settings.response_gzip_min_bytes)
+app.add_middleware(GraphVersionMiddleware)
+app.add_middleware(MetricsMiddleware)
+app.add_route("/metrics", metrics_endpoint, include_in_schema=False)
+
+app.include_router(health.router, prefix="/health", tags=["health"])
 app.include_router(sparql.router, prefix="/sparql", tags=["sparql"])
 app.include_router(meta.router, prefix="/meta", tags=["meta"])
 app.include_router(recommendations.router, prefix="/recommendations", tags=["recommendations"])
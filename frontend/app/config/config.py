@@ -3,13 +3,23 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 class Settings(BaseSettings):
     backend_url: str = "http://localhost:8000"
     timeout_seconds: float = 30.0
-    meta_cache_ttl_seconds: int = 3600
+    # Cached meta and details are keyed by the backend graph version, so long TTLs stay fresh.
+    meta_cache_ttl_seconds: int = 86400
     max_results_default: int = 10
+    details_cache_ttl_seconds: int = 3600
+    # How often the graph version is re-read from the backend.
+    graph_version_check_seconds: float = 5.0
+    details_prefetch_top_n: int = 5
+    # Re-check template files on every render; only useful while editing templates.
+    template_auto_reload: bool = False
 
     # GitHub API setting, have to be moved to backend later
     github_token: str | None = None
     notebooks_repo_name: str = "mbergsto/generated-notebooks-mlguide"
     notebooks_repo_branch: str = "main"
+    github_api_url: str = "https://api.github.com"
+    # Local hash -> Colab URL index for uploaded notebooks (defaults to the temp directory).
+    colab_index_path: str | None = None
 
     model_config = SettingsConfigDict(
         env_file="../.env",  
@@ -15,7 +15,27 @@ class MetaData(BaseModel):
 class Option(BaseModel):
     iri: str
     label: str
+
+
+class ClusterKeyword(BaseModel):
+    keyword: str
+    mask: int
+
+
+class ClusterKeywordIndex(BaseModel):
+    # Bit i of a keyword mask refers to clusters[i]
+    clusters: list[str] = Field(default_factory=list)
+    keywords: list[ClusterKeyword] = Field(default_factory=list)
     
+class RankingWeights(BaseModel):
+    # Backend ranks by the weighted sum of the counts (and problem-text overlap) when set
+    supporting_articles: float = 1.0
+    task_match: float = 0.0
+    possible_if_matches: float = 0.0
+    performance_matches: float = 0.0
+    text_score: float = 0.0
+
+
 class RecommendationRequest(BaseModel):
     problem_text: str | None = None
     phase_iri: str | None = None
@@ -26,6 +46,7 @@ class RecommendationRequest(BaseModel):
     conditions: list[str] = Field(default_factory=list)
     performance_prefs: list[str] = Field(default_factory=list)
     dataset_type_iri: str | None = None
+    weights: RankingWeights | None = None
     
 class RecommendationItem(BaseModel):
     method: str | None = None
@@ -36,6 +57,7 @@ class RecommendationItem(BaseModel):
     possibleIfMatches: int | None = None
     performanceMatches: int | None = None
     taskMatch: int | None = None
+    score: float | None = None
     
 class ArticleItem(BaseModel):
     article: str | None = None
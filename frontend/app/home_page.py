@@ -5,7 +5,8 @@ import streamlit as st
 from integrations.api import ApiConfig, ApiError
 from config.config import settings
 from domain.models import RecommendationRequest
-from services import recommendations_service
+from services import notebook_bundle_service, recommendations_service
+from services.notebook_render_service import get_template_environment
 import utils.state_helpers as state
 from ui import home_page_ui as ui
 from ui import nav_ui
@@ -15,8 +16,9 @@ from ui import saved_searches_ui
 st.set_page_config(initial_sidebar_state="collapsed")
 
 @st.cache_data(ttl=settings.meta_cache_ttl_seconds, show_spinner="Loading...")
-def load_meta_cached(cfg: ApiConfig):
+def load_meta_cached(cfg: ApiConfig, graph_version: int):
     # Load metadata for form options with caching to avoid redundant API calls.
+    # graph_version is only part of the cache key: a data change loads fresh options.
     return recommendations_service.fetch_meta_options(cfg)
 
 
@@ -29,7 +31,16 @@ def main() -> None:
     ui.render_page_header()
 
     try:
-        phases, clusters, paradigms, tasks, dataset_types, conditions, performance = load_meta_cached(cfg)
+        (
+            phases,
+            clusters,
+            paradigms,
+            tasks,
+            dataset_types,
+            conditions,
+            performance,
+            cluster_keywords,
+        ) = load_meta_cached(cfg, recommendations_service.current_graph_version(cfg))
     except Exception as e:
         ui.render_error(e)
         st.stop()
@@ -39,6 +50,7 @@ def main() -> None:
     payload, submitted = ui.render_form(
         phases=phases,
         clusters=clusters,
+        cluster_keywords=cluster_keywords,
         paradigms=paradigms,
         tasks=tasks,
         dataset_types=dataset_types,
@@ -59,6 +71,11 @@ def main() -> None:
             with st.spinner("Fetching recommendations..."):
                 rows = recommendations_service.fetch_recommendations(cfg, req)
 
+            recommendations_service.prefetch_method_details(
+                cfg,
+                req,
+                [r.approach for r in rows[: settings.details_prefetch_top_n] if r.approach],
+            )
             st.session_state["last_rows"] = rows
             st.session_state["last_request_payload"] = req.model_dump(exclude_none=True)
         except ApiError as e:
@@ -76,6 +93,12 @@ def main() -> None:
     if isinstance(last_request_payload, dict):
         saved_searches_ui.render_save_search_action(cfg, last_request_payload)
 
+    problem_text = last_request_payload.get("problem_text") if isinstance(last_request_payload, dict) else None
+    template_env = get_template_environment()
+    ui.render_notebook_bundle_download(
+        lambda: notebook_bundle_service.build_notebook_bundle(template_env, rows, problem_text)
+    )
+
     selected_iri = ui.render_recommendations(rows)
     if selected_iri:
         st.session_state["selected_approach_iri"] = selected_iri
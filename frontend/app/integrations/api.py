@@ -1,13 +1,18 @@
 from __future__ import annotations
 
+import json
 import os
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Any, TypeVar
 
 import httpx
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter, ValidationError
 
 from domain.models import (
+    ClusterKeywordIndex,
     Option,
     RecommendationDetailsResponse,
     RecommendationRequest,
@@ -20,6 +25,11 @@ from config.config import settings
 
 T = TypeVar("T")
 
+_VALIDATED_MAX_ENTRIES = 256
+_validated_lock = threading.Lock()
+# (base_url, request key) -> (ETag, body) of responses that carried an ETag, shared by all clients
+_validated: OrderedDict[tuple[str, str], tuple[str, bytes]] = OrderedDict()
+
 
 @dataclass(frozen=True)
 class ApiConfig:
@@ -36,15 +46,44 @@ class ApiError(Exception):
         self.body = body
 
 
-def _parse_json_safe(res: httpx.Response) -> Any:
-    # Safely parse JSON or fallback to raw text
-    text = res.text
-    if not text:
+def _parse_json_safe(content: bytes) -> Any:
+    # Safely parse JSON or fallback to raw text (used for error bodies)
+    if not content:
         return None
     try:
-        return res.json()
-    except Exception:
-        return text
+        return json.loads(content)
+    except ValueError:
+        return content.decode("utf-8", errors="replace")
+
+
+def _stored_validator(key: tuple[str, str]) -> tuple[str, bytes] | None:
+    # (ETag, body) we already hold for key; sent as If-None-Match so an unchanged body comes back as 304
+    with _validated_lock:
+        return _validated.get(key)
+
+
+def _validator_headers(stored: tuple[str, bytes] | None) -> dict[str, str]:
+    return {"If-None-Match": stored[0]} if stored else {}
+
+
+def _revalidated_body(key: tuple[str, str], res: httpx.Response, stored: tuple[str, bytes] | None) -> bytes:
+    # Body to use for res: the stored copy on 304, otherwise res's own (kept if it has an ETag)
+    if res.status_code == 304 and stored:
+        return stored[1]
+    with _validated_lock:
+        etag = res.headers.get("etag")
+        if etag:
+            _validated[key] = (etag, res.content)
+            _validated.move_to_end(key)
+            while len(_validated) > _VALIDATED_MAX_ENTRIES:
+                _validated.popitem(last=False)
+        return res.content
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(item_model: type[T]) -> TypeAdapter[list[T]]:
+    # Built once per item type; validates a whole JSON array in one pass inside pydantic-core
+    return TypeAdapter(list[item_model])  # type: ignore[valid-type]
 
 
 class ApiClient:
@@ -71,53 +110,61 @@ class ApiClient:
         # Context manager exit
         self.close()
 
-    def _get(self, path: str) -> Any:
-        # Perform GET request with error handling
+    def _get(self, path: str) -> bytes:
+        # Perform GET request with error handling; returns the raw JSON body.
+        # Revalidates conditionally when an earlier response to the same path had an ETag.
+        key = (self.config.base_url, path)
+        stored = _stored_validator(key)
         try:
-            res = self._client.get(path)
+            res = self._client.get(path, headers=_validator_headers(stored))
         except Exception as e:
             raise ApiError(f"GET {path} failed (network error)") from e
 
-        body = _parse_json_safe(res)
         if res.is_error:
-            raise ApiError(f"GET {path} failed", res.status_code, body)
-        return body
-
-    def _post(self, path: str, payload: Any) -> Any:
-        # Perform POST request with JSON payload
+            raise ApiError(f"GET {path} failed", res.status_code, _parse_json_safe(res.content))
+        return _revalidated_body(key, res, stored)
+
+    def _post(self, path: str, payload: Any, conditional: bool = False) -> bytes:
+        # Perform POST request with JSON payload; conditional=True revalidates like _get
+        # (for read-only POST endpoints such as /recommendations/details)
+        headers = {"Content-Type": "application/json", "Accept": "application/json"}
+        key = (self.config.base_url, path + json.dumps(payload, sort_keys=True))
+        stored = _stored_validator(key) if conditional else None
+        headers |= _validator_headers(stored)
         try:
-            res = self._client.post(
-                path,
-                json=payload,
-                headers={"Content-Type": "application/json", "Accept": "application/json"},
-            )
+            res = self._client.post(path, json=payload, headers=headers)
         except Exception as e:
             raise ApiError(f"POST {path} failed (network error)") from e
 
-        body = _parse_json_safe(res)
         if res.is_error:
-            raise ApiError(f"POST {path} failed", res.status_code, body)
-        return body
+            raise ApiError(f"POST {path} failed", res.status_code, _parse_json_safe(res.content))
+        return _revalidated_body(key, res, stored) if conditional else res.content
 
-    def _parse_model(self, model: type[T], data: Any) -> T:
-        # Parse JSON into a Pydantic model
+    def _parse_model(self, model: type[T], content: bytes) -> T:
+        # Parse a JSON body straight into a Pydantic model (no intermediate dicts)
         if isinstance(model, type) and issubclass(model, BaseModel):
-            return model.model_validate(data)  # type: ignore[return-value]
-        return data  # type: ignore[return-value]
+            return model.model_validate_json(content)  # type: ignore[return-value]
+        return _parse_json_safe(content)  # type: ignore[return-value]
 
-    def _parse_list(self, item_model: type[T], data: Any) -> list[T]:
-        # Parse JSON array into typed list
-        if not isinstance(data, list):
-            raise ApiError("Expected a JSON array", body=data)
-        if isinstance(item_model, type) and issubclass(item_model, BaseModel):
-            return [item_model.model_validate(x) for x in data]  # type: ignore[misc]
-        return data  # type: ignore[return-value]
+    def _parse_list(self, item_model: type[T], content: bytes) -> list[T]:
+        # Parse a JSON array body into a typed list in one batch
+        try:
+            return _list_adapter(item_model).validate_json(content)
+        except ValidationError as e:
+            if any(not err["loc"] and err["type"] in ("list_type", "json_invalid") for err in e.errors()):
+                raise ApiError("Expected a JSON array", body=_parse_json_safe(content)) from e
+            raise
 
     class Meta:
         # Wrapper for /meta endpoints
         def __init__(self, outer: "ApiClient"):
             self._ = outer
 
+        def version(self) -> int:
+            # Fetch the backend's current graph data version
+            data = _parse_json_safe(self._._get("/meta/version"))
+            return int(data["graph_version"])
+
         def phases(self) -> list[Option]:
             # Fetch lifecycle phases
             return self._._parse_list(Option, self._._get("/meta/phases"))
@@ -126,6 +173,10 @@ class ApiClient:
             # Fetch clusters
             return self._._parse_list(Option, self._._get("/meta/clusters"))
 
+        def cluster_keywords(self) -> ClusterKeywordIndex:
+            # Fetch precomputed keyword -> cluster bitmask index
+            return self._._parse_model(ClusterKeywordIndex, self._._get("/meta/clusters/keywords"))
+
         def paradigms(self) -> list[Option]:
             # Fetch learning paradigms
             return self._._parse_list(Option, self._._get("/meta/paradigms"))
@@ -161,8 +212,16 @@ class ApiClient:
         ) -> RecommendationDetailsResponse:
             # Fetch recommendation details
             payload = req.model_dump(exclude_none=True) | {"approach_iri": approach_iri}
-            data = self._._post("/recommendations/details", payload)
-            return RecommendationDetailsResponse.model_validate(data)
+            data = self._._post("/recommendations/details", payload, conditional=True)
+            return self._._parse_model(RecommendationDetailsResponse, data)
+
+        def details_many(
+            self, req: RecommendationRequest, approach_iris: list[str]
+        ) -> list[RecommendationDetailsResponse]:
+            # Fetch details for several approaches in one call (one entry per distinct IRI, in order)
+            payload = req.model_dump(exclude_none=True) | {"approach_iris": approach_iris}
+            data = self._._post("/recommendations/details/batch", payload, conditional=True)
+            return self._._parse_list(RecommendationDetailsResponse, data)
 
     class Users:
         # Wrapper for /users endpoints
@@ -171,7 +230,7 @@ class ApiClient:
 
         def login(self, username: str) -> UserSession:
             data = self._._post("/users/login", {"username": username})
-            return UserSession.model_validate(data)
+            return self._._parse_model(UserSession, data)
 
         def list_saved_searches(self, user_id: int, limit: int = 20) -> list[SavedSearch]:
             data = self._._get(f"/users/{user_id}/saved-searches?limit={limit}")
@@ -182,7 +241,7 @@ class ApiClient:
                 f"/users/{user_id}/saved-searches",
                 payload.model_dump(exclude_none=False),
             )
-            return SavedSearch.model_validate(data)
+            return self._._parse_model(SavedSearch, data)
 
     @property
     def meta(self) -> "ApiClient.Meta":
@@ -1,39 +1,207 @@
 from __future__ import annotations
 
 import base64
-from datetime import datetime, timezone
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any
 
 import httpx
 
 
+GITHUB_API_URL = "https://api.github.com"
+_RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class GitHubRateLimitError(RuntimeError):
+    # GitHub asked for a longer wait than the UI should block for
+    def __init__(self, retry_after_seconds: float):
+        super().__init__(
+            f"GitHub rate limit reached, please try again in {int(retry_after_seconds)} seconds."
+        )
+        self.retry_after_seconds = retry_after_seconds
+
+
+class GitHubNotebookClient:
+    # Reusable client for the GitHub contents API with retry/backoff
+    def __init__(
+        self,
+        token: str,
+        repo_name: str,
+        branch: str,
+        api_url: str = GITHUB_API_URL,
+        timeout_seconds: float = 30.0,
+        max_retries: int = 3,
+        backoff_seconds: float = 0.5,
+        max_retry_delay_seconds: float = 5.0,
+        transport: httpx.BaseTransport | None = None,
+    ):
+        self.repo_name = repo_name
+        self.branch = branch
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        # Retries sleep on the Streamlit script thread, so no single wait may exceed this
+        self.max_retry_delay_seconds = max_retry_delay_seconds
+        self._client = httpx.Client(
+            base_url=api_url,
+            timeout=timeout_seconds,
+            transport=transport,
+            headers={
+                "Authorization": f"Bearer {token}",
+                "Accept": "application/vnd.github+json",
+                "X-GitHub-Api-Version": "2022-11-28",
+            },
+        )
+
+    def close(self) -> None:
+        self._client.close()
+
+    def __enter__(self) -> "GitHubNotebookClient":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def _retry_delay(self, attempt: int, res: httpx.Response | None) -> float:
+        retry_after = res.headers.get("Retry-After") if res is not None else None
+        if retry_after and retry_after.isdigit():
+            if float(retry_after) > self.max_retry_delay_seconds:
+                raise GitHubRateLimitError(float(retry_after))
+            return float(retry_after)
+        return min(self.backoff_seconds * (2**attempt), self.max_retry_delay_seconds)
+
+    def _request(self, method: str, path: str, **kwargs: Any) -> httpx.Response:
+        # Retry network errors, rate limits and 5xx responses with exponential backoff
+        for attempt in range(self.max_retries + 1):
+            res: httpx.Response | None = None
+            try:
+                res = self._client.request(method, path, **kwargs)
+            except httpx.TransportError:
+                if attempt == self.max_retries:
+                    raise
+            else:
+                if res.status_code not in _RETRY_STATUSES or attempt == self.max_retries:
+                    return res
+            time.sleep(self._retry_delay(attempt, res))
+        raise RuntimeError("unreachable")  # pragma: no cover
+
+    def put_file(self, file_path: str, content: bytes, message: str) -> None:
+        # Create a file; an existing file at a content-addressed path already holds this content
+        res = self._request(
+            "PUT",
+            f"/repos/{self.repo_name}/contents/{file_path}",
+            json={
+                "message": message,
+                "content": base64.b64encode(content).decode("ascii"),
+                "branch": self.branch,
+            },
+        )
+        if res.status_code == 422 and '"sha"' in res.text:
+            return
+        if res.is_error:
+            detail = res.text[:400] if res.text else f"status={res.status_code}"
+            raise RuntimeError(f"GitHub upload failed: {detail}")
+
+    def colab_url(self, file_path: str) -> str:
+        return f"https://colab.research.google.com/github/{self.repo_name}/blob/{self.branch}/{file_path}"
+
+
+class ColabUrlIndex:
+    # Local JSON index of notebook content hash -> Colab URL
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries: dict[str, str] | None = None
+
+    def _load(self) -> dict[str, str]:
+        if self._entries is None:
+            try:
+                raw = json.loads(self.path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                raw = {}
+            self._entries = {str(k): str(v) for k, v in raw.items()} if isinstance(raw, dict) else {}
+        return self._entries
+
+    def get(self, key: str) -> str | None:
+        with self._lock:
+            return self._load().get(key)
+
+    def put(self, key: str, url: str) -> None:
+        with self._lock:
+            entries = self._load()
+            entries[key] = url
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(f"{self.path.suffix}.tmp")
+            tmp_path.write_text(json.dumps(entries, indent=1, sort_keys=True), encoding="utf-8")
+            os.replace(tmp_path, self.path)
+
+
+DEFAULT_INDEX_PATH = Path(tempfile.gettempdir()) / "mlguide" / "colab_notebooks.json"
+
+_shared_lock = threading.Lock()
+_shared_clients: dict[tuple[str, str, str, str], GitHubNotebookClient] = {}
+_shared_indexes: dict[Path, ColabUrlIndex] = {}
+
+
+def get_shared_client(token: str, repo_name: str, branch: str, api_url: str = GITHUB_API_URL) -> GitHubNotebookClient:
+    key = (token, repo_name, branch, api_url)
+    with _shared_lock:
+        client = _shared_clients.get(key)
+        if client is None:
+            client = GitHubNotebookClient(token, repo_name, branch, api_url=api_url)
+            _shared_clients[key] = client
+        return client
+
+
+def get_shared_index(path: Path | None = None) -> ColabUrlIndex:
+    resolved = path or DEFAULT_INDEX_PATH
+    with _shared_lock:
+        index = _shared_indexes.get(resolved)
+        if index is None:
+            index = ColabUrlIndex(resolved)
+            _shared_indexes[resolved] = index
+        return index
+
+
+def notebook_content_hash(notebook_json: str) -> str:
+    return hashlib.sha256(notebook_json.encode("utf-8")).hexdigest()
+
+
 def upload_notebook_and_get_colab_url(
     notebook_json: str,
     method_key: str,
     token: str | None,
     repo_name: str,
     branch: str,
+    *,
+    api_url: str = GITHUB_API_URL,
+    index_path: Path | None = None,
+    client: GitHubNotebookClient | None = None,
 ) -> str:
     if not token or not repo_name:
         raise RuntimeError("Missing GITHUB_TOKEN or NOTEBOOKS_REPO_NAME.")
 
-    timestamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
-    file_path = f"notebooks/{method_key or 'method'}_{timestamp}.ipynb"
-    api_url = f"https://api.github.com/repos/{repo_name}/contents/{file_path}"
-
-    payload = {
-        "message": f"Add generated notebook for {method_key or 'method'}",
-        "content": base64.b64encode(notebook_json.encode("utf-8")).decode("ascii"),
-        "branch": branch,
-    }
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Accept": "application/vnd.github+json",
-        "X-GitHub-Api-Version": "2022-11-28",
-    }
-
-    res = httpx.put(api_url, headers=headers, json=payload, timeout=30.0)
-    if res.is_error:
-        detail = res.text[:400] if res.text else f"status={res.status_code}"
-        raise RuntimeError(f"GitHub upload failed: {detail}")
-
-    return f"https://colab.research.google.com/github/{repo_name}/blob/{branch}/{file_path}"
+    # Notebooks are stored under their content hash, so identical notebooks map to one file
+    digest = notebook_content_hash(notebook_json)
+    index = get_shared_index(index_path)
+    index_key = f"{repo_name}@{branch}:{digest}"
+    known_url = index.get(index_key)
+    if known_url:
+        return known_url
+
+    name = method_key or "method"
+    file_path = f"notebooks/{name}_{digest[:16]}.ipynb"
+    github = client or get_shared_client(token, repo_name, branch, api_url)
+    github.put_file(
+        file_path,
+        notebook_json.encode("utf-8"),
+        message=f"Add generated notebook for {name}",
+    )
+
+    colab_url = github.colab_url(file_path)
+    index.put(index_key, colab_url)
+    return colab_url
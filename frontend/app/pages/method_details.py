@@ -6,13 +6,18 @@ from pathlib import Path
 from integrations import github_notebook_client
 import streamlit as st
 import streamlit.components.v1 as components
-from jinja2 import Environment, FileSystemLoader, TemplateNotFound
+from jinja2 import TemplateNotFound
 
 from integrations.api import ApiConfig, ApiError
 from config.config import settings
-from domain.models import ArticleItem, RecommendationRequest
+from domain.models import RecommendationDetailsResponse, RecommendationRequest
 from services import recommendations_service
-from services.notebook_builder_service import build_notebook_json
+from services.article_search_service import ArticleSearchIndex
+from services.notebook_render_service import (
+    TEMPLATE_ROOT,
+    render_method_notebook_cached,
+    templates_version,
+)
 from services.template_registry import resolve_template
 from ui import method_details_ui as ui
 from ui import nav_ui
@@ -26,7 +31,6 @@ st.set_page_config(page_title="MLguide 🤖 - Method details", layout="wide")
 cfg = ApiConfig()
 sidebar_auth_ui.render_sidebar_auth(cfg)
 saved_searches_ui.render_sidebar_saved_searches(cfg, navigate_home_on_load=True)
-TEMPLATE_ROOT = Path(__file__).resolve().parents[2] / "templates" / "notebooks"
 ARTICLE_SEARCH_KEY = "details_article_search"
 ARTICLE_SEARCH_CLEAR_KEY = "details_article_search_clear"
 
@@ -44,20 +48,9 @@ def _clear_article_search() -> None:
     st.session_state[ARTICLE_SEARCH_KEY] = ""
 
 
-def _filter_articles(articles: list[ArticleItem], query: str) -> list[ArticleItem]:
-    q = query.strip().lower()
-    if not q:
-        return articles
-    return [
-        article
-        for article in articles
-        if q in (article.label or "").lower() or q in (article.doi or "").lower()
-    ]
-
-
 @st.cache_data(ttl=settings.meta_cache_ttl_seconds, show_spinner=False)
-def _load_meta_label_lookup(cfg: ApiConfig) -> dict[str, dict[str, str]]:
-    phases, clusters, paradigms, tasks, dataset_types, conditions, performance = (
+def _load_meta_label_lookup(cfg: ApiConfig, graph_version: int) -> dict[str, dict[str, str]]:
+    phases, clusters, paradigms, tasks, dataset_types, conditions, performance, _ = (
         recommendations_service.fetch_meta_options(cfg)
     )
     return {
@@ -71,6 +64,31 @@ def _load_meta_label_lookup(cfg: ApiConfig) -> dict[str, dict[str, str]]:
     }
 
 
+@st.cache_data(ttl=settings.details_cache_ttl_seconds, show_spinner="Loading method details...")
+def _load_method_details_cached(
+    cfg: ApiConfig,
+    request_key: str,
+    approach_iri: str,
+    graph_version: int,
+) -> RecommendationDetailsResponse:
+    # Keyed by the canonical request and graph version so reruns and back-and-forth
+    # navigation reuse details until the data changes.
+    req = RecommendationRequest.model_validate_json(request_key)
+    return recommendations_service.fetch_method_details(cfg, req, approach_iri)
+
+
+@st.cache_resource(ttl=settings.details_cache_ttl_seconds, max_entries=64, show_spinner=False)
+def _load_article_search_index(
+    cfg: ApiConfig,
+    request_key: str,
+    approach_iri: str,
+    graph_version: int,
+) -> ArticleSearchIndex:
+    # Shared, read-only index over the cached details; rebuilt only when the details are refetched.
+    details = _load_method_details_cached(cfg, request_key, approach_iri, graph_version)
+    return ArticleSearchIndex(details.articles)
+
+
 def _label_or_raw(lookup: dict[str, str], iri: str | None) -> str:
     if not iri:
         return "-"
@@ -129,36 +147,34 @@ ui.render_page_title(method_title)
 
 request_context_items: list[tuple[str, str]] = []
 try:
-    meta_lookup = _load_meta_label_lookup(cfg)
+    meta_lookup = _load_meta_label_lookup(cfg, recommendations_service.current_graph_version(cfg))
     request_context_items = _build_request_context_items(payload, meta_lookup)
 except Exception:
     # Keep details usable even if metadata lookup fails.
     request_context_items = _build_request_context_items(payload, {})
 
 template_method = to_template_method(method_title)
-template_spec = resolve_template(template_method, TEMPLATE_ROOT)
+template_spec = resolve_template(
+    template_method,
+    TEMPLATE_ROOT,
+    approach_iri=approach_iri,
+    method_label=method_title,
+)
 if template_spec is None:
     ui.render_template_not_found(TEMPLATE_ROOT / "methods")
     st.stop()
 
 template_path = TEMPLATE_ROOT / template_spec.template_path
-env = Environment(
-    loader=FileSystemLoader(str(TEMPLATE_ROOT)),
-    autoescape=False,
-    trim_blocks=True,
-    lstrip_blocks=True,
-)
 
 try:
-    template = env.get_template(template_spec.template_path)
-    rendered_code = template.render(
-        method_key=template_method,
-        method_title=method_title,
-        problem_text=payload.get("problem_text"),
-        target_column="target",
-        family=template_spec.family,
+    rendered_code, notebook_json = render_method_notebook_cached(
+        template_spec.template_path,
+        templates_version(),
+        template_method,
+        method_title,
+        payload.get("problem_text"),
+        template_spec.family,
     )
-    notebook_json = build_notebook_json(method_title, rendered_code)
     has_colab_cfg = bool(settings.github_token and settings.notebooks_repo_name)
 
     colab_key = f"colab_url_{approach_iri}"
@@ -168,8 +184,11 @@ except TemplateNotFound:
 
 req = RecommendationRequest.model_validate(payload)
 
+request_key = recommendations_service.details_request_key(req)
 try:
-    details = recommendations_service.fetch_method_details(cfg, req, approach_iri)
+    article_index = _load_article_search_index(
+        cfg, request_key, approach_iri, recommendations_service.current_graph_version(cfg)
+    )
 except ApiError as e:
     ui.render_api_error(e)
     st.stop()
@@ -192,6 +211,8 @@ with left_col:
                     token=settings.github_token,
                     repo_name=settings.notebooks_repo_name,
                     branch=settings.notebooks_repo_branch,
+                    api_url=settings.github_api_url,
+                    index_path=Path(settings.colab_index_path) if settings.colab_index_path else None,
                 )
                 st.session_state[colab_key] = colab_url
                 _open_in_new_tab(colab_url)
@@ -209,5 +230,5 @@ with right_col:
         clear_key=ARTICLE_SEARCH_CLEAR_KEY,
         on_clear=_clear_article_search,
     )
-    filtered_articles = _filter_articles(details.articles, article_query)
+    filtered_articles = article_index.search(article_query)
     ui.render_supporting_articles(filtered_articles)
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import re
+from bisect import bisect_left, bisect_right
+from collections.abc import Sequence
+
+from domain.models import ArticleItem
+
+
+_TOKEN_RE = re.compile(r"[0-9a-z]+")
+_QUERY_MEMO_MAX_ENTRIES = 128
+
+# Per-token scores: whole-word hits outrank word prefixes, which outrank infix hits.
+_EXACT_TOKEN_SCORE = 3.0
+_PREFIX_TOKEN_SCORE = 2.0
+_INFIX_TOKEN_SCORE = 1.0
+# Bonus when the whole query appears verbatim in the title / DOI.
+_PHRASE_BONUS = 4.0
+_TITLE_PREFIX_BONUS = 2.0
+_DOI_BONUS = 1.0
+
+
+class ArticleSearchIndex:
+    # Token index plus a joined corpus over article titles and DOIs, built once per details response
+    def __init__(self, articles: Sequence[ArticleItem]):
+        self.articles = list(articles)
+        self._titles = [(a.label or "").lower() for a in self.articles]
+        self._dois = [(a.doi or "").lower() for a in self.articles]
+        haystacks = [f"{title}\n{doi}" for title, doi in zip(self._titles, self._dois)]
+
+        # One string for all articles: substring search runs as repeated str.find calls in C.
+        self._corpus = "\x00".join(haystacks)
+        self._starts: list[int] = []
+        offset = 0
+        for haystack in haystacks:
+            self._starts.append(offset)
+            offset += len(haystack) + 1
+
+        self._postings: dict[str, set[int]] = {}
+        for position, haystack in enumerate(haystacks):
+            for token in _TOKEN_RE.findall(haystack):
+                self._postings.setdefault(token, set()).add(position)
+        self._sorted_tokens = sorted(self._postings)
+        self._memo: dict[str, list[ArticleItem]] = {}
+
+    def __len__(self) -> int:
+        return len(self.articles)
+
+    def _prefix_matches(self, token: str) -> set[int]:
+        matches: set[int] = set()
+        start = bisect_left(self._sorted_tokens, token)
+        for candidate in self._sorted_tokens[start:]:
+            if not candidate.startswith(token):
+                break
+            if candidate != token:
+                matches |= self._postings[candidate]
+        return matches
+
+    def _substring_matches(self, text: str) -> set[int]:
+        matches: set[int] = set()
+        if "\x00" in text:
+            return matches
+        found = self._corpus.find(text)
+        while found != -1:
+            position = bisect_right(self._starts, found) - 1
+            matches.add(position)
+            # Continue after this article; one hit per article is enough.
+            next_start = self._starts[position + 1] if position + 1 < len(self._starts) else len(self._corpus)
+            found = self._corpus.find(text, next_start)
+        return matches
+
+    def _rank(self, query: str) -> list[int]:
+        scores: dict[int, float] = {}
+
+        # Every article containing the query verbatim stays a hit, as with plain filtering.
+        phrase_matches = self._substring_matches(query)
+        for i in phrase_matches:
+            score = _PHRASE_BONUS
+            if self._titles[i].startswith(query):
+                score += _TITLE_PREFIX_BONUS
+            if query in self._dois[i]:
+                score += _DOI_BONUS
+            scores[i] = score
+
+        # Multi-word queries also match articles containing every word, in any order.
+        tokens = _TOKEN_RE.findall(query)
+        token_scores: dict[int, float] | None = None
+        for token in tokens:
+            current: dict[int, float] = {}
+            infix_matches = phrase_matches if token == query else self._substring_matches(token)
+            for i in infix_matches:
+                current[i] = _INFIX_TOKEN_SCORE
+            for i in self._prefix_matches(token):
+                current[i] = _PREFIX_TOKEN_SCORE
+            for i in self._postings.get(token, ()):
+                current[i] = _EXACT_TOKEN_SCORE
+            if token_scores is None:
+                token_scores = current
+            else:
+                token_scores = {i: s + current[i] for i, s in token_scores.items() if i in current}
+            if not token_scores:
+                break
+
+        for i, score in (token_scores or {}).items():
+            scores[i] = scores.get(i, 0.0) + score
+
+        return sorted(scores, key=lambda i: (-scores[i], i))
+
+    def search(self, query: str) -> list[ArticleItem]:
+        # Ranked matches for `query`; an empty query returns all articles in their original order.
+        q = query.strip().lower()
+        if not q:
+            return self.articles
+
+        cached = self._memo.get(q)
+        if cached is not None:
+            return cached
+
+        result = [self.articles[i] for i in self._rank(q)]
+        if len(self._memo) >= _QUERY_MEMO_MAX_ENTRIES:
+            self._memo.clear()
+        self._memo[q] = result
+        return result
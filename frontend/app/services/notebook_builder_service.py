@@ -1,9 +1,39 @@
 from __future__ import annotations
 
+import hashlib
+import re
 from typing import Any
 
-import jupytext
 import nbformat
+import nbformat.v4
+
+
+_CODE_CELL_MARKER = "# %%"
+_MARKDOWN_CELL_MARKER = "# %% [markdown]"
+
+# Anything jupytext would read as a cell marker. The fast builder only models the two markers
+# emitted by our base templates and defers everything else to jupytext.
+_ANY_CELL_MARKER_RE = re.compile(r"^\s*#[#\s]*(%%|<codecell>|In\[[0-9 ]*\])")
+_BLANK_LINE_RE = re.compile(r"^\s*$")
+# Commented lines jupytext may treat as escaped magics, help or shell commands.
+_MAGIC_CANDIDATE_RE = re.compile(
+    r"^\s*(#\s*)+("
+    r"%|[!?]"
+    r"|(cat|cd|cp|mv|rm|rmdir|mkdir|copy|ddir|echo|ls|ldir|ren)(\s|$)"
+    r"|[A-Za-z_][A-Za-z_$0-9]*\s*=\s*[%!]"
+    r"|\S*\?\s*$"
+    r")"
+)
+# Lines that make jupytext expect PEP 8 spacing between cells (and record it as cell metadata).
+_DEFINITION_PREFIXES = ("def ", "async ", "class ")
+
+# Notebook metadata jupytext attaches when reading a py:percent text without a header.
+_JUPYTEXT_METADATA = {
+    "cell_metadata_filter": "-all",
+    "main_language": "python",
+    "notebook_metadata_filter": "-all",
+    "text_representation": {"extension": ".py", "format_name": "percent"},
+}
 
 
 def _set_notebook_metadata(notebook: Any, method_title: str) -> None:
@@ -16,7 +46,119 @@ def _set_notebook_metadata(notebook: Any, method_title: str) -> None:
     notebook.metadata["language_info"] = {"name": "python"}
 
 
-def build_notebook_json(method_title: str, notebook_source: str) -> str:
-    notebook = jupytext.reads(f"{notebook_source.rstrip()}\n", fmt="py:percent")
+def _assign_cell_ids(notebook: Any) -> None:
+    # Stable ids keep the notebook JSON identical for identical input.
+    for index, cell in enumerate(notebook.cells):
+        digest = hashlib.sha1(f"{index}:{cell.cell_type}:{cell.source}".encode("utf-8"))
+        cell["id"] = digest.hexdigest()[:8]
+
+
+def _uncomment(line: str) -> str:
+    if line.startswith("# "):
+        return line[2:]
+    if line.startswith("#"):
+        return line[1:]
+    return line
+
+
+def _split_cells(lines: list[str]) -> list[tuple[str, list[str]]] | None:
+    # Split on the template cell markers; None when the text needs the full jupytext reader.
+    if not lines or lines[0] not in (_CODE_CELL_MARKER, _MARKDOWN_CELL_MARKER):
+        return None
+
+    cells: list[tuple[str, list[str]]] = []
+    for line in lines:
+        if line == _CODE_CELL_MARKER:
+            cells.append(("code", []))
+            continue
+        if line == _MARKDOWN_CELL_MARKER:
+            cells.append(("markdown", []))
+            continue
+        if _ANY_CELL_MARKER_RE.match(line) or _MAGIC_CANDIDATE_RE.match(line):
+            return None
+        if line.startswith(_DEFINITION_PREFIXES) or line.rstrip().endswith("\\"):
+            return None
+        cells[-1][1].append(line)
+
+    for position, (cell_type, body) in enumerate(cells):
+        is_last = position == len(cells) - 1
+        if is_last:
+            if body and _BLANK_LINE_RE.match(body[-1]):
+                return None
+        else:
+            # Exactly one blank line between cells, as in the base templates.
+            if not body or not _BLANK_LINE_RE.match(body[-1]):
+                return None
+            if len(body) > 1 and _BLANK_LINE_RE.match(body[-2]):
+                return None
+            body.pop()
+        if cell_type == "code" and body and body[0].startswith("%%"):
+            return None
+    return cells
+
+
+def _read_percent_source_fast(source: str) -> Any | None:
+    if '"""' in source or "'''" in source:
+        return None
+    cells = _split_cells(source.splitlines())
+    if cells is None:
+        return None
+
+    # Same structure as the nbformat v4 cell constructors, without validating every cell.
+    notebook_cells: list[dict[str, Any]] = []
+    for cell_type, body in cells:
+        if cell_type == "markdown":
+            notebook_cells.append(
+                {
+                    "cell_type": "markdown",
+                    "metadata": {},
+                    "source": "\n".join(_uncomment(line) for line in body),
+                }
+            )
+        else:
+            notebook_cells.append(
+                {
+                    "cell_type": "code",
+                    "execution_count": None,
+                    "metadata": {},
+                    "outputs": [],
+                    "source": "\n".join(body),
+                }
+            )
+    return nbformat.from_dict(
+        {
+            "cells": notebook_cells,
+            "metadata": {"jupytext": dict(_JUPYTEXT_METADATA)},
+            "nbformat": nbformat.v4.nbformat,
+            "nbformat_minor": nbformat.v4.nbformat_minor,
+        }
+    )
+
+
+def _read_percent_source_jupytext(source: str) -> Any:
+    import jupytext
+
+    return jupytext.reads(source, fmt="py:percent")
+
+
+def _prepare_notebook(notebook: Any, method_title: str) -> Any:
     _set_notebook_metadata(notebook, method_title)
-    return nbformat.writes(notebook, version=4)
+    _assign_cell_ids(notebook)
+    return notebook
+
+
+def build_notebook_json_jupytext(method_title: str, notebook_source: str) -> str:
+    # Reference implementation: full py:percent parse through jupytext, validated on write.
+    notebook = _read_percent_source_jupytext(f"{notebook_source.rstrip()}\n")
+    return nbformat.writes(_prepare_notebook(notebook, method_title), version=4)
+
+
+def build_notebook_json(method_title: str, notebook_source: str) -> str:
+    # Build cells straight from the template cell markers; produces the same bytes as
+    # build_notebook_json_jupytext and falls back to it for anything the templates do not emit.
+    source = f"{notebook_source.rstrip()}\n"
+    notebook = _read_percent_source_fast(source)
+    if notebook is None:
+        return build_notebook_json_jupytext(method_title, notebook_source)
+    # The fast path only emits plain markdown/code cells, so schema validation is skipped.
+    return nbformat.v4.writes_json(_prepare_notebook(notebook, method_title))
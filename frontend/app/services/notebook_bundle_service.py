@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import io
+import zipfile
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from jinja2 import Environment
+
+from domain.models import RecommendationItem
+from services.notebook_render_service import TEMPLATE_ROOT, render_method_notebook
+from services.template_registry import resolve_template
+from utils.utils import get_method_label, to_template_method
+
+
+def _render_bundle_entry(
+    env: Environment,
+    rank: int,
+    row: RecommendationItem,
+    problem_text: str | None,
+) -> tuple[str, str] | None:
+    # Render one recommendation the same way the details page does; returns (file name, JSON).
+    method_title = get_method_label(row) or "Selected method"
+    template_method = to_template_method(method_title)
+    template_spec = resolve_template(
+        template_method,
+        TEMPLATE_ROOT,
+        approach_iri=row.approach,
+        method_label=method_title,
+    )
+    if template_spec is None:
+        return None
+
+    _, notebook_json = render_method_notebook(
+        env,
+        template_spec.template_path,
+        template_method,
+        method_title,
+        problem_text,
+        template_spec.family,
+    )
+    return f"{rank:02d}_{template_method or 'method'}.ipynb", notebook_json
+
+
+def _iter_bundle_entries(
+    env: Environment,
+    rows: list[RecommendationItem],
+    problem_text: str | None,
+    max_workers: int,
+) -> Iterator[tuple[str, str]]:
+    # Render in parallel, yielding in rank order with a bounded number of notebooks in flight.
+    window = max_workers * 2
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="notebook-bundle") as executor:
+        pending: deque[Future[tuple[str, str] | None]] = deque()
+        for rank, row in enumerate(rows, start=1):
+            pending.append(executor.submit(_render_bundle_entry, env, rank, row, problem_text))
+            if len(pending) >= window:
+                entry = pending.popleft().result()
+                if entry is not None:
+                    yield entry
+        while pending:
+            entry = pending.popleft().result()
+            if entry is not None:
+                yield entry
+
+
+def build_notebook_bundle(
+    env: Environment,
+    rows: list[RecommendationItem],
+    problem_text: str | None,
+    max_workers: int = 4,
+) -> io.BytesIO:
+    # Each notebook is compressed into the archive as soon as it is rendered, so only the
+    # archive itself grows with the number of notebooks.
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for file_name, notebook_json in _iter_bundle_entries(env, rows, problem_text, max_workers):
+            archive.writestr(file_name, notebook_json)
+    buffer.seek(0)
+    return buffer
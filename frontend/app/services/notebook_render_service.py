@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import streamlit as st
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+
+from config.config import settings
+from services.notebook_builder_service import build_notebook_json
+
+
+TEMPLATE_ROOT = Path(__file__).resolve().parents[2] / "templates" / "notebooks"
+
+
+def create_template_environment(template_root: Path, auto_reload: bool) -> Environment:
+    return Environment(
+        loader=FileSystemLoader(str(template_root)),
+        autoescape=False,
+        trim_blocks=True,
+        lstrip_blocks=True,
+        auto_reload=auto_reload,
+        bytecode_cache=FileSystemBytecodeCache(),
+    )
+
+
+def templates_version() -> int:
+    # Fingerprint of every template file (including base templates others extend) and its mtime.
+    entries = []
+    for path in TEMPLATE_ROOT.rglob("*.jinja"):
+        try:
+            entries.append((path.as_posix(), path.stat().st_mtime_ns))
+        except OSError:
+            continue
+    return hash(tuple(sorted(entries)))
+
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def _template_environment(version: int) -> Environment:
+    # Keyed by templates_version, so an edit replaces the environment and its compiled templates.
+    return create_template_environment(TEMPLATE_ROOT, settings.template_auto_reload)
+
+
+def get_template_environment() -> Environment:
+    # One environment per process and template version, so compiled templates survive reruns
+    # and sessions until a template file changes.
+    return _template_environment(templates_version())
+
+
+def render_method_notebook(
+    env: Environment,
+    template_path: str,
+    method_key: str,
+    method_title: str,
+    problem_text: str | None,
+    family: str,
+) -> tuple[str, str]:
+    # Render a method template and return (python source, notebook JSON).
+    template = env.get_template(template_path)
+    rendered_code = template.render(
+        method_key=method_key,
+        method_title=method_title,
+        problem_text=problem_text,
+        target_column="target",
+        family=family,
+    )
+    return rendered_code, build_notebook_json(method_title, rendered_code)
+
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def render_method_notebook_cached(
+    template_path: str,
+    templates_version: int,
+    method_key: str,
+    method_title: str,
+    problem_text: str | None,
+    family: str,
+) -> tuple[str, str]:
+    # A new templates_version misses this cache and compiles against a fresh environment, so
+    # editing any template, base templates included, re-renders with the edit.
+    return render_method_notebook(
+        _template_environment(templates_version),
+        template_path,
+        method_key,
+        method_title,
+        problem_text,
+        family,
+    )
@@ -1,7 +1,49 @@
 from __future__ import annotations
 
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+
 from integrations.api import ApiClient, ApiConfig
-from domain.models import RecommendationDetailsResponse, RecommendationRequest, RecommendationItem, Option
+from config.config import settings
+from domain.models import (
+    ClusterKeywordIndex,
+    Option,
+    RecommendationDetailsResponse,
+    RecommendationItem,
+    RecommendationRequest,
+)
+
+
+_PREFETCH_MAX_ENTRIES = 64
+_prefetch_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="details-prefetch")
+_prefetch_lock = threading.Lock()
+_prefetched: OrderedDict[
+    tuple[ApiConfig, int, str, str], tuple[float, Future[RecommendationDetailsResponse]]
+] = OrderedDict()
+_graph_version_lock = threading.Lock()
+_graph_versions: dict[ApiConfig, tuple[float, int]] = {}
+
+
+def current_graph_version(cfg: ApiConfig) -> int:
+    # Backend graph data version, re-read at most every graph_version_check_seconds.
+    # Cache keys include it, so cached meta and details are dropped as soon as the data changes.
+    now = time.monotonic()
+    with _graph_version_lock:
+        checked_at, version = _graph_versions.get(cfg, (float("-inf"), 0))
+    if now - checked_at < settings.graph_version_check_seconds:
+        return version
+    try:
+        with ApiClient(cfg) as client:
+            version = client.meta.version()
+    except Exception:
+        # Keep the last known version; the calls that follow report the real error.
+        pass
+    with _graph_version_lock:
+        _graph_versions[cfg] = (now, version)
+    return version
 
 
 def fetch_meta_options(cfg: ApiConfig) -> tuple[
@@ -12,6 +54,7 @@ def fetch_meta_options(cfg: ApiConfig) -> tuple[
     list[Option],
     list[Option],
     list[Option],
+    ClusterKeywordIndex,
 ]:
     with ApiClient(cfg) as client:
         return (
@@ -22,6 +65,7 @@ def fetch_meta_options(cfg: ApiConfig) -> tuple[
             client.meta.dataset_types(),
             client.meta.conditions(),
             client.meta.performance(),
+            client.meta.cluster_keywords(),
         )
 
 
@@ -30,10 +74,93 @@ def fetch_recommendations(cfg: ApiConfig, req: RecommendationRequest) -> list[Re
         return client.recommendations.recommend(req)
 
 
-def fetch_method_details(
+def details_request_key(req: RecommendationRequest) -> str:
+    # Canonical JSON of the request fields that influence /recommendations/details.
+    # Fields the details query ignores (problem text, max results, dataset type) are
+    # left out so they do not fragment the cache.
+    payload = {
+        "phase_iri": req.phase_iri,
+        "cluster_iris": sorted({iri for iri in req.cluster_iris if iri}),
+        "paradigm_iri": req.paradigm_iri,
+        "task_iri": req.task_iri,
+        "conditions": sorted(set(req.conditions)),
+        "performance_prefs": sorted(set(req.performance_prefs)),
+    }
+    return json.dumps(payload, sort_keys=True, separators=(",", ":"))
+
+
+def _fetch_method_details_uncached(
     cfg: ApiConfig,
     req: RecommendationRequest,
     approach_iri: str,
 ) -> RecommendationDetailsResponse:
     with ApiClient(cfg) as client:
         return client.recommendations.details(req, approach_iri)
+
+
+def _fetch_many_into(
+    cfg: ApiConfig,
+    req: RecommendationRequest,
+    futures: dict[str, Future[RecommendationDetailsResponse]],
+) -> None:
+    # One /recommendations/details/batch call resolving a future per approach.
+    try:
+        with ApiClient(cfg) as client:
+            results = {d.approachIri: d for d in client.recommendations.details_many(req, list(futures))}
+    except Exception as e:
+        for future in futures.values():
+            future.set_exception(e)
+        return
+    for approach_iri, future in futures.items():
+        if approach_iri in results:
+            future.set_result(results[approach_iri])
+        else:
+            future.set_exception(KeyError(approach_iri))
+
+
+def prefetch_method_details(cfg: ApiConfig, req: RecommendationRequest, approach_iris: list[str]) -> None:
+    # Start fetching details in the background so opening a method does not wait on the backend.
+    # All approaches not yet prefetched share one batch call (two GraphDB queries in total).
+    request_key = details_request_key(req)
+    graph_version = current_graph_version(cfg)
+    now = time.monotonic()
+    futures: dict[str, Future[RecommendationDetailsResponse]] = {}
+    with _prefetch_lock:
+        for approach_iri in approach_iris:
+            key = (cfg, graph_version, request_key, approach_iri)
+            if key in _prefetched:
+                _prefetched.move_to_end(key)
+                continue
+            if approach_iri not in futures:
+                futures[approach_iri] = Future()
+                _prefetched[key] = (now, futures[approach_iri])
+        while len(_prefetched) > _PREFETCH_MAX_ENTRIES:
+            _prefetched.popitem(last=False)
+    if futures:
+        _prefetch_executor.submit(_fetch_many_into, cfg, req, futures)
+
+
+def _take_prefetched(key: tuple[ApiConfig, int, str, str]) -> Future[RecommendationDetailsResponse] | None:
+    with _prefetch_lock:
+        entry = _prefetched.pop(key, None)
+    if entry is None:
+        return None
+    submitted_at, future = entry
+    if time.monotonic() - submitted_at > settings.details_cache_ttl_seconds:
+        return None
+    return future
+
+
+def fetch_method_details(
+    cfg: ApiConfig,
+    req: RecommendationRequest,
+    approach_iri: str,
+) -> RecommendationDetailsResponse:
+    future = _take_prefetched((cfg, current_graph_version(cfg), details_request_key(req), approach_iri))
+    if future is not None:
+        try:
+            return future.result()
+        except Exception:
+            # Retry synchronously so the caller sees the real error.
+            pass
+    return _fetch_method_details_uncached(cfg, req, approach_iri)
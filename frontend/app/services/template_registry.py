@@ -1,8 +1,16 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from functools import lru_cache
+import json
+import os
+import re
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Any
+
+from utils.utils import normalize_method_key
 
 
 @dataclass(frozen=True)
@@ -25,6 +33,21 @@ _FAMILY_FALLBACK_TEMPLATE: dict[str, str] = {
     "regression": "methods/regression/default.py.jinja",
 }
 
+MANIFEST_FILE_NAME = "manifest.json"
+_MANIFEST_VERSION = 1
+# Re-stat the template tree at most this often; lookups in between are plain dict hits.
+_MANIFEST_CHECK_INTERVAL_SECONDS = 2.0
+_FUZZY_MIN_SCORE = 0.6
+_FUZZY_MEMO_MAX_ENTRIES = 4096
+
+# Optional front matter inside a method template, e.g.
+# {# mlguide:
+#    aliases: support vector machine, svc
+#    approaches: http://h-da.de/ml-ontology/support_vector_machine
+# #}
+_FRONT_MATTER_RE = re.compile(r"\{#-?\s*mlguide:(.*?)-?#\}", re.DOTALL)
+_FRONT_MATTER_READ_BYTES = 4096
+
 
 def infer_method_family(method_key: str) -> str:
     if method_key in _REGRESSION_HINTS:
@@ -34,13 +57,48 @@ def infer_method_family(method_key: str) -> str:
     return "classification"
 
 
-@lru_cache(maxsize=8)
-def _discover_method_templates(template_root: Path) -> dict[str, TemplateSpec]:
+def _iri_local_name(iri: str) -> str:
+    return re.split(r"[/#]", iri.rstrip("/#"))[-1]
+
+
+def _trigrams(key: str) -> set[str]:
+    padded = f"_{key}_"
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def _read_front_matter(file_path: Path) -> dict[str, list[str]]:
+    with file_path.open(encoding="utf-8") as fh:
+        head = fh.read(_FRONT_MATTER_READ_BYTES)
+    match = _FRONT_MATTER_RE.search(head)
+    if match is None:
+        return {}
+
+    fields: dict[str, list[str]] = {}
+    for line in match.group(1).splitlines():
+        name, sep, value = line.partition(":")
+        if not sep:
+            continue
+        fields[name.strip().lower()] = [v.strip() for v in value.split(",") if v.strip()]
+    return fields
+
+
+def _stat_mtime(path: Path) -> int:
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return -1
+
+
+def build_template_manifest(template_root: Path) -> dict[str, Any]:
+    # Walk methods/<family>/*.py.jinja once and precompute every lookup table.
     methods_root = template_root / "methods"
-    discovered: dict[str, TemplateSpec] = {}
-    for file_path in methods_root.rglob("*.py.jinja"):
+    templates: dict[str, dict[str, Any]] = {}
+    directories: dict[str, int] = {"methods": _stat_mtime(methods_root)}
+
+    for file_path in sorted(methods_root.rglob("*.py.jinja")):
         relative = file_path.relative_to(template_root)
         parts = relative.parts
+        directories[Path(*parts[:-1]).as_posix()] = _stat_mtime(file_path.parent)
         if len(parts) < 3:
             continue
 
@@ -49,18 +107,176 @@ def _discover_method_templates(template_root: Path) -> dict[str, TemplateSpec]:
         if method_key == "default":
             continue
 
-        discovered[method_key] = TemplateSpec(
-            family=family,
-            template_path=relative.as_posix(),
-        )
-    return discovered
+        front_matter = _read_front_matter(file_path)
+        templates[method_key] = {
+            "family": family,
+            "template_path": relative.as_posix(),
+            "mtime_ns": _stat_mtime(file_path),
+            "aliases": front_matter.get("aliases", []),
+            "approaches": front_matter.get("approaches", []),
+        }
+
+    aliases: dict[str, str] = {}
+    approaches: dict[str, str] = {}
+    for method_key, entry in templates.items():
+        aliases.setdefault(method_key, method_key)
+        for alias in entry["aliases"]:
+            aliases.setdefault(normalize_method_key(alias), method_key)
+        for iri in entry["approaches"]:
+            approaches[iri] = method_key
+            aliases.setdefault(normalize_method_key(_iri_local_name(iri)), method_key)
+
+    trigrams: dict[str, list[str]] = {}
+    for alias in sorted(aliases):
+        for gram in sorted(_trigrams(alias)):
+            trigrams.setdefault(gram, []).append(alias)
+
+    return {
+        "version": _MANIFEST_VERSION,
+        "directories": directories,
+        "templates": templates,
+        "aliases": aliases,
+        "approaches": approaches,
+        "trigrams": trigrams,
+    }
+
+
+def _manifest_is_current(manifest: dict[str, Any], template_root: Path) -> bool:
+    # Directory mtimes catch added/removed templates, file mtimes catch edits.
+    if manifest.get("version") != _MANIFEST_VERSION:
+        return False
+    for directory, mtime_ns in manifest.get("directories", {}).items():
+        if _stat_mtime(template_root / directory) != mtime_ns:
+            return False
+    for entry in manifest.get("templates", {}).values():
+        if _stat_mtime(template_root / entry["template_path"]) != entry["mtime_ns"]:
+            return False
+    return True
+
+
+def write_template_manifest(template_root: Path, manifest: dict[str, Any] | None = None) -> Path:
+    manifest_path = template_root / MANIFEST_FILE_NAME
+    manifest = manifest or build_template_manifest(template_root)
+    tmp_path = manifest_path.with_suffix(".json.tmp")
+    tmp_path.write_text(json.dumps(manifest, indent=1, sort_keys=True), encoding="utf-8")
+    os.replace(tmp_path, manifest_path)
+    return manifest_path
 
 
-def resolve_template(method_key: str, template_root: Path) -> TemplateSpec | None:
-    discovered = _discover_method_templates(template_root)
-    known = discovered.get(method_key)
-    if known is not None:
-        return known
+def _load_or_build_manifest(template_root: Path) -> dict[str, Any]:
+    manifest_path = template_root / MANIFEST_FILE_NAME
+    try:
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+        if isinstance(manifest, dict) and _manifest_is_current(manifest, template_root):
+            return manifest
+    except (OSError, ValueError):
+        pass
+
+    manifest = build_template_manifest(template_root)
+    try:
+        write_template_manifest(template_root, manifest)
+    except OSError:
+        # Read-only template directory: keep the manifest in memory only.
+        pass
+    return manifest
+
+
+@dataclass
+class _TemplateIndex:
+    manifest: dict[str, Any]
+    checked_at: float
+    specs: dict[str, TemplateSpec] = field(default_factory=dict)
+    fuzzy_memo: dict[str, str | None] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        self.specs = {
+            method_key: TemplateSpec(family=entry["family"], template_path=entry["template_path"])
+            for method_key, entry in self.manifest["templates"].items()
+        }
+
+    def lookup(self, method_key: str, approach_iri: str | None, method_label: str | None) -> str | None:
+        aliases: dict[str, str] = self.manifest["aliases"]
+        if approach_iri:
+            known = self.manifest["approaches"].get(approach_iri)
+            if known is None:
+                known = aliases.get(normalize_method_key(_iri_local_name(approach_iri)))
+            if known is not None:
+                return known
+
+        known = aliases.get(method_key)
+        if known is not None:
+            return known
+
+        label_key = normalize_method_key(method_label)
+        if label_key:
+            known = aliases.get(label_key)
+            if known is not None:
+                return known
+
+        return self._fuzzy_lookup(label_key or method_key)
+
+    def _fuzzy_lookup(self, key: str) -> str | None:
+        if not key:
+            return None
+        if key in self.fuzzy_memo:
+            return self.fuzzy_memo[key]
+
+        # Jaccard similarity over character trigrams, restricted to aliases sharing a trigram.
+        query = _trigrams(key)
+        hits: dict[str, int] = {}
+        for gram in query:
+            for alias in self.manifest["trigrams"].get(gram, ()):
+                hits[alias] = hits.get(alias, 0) + 1
+
+        family = infer_method_family(key)
+        best: tuple[float, str] | None = None
+        for alias, shared in hits.items():
+            score = shared / (len(query) + len(_trigrams(alias)) - shared)
+            method_key = self.manifest["aliases"][alias]
+            if score < _FUZZY_MIN_SCORE or self.specs[method_key].family != family:
+                continue
+            if best is None or (score, alias) > best:
+                best = (score, alias)
+
+        result = self.manifest["aliases"][best[1]] if best else None
+        if len(self.fuzzy_memo) >= _FUZZY_MEMO_MAX_ENTRIES:
+            self.fuzzy_memo.clear()
+        self.fuzzy_memo[key] = result
+        return result
+
+
+_indexes: dict[Path, _TemplateIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def _get_template_index(template_root: Path) -> _TemplateIndex:
+    now = time.monotonic()
+    index = _indexes.get(template_root)
+    if index is not None and now - index.checked_at < _MANIFEST_CHECK_INTERVAL_SECONDS:
+        return index
+
+    with _indexes_lock:
+        index = _indexes.get(template_root)
+        if index is not None and now - index.checked_at < _MANIFEST_CHECK_INTERVAL_SECONDS:
+            return index
+        if index is not None and _manifest_is_current(index.manifest, template_root):
+            index.checked_at = now
+            return index
+        index = _TemplateIndex(manifest=_load_or_build_manifest(template_root), checked_at=now)
+        _indexes[template_root] = index
+        return index
+
+
+def resolve_template(
+    method_key: str,
+    template_root: Path,
+    approach_iri: str | None = None,
+    method_label: str | None = None,
+) -> TemplateSpec | None:
+    index = _get_template_index(template_root)
+    known_key = index.lookup(method_key, approach_iri, method_label)
+    if known_key is not None:
+        return index.specs[known_key]
 
     family = infer_method_family(method_key)
     fallback = TemplateSpec(
@@ -70,3 +286,9 @@ def resolve_template(method_key: str, template_root: Path) -> TemplateSpec | Non
     if (template_root / fallback.template_path).exists():
         return fallback
     return None
+
+
+if __name__ == "__main__":
+    # Regenerate the manifest, e.g. at image build time: python -m services.template_registry
+    root = Path(sys.argv[1]) if len(sys.argv) > 1 else Path(__file__).resolve().parents[2] / "templates" / "notebooks"
+    print(write_template_manifest(root))
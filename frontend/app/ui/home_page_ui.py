@@ -1,14 +1,13 @@
 from __future__ import annotations
 
-from collections import defaultdict
-from pathlib import Path
+from collections.abc import Callable
+from typing import BinaryIO
 import streamlit as st
 
-from domain.models import Option, RecommendationItem
+from domain.models import ClusterKeywordIndex, Option, RecommendationItem
 from utils.state_helpers import ensure_multi_select_state, ensure_single_select_state
 
 
-CLUSTER_KEYWORD_BLOCKLIST_PATH = Path(__file__).resolve().parents[1] / "config" / "cluster_keyword_blocklist.txt"
 PARADIGM_GUIDE_SKIP = "Not sure / skip"
 PARADIGM_GUIDE_SUPERVISED = "**Supervised Learning**: I have historical data with with known outcomes (labels) that I want to predict or classify"
 PARADIGM_GUIDE_UNSUPERVISED = "**Unsupervised Learning**: The goal is to explore patterns, group similar cases, or detect anomalies without specific known outcomes (labels)"
@@ -38,21 +37,6 @@ def _contains_any(text: str, candidates: tuple[str, ...]) -> bool:
     return any(candidate in text_l for candidate in candidates)
 
 
-def _load_cluster_keyword_blocklist() -> set[str]:
-    try:
-        raw = CLUSTER_KEYWORD_BLOCKLIST_PATH.read_text(encoding="utf-8")
-    except FileNotFoundError:
-        return set()
-
-    blocked: set[str] = set()
-    for line in raw.splitlines():
-        token = line.strip()
-        if not token or token.startswith("#"):
-            continue
-        blocked.add(token.casefold())
-    return blocked
-
-
 def _suggest_paradigm_iri(paradigms: list[Option], guide_choice: str) -> str | None:
     for option in paradigms:
         label = option.label.lower()
@@ -71,39 +55,37 @@ def _suggest_paradigm_iri(paradigms: list[Option], guide_choice: str) -> str | N
     return None
 
 
-def _cluster_keyword_metadata(clusters: list[Option]) -> tuple[list[str], dict[str, set[str]], dict[str, set[str]]]:
-    blocked_keywords = _load_cluster_keyword_blocklist()
-    keyword_order: list[str] = []
-    keyword_display_by_norm: dict[str, str] = {}
-    keyword_to_cluster_iris: dict[str, set[str]] = defaultdict(set)
-    cluster_keywords_by_iri: dict[str, set[str]] = defaultdict(set)
-
-    for cluster in clusters:
-        # Cluster labels are expected to be comma-separated keywords.
-        for raw_keyword in cluster.label.split(","):
-            keyword = raw_keyword.strip()
-            if not keyword:
-                continue
-            norm = keyword.casefold()
-            if norm in blocked_keywords:
-                continue
-            display = keyword_display_by_norm.get(norm)
-            if display is None:
-                keyword_display_by_norm[norm] = keyword
-                keyword_order.append(keyword)
-                display = keyword
-            keyword_to_cluster_iris[display].add(cluster.iri)
-            cluster_keywords_by_iri[cluster.iri].add(norm)
-
-    return keyword_order, keyword_to_cluster_iris, cluster_keywords_by_iri
+def _cluster_keyword_masks(cluster_keywords: ClusterKeywordIndex) -> dict[str, int]:
+    return {entry.keyword: entry.mask for entry in cluster_keywords.keywords}
+
+
+def _score_clusters_by_keywords(
+    cluster_keywords: ClusterKeywordIndex,
+    selected_keywords: list[str],
+) -> dict[str, int]:
+    # Overlap per cluster = number of selected keyword masks that have the cluster's bit set.
+    masks = _cluster_keyword_masks(cluster_keywords)
+    selected_masks = [masks[keyword] for keyword in selected_keywords if keyword in masks]
+    matched = 0
+    for mask in selected_masks:
+        matched |= mask
+
+    overlaps: dict[str, int] = {}
+    while matched:
+        bit = matched & -matched
+        position = bit.bit_length() - 1
+        if position < len(cluster_keywords.clusters):
+            overlaps[cluster_keywords.clusters[position]] = sum(1 for mask in selected_masks if mask & bit)
+        matched ^= bit
+    return overlaps
 
 
 def _render_cluster_keyword_picker(
-    clusters: list[Option],
+    cluster_keywords: ClusterKeywordIndex,
     cluster_iris: list[str],
     cluster_labels: dict[str, str],
 ) -> list[str]:
-    keywords, keyword_to_cluster_iris, cluster_keywords_by_iri = _cluster_keyword_metadata(clusters)
+    keywords = [entry.keyword for entry in cluster_keywords.keywords]
     if not keywords:
         return cluster_iris
 
@@ -131,10 +113,10 @@ def _render_cluster_keyword_picker(
     if not selected_keywords:
         return cluster_iris
 
-    selected_norms = {keyword.casefold() for keyword in selected_keywords}
+    overlaps = _score_clusters_by_keywords(cluster_keywords, list(selected_keywords))
     scored: list[tuple[int, str, str]] = []
     for iri in cluster_iris:
-        overlap = len(cluster_keywords_by_iri.get(iri, set()) & selected_norms)
+        overlap = overlaps.get(iri, 0)
         if overlap > 0:
             scored.append((-overlap, cluster_labels.get(iri, "").lower(), iri))
 
@@ -170,6 +152,7 @@ def _render_paradigm_guidance(paradigms: list[Option], paradigm_labels: dict[str
 def render_form(
     phases: list[Option],
     clusters: list[Option],
+    cluster_keywords: ClusterKeywordIndex,
     paradigms: list[Option],
     tasks: list[Option],
     dataset_types: list[Option],
@@ -184,7 +167,7 @@ def render_form(
     condition_iris, condition_labels = _option_maps(conditions)
     performance_iris, performance_labels = _option_maps(performance)
 
-    cluster_select_iris = _render_cluster_keyword_picker(clusters, cluster_iris, cluster_labels)
+    cluster_select_iris = _render_cluster_keyword_picker(cluster_keywords, cluster_iris, cluster_labels)
     cluster_override = st.session_state.pop("hp_cluster_iris_override", None)
     if isinstance(cluster_override, list):
         cluster_select_iris = [str(v) for v in cluster_override]
@@ -272,6 +255,17 @@ def render_form(
     return payload, submitted
 
 
+def render_notebook_bundle_download(build_bundle: Callable[[], BinaryIO]) -> None:
+    # The bundle is only built when the button is clicked, off the script thread.
+    st.download_button(
+        label="Download notebooks for all methods (.zip)",
+        data=build_bundle,
+        file_name="mlguide_notebooks.zip",
+        mime="application/zip",
+        key="download_notebook_bundle",
+    )
+
+
 def render_recommendations(rows: list[RecommendationItem]) -> str | None:
     # Section header
     st.subheader("Possible ML Methods")
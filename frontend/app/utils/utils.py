@@ -1,25 +1,33 @@
 from __future__ import annotations
 
 import re
+from functools import lru_cache
 from typing import Any
 
 
-def to_template_method(value: str | None) -> str:
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9]+")
+_METHOD_ALIASES = {
+    "randomforest": "random_forest",
+    "random_forest_classifier": "random_forest",
+    "support_vector_machine": "svm",
+    "svc": "svm",
+    "s_v_m": "svm",
+    "k_nearest_neighbors": "knn",
+    "k_nearest_neighbours": "knn",
+    "kneighborsclassifier": "knn",
+}
+
+
+def normalize_method_key(value: str | None) -> str:
     if not value:
         return ""
+    return _NON_ALNUM_RE.sub("_", value.strip().lower()).strip("_")
 
-    key = re.sub(r"[^a-z0-9]+", "_", value.strip().lower()).strip("_")
-    aliases = {
-        "randomforest": "random_forest",
-        "random_forest_classifier": "random_forest",
-        "support_vector_machine": "svm",
-        "svc": "svm",
-        "s_v_m": "svm",
-        "k_nearest_neighbors": "knn",
-        "k_nearest_neighbours": "knn",
-        "kneighborsclassifier": "knn",
-    }
-    return aliases.get(key, key)
+
+@lru_cache(maxsize=1024)
+def to_template_method(value: str | None) -> str:
+    key = normalize_method_key(value)
+    return _METHOD_ALIASES.get(key, key)
 
 
 def find_selected_row(rows: list[Any], approach_iri: str) -> Any | None:
@@ -0,0 +1,133 @@
+"""CPU time of ApiClient response parsing: per-item model_validate vs batch validate_json.
+
+Run from the frontend directory:
+
+    python benchmarks/api_parsing_benchmark.py --iterations 50
+
+Parses synthetic /recommendations, /meta, /users/{id}/saved-searches and
+/recommendations/details bodies the way ApiClient did before (res.text + res.json() and
+one model_validate per element) and the way it does now (cached TypeAdapter / model
+validate_json on the response bytes), checks both give equal models and prints per-call
+timings as JSON.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+import httpx
+
+APP_ROOT = Path(__file__).resolve().parents[1] / "app"
+sys.path.insert(0, str(APP_ROOT))
+
+from domain.models import (  # noqa: E402
+    Option,
+    RecommendationDetailsResponse,
+    RecommendationItem,
+    SavedSearch,
+)
+from integrations.api import ApiClient  # noqa: E402
+
+ONTOLOGY_NS = "http://h-da.de/ml-ontology/"
+ARTICLES_NS = "http://example.com/ml-articles/"
+
+
+def _bodies(rows: int) -> dict[str, tuple[Any, bool, bytes]]:
+    # name -> (model, is_list, JSON body)
+    recommendations = [
+        {
+            "method": f"{ARTICLES_NS}method_{i}", "methodLabel": f"Method {i}",
+            "approach": f"{ONTOLOGY_NS}approach_{i}", "approachLabel": f"Approach {i}",
+            "supportingArticles": i % 200, "possibleIfMatches": i % 3, "performanceMatches": i % 2, "taskMatch": 1,
+        }
+        for i in range(rows)
+    ]
+    options = [{"iri": f"{ONTOLOGY_NS}option_{i}", "label": f"Option {i}"} for i in range(rows)]
+    saved = [
+        {
+            "id": i, "user_id": 1, "created_at": "2026-03-01T12:00:00+00:00", "problem_text": f"Problem {i}",
+            "phase_iri": None, "cluster_iris": [f"{ARTICLES_NS}cluster_{i % 10}"], "paradigm_iri": None,
+            "max_results": 10, "task_iri": f"{ONTOLOGY_NS}classification",
+            "conditions": [f"{ONTOLOGY_NS}condition_1"], "performance_prefs": [], "dataset_type_iri": None,
+        }
+        for i in range(rows)
+    ]
+    details = {
+        "approachIri": f"{ONTOLOGY_NS}random_forest",
+        "articles": [
+            {"article": f"{ARTICLES_NS}article_{i}", "doi": f"10.{1000 + i}/x", "label": f"Article {i}"}
+            for i in range(rows)
+        ],
+        "matches": {"conditions": options[:5], "performance": options[:3], "tasks": options[:1]},
+    }
+    return {
+        "recommendations": (RecommendationItem, True, json.dumps(recommendations).encode()),
+        "meta_options": (Option, True, json.dumps(options).encode()),
+        "saved_searches": (SavedSearch, True, json.dumps(saved).encode()),
+        "details": (RecommendationDetailsResponse, False, json.dumps(details).encode()),
+    }
+
+
+def _previous(model: Any, is_list: bool, body: bytes) -> Any:
+    # Former ApiClient path: decode text, parse JSON again, validate element by element.
+    res = httpx.Response(200, content=body)
+    data = res.json() if res.text else None
+    if is_list:
+        return [model.model_validate(x) for x in data]
+    return model.model_validate(data)
+
+
+def _current(client: ApiClient, model: Any, is_list: bool, body: bytes) -> Any:
+    res = httpx.Response(200, content=body)
+    if is_list:
+        return client._parse_list(model, res.content)
+    return client._parse_model(model, res.content)
+
+
+def _per_call_us(func: Callable[[], Any], iterations: int) -> dict[str, float]:
+    samples: list[float] = []
+    for _ in range(iterations):
+        started = time.process_time()
+        func()
+        samples.append((time.process_time() - started) * 1e6)
+    return {"median_cpu_us": round(statistics.median(samples), 1), "min_cpu_us": round(min(samples), 1)}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--rows", default="100,5000", help="comma-separated list/article counts")
+    args = parser.parse_args()
+
+    client = ApiClient()
+    results = []
+    try:
+        for rows in [int(v) for v in args.rows.split(",") if v.strip()]:
+            for name, (model, is_list, body) in _bodies(rows).items():
+                if _previous(model, is_list, body) != _current(client, model, is_list, body):
+                    print(f"{name}[{rows}]: parsers disagree", file=sys.stderr)
+                    return 1
+                before = _per_call_us(lambda: _previous(model, is_list, body), args.iterations)
+                after = _per_call_us(lambda: _current(client, model, is_list, body), args.iterations)
+                results.append({
+                    "case": name,
+                    "rows": rows,
+                    "body_bytes": len(body),
+                    "previous": before,
+                    "current": after,
+                    "speedup": round(before["median_cpu_us"] / max(after["median_cpu_us"], 0.1), 2),
+                })
+    finally:
+        client.close()
+
+    print(json.dumps({"iterations": args.iterations, "results": results}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
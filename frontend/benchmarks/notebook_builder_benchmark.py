@@ -0,0 +1,114 @@
+"""Compare the direct notebook builder with the jupytext round trip.
+
+Run from the frontend directory:
+
+    python benchmarks/notebook_builder_benchmark.py --iterations 200
+
+Every method template is rendered with a few problem texts; the script fails if the two
+builders disagree on any output byte and prints per-call timings as JSON.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+APP_ROOT = Path(__file__).resolve().parents[1] / "app"
+sys.path.insert(0, str(APP_ROOT))
+
+from services.notebook_builder_service import (  # noqa: E402
+    build_notebook_json,
+    build_notebook_json_jupytext,
+)
+from services.notebook_render_service import TEMPLATE_ROOT, create_template_environment  # noqa: E402
+
+
+PROBLEM_TEXTS = [
+    None,
+    "Predict spindle failures from vibration data.",
+    "Multi-line description.\n\n- bullet one\n- bullet two\n# heading inside the text",
+]
+
+
+def _render_sources() -> list[tuple[str, str]]:
+    env = create_template_environment(TEMPLATE_ROOT, auto_reload=False)
+    sources: list[tuple[str, str]] = []
+    for path in sorted((TEMPLATE_ROOT / "methods").rglob("*.py.jinja")):
+        template_path = path.relative_to(TEMPLATE_ROOT).as_posix()
+        family = path.parent.name
+        method_key = path.name.removesuffix(".py.jinja")
+        for problem_text in PROBLEM_TEXTS:
+            title = method_key.replace("_", " ").title()
+            code = env.get_template(template_path).render(
+                method_key=method_key,
+                method_title=title,
+                problem_text=problem_text,
+                target_column="target",
+                family=family,
+            )
+            sources.append((title, code))
+    return sources
+
+
+def _time_per_call(builder, sources: list[tuple[str, str]], iterations: int) -> dict[str, float]:
+    samples: list[float] = []
+    for _ in range(iterations):
+        for title, code in sources:
+            started = time.perf_counter()
+            builder(title, code)
+            samples.append((time.perf_counter() - started) * 1000.0)
+    samples.sort()
+    return {
+        "mean_ms": statistics.fmean(samples),
+        "p50_ms": samples[len(samples) // 2],
+        "p95_ms": samples[int(len(samples) * 0.95) - 1],
+    }
+
+
+def _import_time_ms(module: str) -> float:
+    # Cold import cost in a fresh interpreter.
+    started = time.perf_counter()
+    subprocess.run([sys.executable, "-c", f"import {module}"], check=True)
+    return (time.perf_counter() - started) * 1000.0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    sources = _render_sources()
+    mismatches = [
+        title
+        for title, code in sources
+        if build_notebook_json(title, code) != build_notebook_json_jupytext(title, code)
+    ]
+
+    fast = _time_per_call(build_notebook_json, sources, args.iterations)
+    jupytext = _time_per_call(build_notebook_json_jupytext, sources, args.iterations)
+    report = {
+        "notebooks": len(sources),
+        "iterations": args.iterations,
+        "identical_output": not mismatches,
+        "direct": fast,
+        "jupytext": jupytext,
+        "speedup_mean": jupytext["mean_ms"] / fast["mean_ms"] if fast["mean_ms"] else None,
+        "cold_import_ms": {
+            "python": _import_time_ms("sys"),
+            "nbformat": _import_time_ms("nbformat"),
+            "jupytext": _import_time_ms("jupytext"),
+        },
+    }
+    print(json.dumps(report, indent=2))
+    if mismatches:
+        print(f"Output differs for: {', '.join(mismatches)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())